@@ -0,0 +1,20 @@
+from typing import List
+from benchmarks.common import BenchmarkResult, best_time
+
+POPULATION_SIZES = [10, 100, 1000]
+
+
+def run(seed: int = 0) -> List[BenchmarkResult]:
+    """Время Evolution.evolve_population в зависимости от размера популяции"""
+    from entities.robot import MeleeRobot, Team
+    from genetic.evolution import Evolution
+
+    base_robot = MeleeRobot(0, 0, Team.BLUE)
+    results = []
+    for size in POPULATION_SIZES:
+        evolution = Evolution(size, 0.1, seed=seed)
+        evolution.initialize_population('blue', base_robot)
+        elapsed = best_time(lambda: evolution.evolve_population('blue'))
+        results.append(BenchmarkResult('evolution.evolve_population_ms', 1000 * elapsed, 'ms', False,
+                                       {'population_size': size}))
+    return results
@@ -0,0 +1,38 @@
+import tempfile
+import time
+from typing import List
+from benchmarks.common import BenchmarkResult
+
+ROBOT_COUNTS = [6, 50, 200]
+TICKS = 100
+
+
+def log_tick(logger: 'CSVLogger', blue_robots: List['Robot'], red_robots: List['Robot']) -> None:
+    """Те же вызовы логирования, что GameManager.update делает за один тик"""
+    logger.log_tick({'blue': blue_robots, 'red': red_robots}, ['MeleeRobot', 'RangedRobot', 'TankRobot'])
+
+
+def run(seed: int = 0) -> List[BenchmarkResult]:
+    """Накладные расходы CSV-логирования на один тик в игровом потоке и время дозаписи при закрытии"""
+    from entities.robot import MeleeRobot, RangedRobot, TankRobot, Team
+    from game_system.csv_logger import CSVLogger
+
+    robot_types = [MeleeRobot, RangedRobot, TankRobot]
+    results = []
+    for robots_per_team in ROBOT_COUNTS:
+        blue_robots = [robot_types[i % 3](0, 0, Team.BLUE) for i in range(robots_per_team)]
+        red_robots = [robot_types[i % 3](0, 0, Team.RED) for i in range(robots_per_team)]
+        with tempfile.TemporaryDirectory() as output_dir:
+            logger = CSVLogger(output_dir)
+            start = time.perf_counter()
+            for _ in range(TICKS):
+                log_tick(logger, blue_robots, red_robots)
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            logger.close()
+            close_elapsed = time.perf_counter() - start
+        results.append(BenchmarkResult('logging.per_tick_ms', 1000 * elapsed / TICKS, 'ms', False,
+                                       {'robots_per_team': robots_per_team}))
+        results.append(BenchmarkResult('logging.close_ms', 1000 * close_elapsed, 'ms', False,
+                                       {'robots_per_team': robots_per_team}))
+    return results
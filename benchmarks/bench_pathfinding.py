@@ -0,0 +1,106 @@
+import time
+import numpy as np
+from typing import List
+from benchmarks.common import BenchmarkResult
+
+MAP_SIZES = [(800, 700), (1600, 1400), (3200, 2800)]
+OBSTACLE_COUNTS = [0, 10, 50, 200]
+BACKENDS = ['astar', 'jps', 'visibility']
+QUERIES = 20
+TIME_BUDGET = 5.0  # Секунд на одну конфигурацию: медленные конфигурации измеряются по меньшему числу запросов
+ROBOT_RADIUS = 20
+
+
+def make_obstacles(rng: np.random.Generator, width: int, height: int, count: int) -> List['Obstacle']:
+    """Случайные препятствия на карте заданного размера"""
+    from entities.obstacle import Obstacle
+
+    types = ["tree", "tree", "tree", "rock", "rock"]
+    return [Obstacle(int(rng.integers(0, width)), int(rng.integers(0, height)), types[rng.integers(5)])
+            for _ in range(count)]
+
+
+def make_queries(rng: np.random.Generator, pathfinder: 'PathFinder', count: int) -> List[tuple]:
+    """Случайные пары (старт, цель) в свободных клетках"""
+    queries = []
+    while len(queries) < count:
+        start, goal = [np.array([rng.integers(pathfinder.cols), rng.integers(pathfinder.rows)]) * pathfinder.grid_size
+                       for _ in range(2)]
+        cells = [tuple(int(v) for v in point // pathfinder.grid_size) for point in (start, goal)]
+        if all(pathfinder._is_valid_position(cell, ROBOT_RADIUS) for cell in cells):
+            queries.append((start.astype(float), goal.astype(float)))
+    return queries
+
+
+def run(seed: int = 0) -> List[BenchmarkResult]:
+    """Задержка find_path, раскрытые узлы и точки пути каждого алгоритма по размеру карты и числу препятствий"""
+    from entities.pathfinder import PathFinder
+
+    results = []
+    for width, height in MAP_SIZES:
+        for obstacle_count in OBSTACLE_COUNTS:
+            rng = np.random.default_rng(seed)
+            obstacles = make_obstacles(rng, width, height, obstacle_count)
+            queries = make_queries(rng, PathFinder(obstacles, width=width, height=height), QUERIES)
+
+            for backend in BACKENDS:
+                # Без кэша путей: измеряется сам поиск
+                pathfinder = PathFinder(obstacles, width=width, height=height, cache_size=0, backend=backend)
+                # Растеризация, таблицы прыжков и граф видимости строятся один раз и не входят в замер
+                pathfinder.occupancy(ROBOT_RADIUS)
+                params = {'width': width, 'height': height, 'obstacles': obstacle_count, 'backend': backend}
+                if backend == 'jps':
+                    pathfinder.jump_tables(ROBOT_RADIUS)
+                elif backend == 'visibility':
+                    build_start = time.perf_counter()
+                    pathfinder.visibility_graph(ROBOT_RADIUS)
+                    results.append(BenchmarkResult('pathfinding.visibility_build_ms',
+                                                   1000 * (time.perf_counter() - build_start), 'ms', False, params))
+
+                latencies = []
+                waypoints = 0
+                budget_end = time.perf_counter() + TIME_BUDGET
+                for start, goal in queries:
+                    query_start = time.perf_counter()
+                    waypoints += len(pathfinder.find_path(start, goal, ROBOT_RADIUS))
+                    latencies.append(time.perf_counter() - query_start)
+                    if time.perf_counter() > budget_end:
+                        break
+
+                results.append(BenchmarkResult('pathfinding.find_path_ms', 1000 * float(np.mean(latencies)),
+                                               'ms', False, params))
+                results.append(BenchmarkResult('pathfinding.nodes_expanded',
+                                               pathfinder.nodes_expanded / len(latencies), 'nodes', False, params))
+                results.append(BenchmarkResult('pathfinding.waypoints', waypoints / len(latencies),
+                                               'points', False, params))
+
+            results.extend(run_hierarchical(obstacles, queries, width, height))
+    return results
+
+
+def run_hierarchical(obstacles: List['Obstacle'], queries: List[tuple],
+                     width: int, height: int) -> List[BenchmarkResult]:
+    """Построение графа HPA* и задержка запроса до первой уточненной точки пути"""
+    from entities.pathfinder import PathFinder
+    from entities.hierarchical_pathfinder import HierarchicalPathFinder
+
+    pathfinder = HierarchicalPathFinder(PathFinder(obstacles, width=width, height=height, cache_size=0))
+    pathfinder.occupancy(ROBOT_RADIUS)
+    build_start = time.perf_counter()
+    pathfinder.graph(ROBOT_RADIUS)
+    build_time = time.perf_counter() - build_start
+
+    latencies = []
+    budget_end = time.perf_counter() + TIME_BUDGET
+    for start, goal in queries:
+        query_start = time.perf_counter()
+        path = pathfinder.find_path(start, goal, ROBOT_RADIUS)
+        if path:
+            path[0]
+        latencies.append(time.perf_counter() - query_start)
+        if time.perf_counter() > budget_end:
+            break
+
+    params = {'width': width, 'height': height, 'obstacles': len(obstacles), 'backend': 'hpa'}
+    return [BenchmarkResult('pathfinding.hpa_build_ms', 1000 * build_time, 'ms', False, params),
+            BenchmarkResult('pathfinding.find_path_ms', 1000 * float(np.mean(latencies)), 'ms', False, params)]
@@ -0,0 +1,51 @@
+import time
+from typing import List
+from benchmarks.common import BenchmarkResult, quiet
+
+# Количество роботов в команде и число измеряемых тиков для каждого размера
+ROBOT_COUNTS = {6: 600, 50: 200, 200: 60, 1000: 15}
+# Число измеряемых тиков для каждого профиля масштаба (game_system.config.SCALE_PROFILES)
+SCALE_TICKS = {'small': 600, 'medium': 200, 'large': 60, 'huge': 10}
+
+
+def populate(game: 'GameManager', robots_per_team: int) -> None:
+    """Заполнение обеих команд роботами с генами (минуя задержку спавна)"""
+    game.max_robots_per_team = robots_per_team
+    for team, base, robots in (('blue', game.blue_base, game.blue_robots),
+                               ('red', game.red_base, game.red_robots)):
+        genes = game.evolution.populations[team].individuals[0]
+        while len(robots) < robots_per_team:
+            base.last_spawn_time = -base.spawn_cooldown
+            robot = base.spawn_robot(game.sim_clock.get_ticks())
+            robot.genes = genes
+            game._register_robot(robot)
+            robots.append(robot)
+
+
+def run(seed: int = 0) -> List[BenchmarkResult]:
+    """Тиков в секунду в зависимости от количества роботов в команде и от профиля масштаба"""
+    from game_system.game_manager import GameManager
+
+    results = []
+    for robots_per_team, ticks in ROBOT_COUNTS.items():
+        with quiet():
+            game = GameManager(headless=True, enable_logging=False, seed=seed)
+            populate(game, robots_per_team)
+            start = time.perf_counter()
+            for _ in range(ticks):
+                game.update()
+            elapsed = time.perf_counter() - start
+        results.append(BenchmarkResult('simulation.ticks_per_second', ticks / elapsed, 'ticks/s', True,
+                                       {'robots_per_team': robots_per_team}))
+
+    for scale, ticks in SCALE_TICKS.items():
+        with quiet():
+            game = GameManager(headless=True, enable_logging=False, seed=seed, scale=scale)
+            populate(game, game.scale.robots_per_team)
+            start = time.perf_counter()
+            for _ in range(ticks):
+                game.update()
+            elapsed = time.perf_counter() - start
+        results.append(BenchmarkResult('simulation.scale_ticks_per_second', ticks / elapsed, 'ticks/s', True,
+                                       {'scale': scale}))
+    return results
@@ -0,0 +1,51 @@
+import contextlib
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат одного измерения"""
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+    params: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Уникальный ключ измерения для сравнения с эталоном"""
+        params = ','.join(f'{name}={value}' for name, value in sorted(self.params.items()))
+        return f'{self.name}[{params}]'
+
+
+def prepare_environment() -> None:
+    """Окружение без дисплея; спрайты загружаются относительно корня проекта"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    os.chdir(PROJECT_ROOT)
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Подавление диагностического вывода игры во время измерений"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def best_time(function: Callable[[], None], repeat: int = 3) -> float:
+    """Лучшее время выполнения из нескольких повторов, в секундах"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
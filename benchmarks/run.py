@@ -0,0 +1,90 @@
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from typing import Dict, List, Optional
+from benchmarks.common import BenchmarkResult, prepare_environment
+
+SUITES = ['simulation', 'pathfinding', 'evolution', 'logging']
+DEFAULT_TOLERANCE = 0.10  # Допустимое ухудшение относительно эталона (доля)
+
+
+def run_suites(names: List[str], seed: int) -> List[BenchmarkResult]:
+    """Запуск выбранных наборов измерений"""
+    import importlib
+
+    results = []
+    for name in names:
+        module = importlib.import_module(f'benchmarks.bench_{name}')
+        for result in module.run(seed):
+            print(f"{result.key:<70} {result.value:12.3f} {result.unit}", file=sys.stderr)
+            results.append(result)
+    return results
+
+
+def load_results(path: str) -> Dict[str, BenchmarkResult]:
+    """Загрузка результатов из JSON-файла, ключ - BenchmarkResult.key"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    results = [BenchmarkResult(**item) for item in data['results']]
+    return {result.key: result for result in results}
+
+
+def save_results(path: str, results: List[BenchmarkResult]) -> None:
+    """Сохранение результатов в JSON-файл"""
+    with open(path, 'w') as f:
+        json.dump({'results': [asdict(result) for result in results]}, f, indent=2)
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, BenchmarkResult],
+            tolerance: float) -> List[str]:
+    """Сравнение с эталоном, возвращает описания регрессий"""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.key)
+        if reference is None or reference.value == 0:
+            continue
+        # Относительное изменение со знаком: положительное - улучшение
+        change = (result.value - reference.value) / reference.value
+        if not result.higher_is_better:
+            change = -change
+        status = 'РЕГРЕССИЯ' if change < -tolerance else 'ok'
+        print(f"{result.key:<70} {reference.value:12.3f} -> {result.value:12.3f} "
+              f"({change:+.1%}) {status}", file=sys.stderr)
+        if change < -tolerance:
+            regressions.append(f"{result.key}: {reference.value:.3f} -> {result.value:.3f} {result.unit}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки; код возврата 1 при регрессии относительно эталона"""
+    parser = argparse.ArgumentParser(description="Измерение производительности симуляции")
+    parser.add_argument('--only', nargs='+', choices=SUITES, default=SUITES, help='наборы измерений')
+    parser.add_argument('--seed', type=int, default=0, help='seed для генерации сценариев')
+    parser.add_argument('--output', default=None, help='файл для результатов (JSON)')
+    parser.add_argument('--baseline', default=None, help='файл с эталонными результатами (JSON)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='допустимое ухудшение относительно эталона, доля')
+    parser.add_argument('--save-baseline', default=None, help='сохранить результаты как эталон')
+    args = parser.parse_args(argv)
+
+    prepare_environment()
+    results = run_suites(args.only, args.seed)
+
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.save_baseline, results)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print("Обнаружены регрессии:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
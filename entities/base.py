@@ -1,9 +1,10 @@
 import pygame
-import random
 import math
-from typing import Optional
+import numpy as np
+from typing import Optional, Tuple
 from abc import ABC, abstractmethod
 from game_system.config import Colors
+from game_system.hud import HUD
 from entities.robot import MeleeRobot, RangedRobot, TankRobot, Team, Robot
 
 class BaseEntity(ABC):
@@ -13,14 +14,16 @@ class BaseEntity(ABC):
         self.y = y
 
     @abstractmethod
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         pass
 
 class GameBase(BaseEntity):
     """Базовый класс для игровых баз"""
-    def __init__(self, x: int, y: int, color: tuple, team: Team, health: int = 5000):
+    def __init__(self, x: int, y: int, color: tuple, team: Team, health: int = 5000,
+                 rng: Optional[np.random.Generator] = None):
         super().__init__(x, y)
         self.color = color
+        self.rng = rng if rng is not None else np.random.default_rng()  # Генератор спавна
         self.radius = 40
         self.max_health = health
         self.current_health = health
@@ -30,24 +33,28 @@ class GameBase(BaseEntity):
         self.robot_types = [MeleeRobot, RangedRobot, TankRobot]
         self.spawn_radius = 80  # Радиус зоны спавна
         self.spawn_min_radius = 50  # Минимальное расстояние от базы
+        self._spawn_surface: Optional[pygame.Surface] = None
+        self._health_bar: Optional[pygame.Surface] = None
+        self._health_bar_key: Optional[Tuple[float, float]] = None
 
     def spawn_robot(self, current_time: int) -> Optional[Robot]:
         """Спавн нового робота в безопасной зоне около базы"""
         if current_time - self.last_spawn_time >= self.spawn_cooldown:
+            rng = self.rng
+
             # Случайный выбор типа робота
-            robot_class = random.choice(self.robot_types)
+            robot_class = self.robot_types[rng.integers(len(self.robot_types))]
 
-            # Генерация позиции в кольце вокруг базы
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(self.spawn_min_radius, self.spawn_radius)
+            # Генерация расстояния в кольце вокруг базы
+            distance = rng.uniform(self.spawn_min_radius, self.spawn_radius)
 
             # Вычисление координат с учетом стороны базы
             if self.team == Team.BLUE:
                 # Для синей базы - спавн в секторе 90 градусов в сторону поля
-                angle = random.uniform(-math.pi/4, math.pi/4)
+                angle = rng.uniform(-math.pi/4, math.pi/4)
             else:
                 # Для красной базы - спавн в секторе 90 градусов в сторону поля
-                angle = random.uniform(3*math.pi/4, 5*math.pi/4)
+                angle = rng.uniform(3*math.pi/4, 5*math.pi/4)
 
             spawn_x = self.x + distance * math.cos(angle)
             spawn_y = self.y + distance * math.sin(angle)
@@ -63,69 +70,57 @@ class GameBase(BaseEntity):
             return new_robot
         return None
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
+        self.draw_static(screen, offset)
+        self.draw_health_bar(screen, offset)
+
+    def draw_static(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
+        """Отрисовка неизменной части: круг базы и зона спавна"""
+        x, y = self.x - offset[0], self.y - offset[1]
         # Отрисовка базы
-        pygame.draw.circle(screen, self.color, (self.x, self.y), self.radius)
-        self._draw_health_bar(screen)
-
-        # Отрисовка зоны спавна (полупрозрачный круг)
-        spawn_surface = pygame.Surface((self.spawn_radius * 2, self.spawn_radius * 2), pygame.SRCALPHA)
-        if self.team == Team.BLUE:
-            pygame.draw.circle(spawn_surface, (*Colors.BLUE, 30),
-                             (self.spawn_radius, self.spawn_radius), self.spawn_radius)
-        else:
-            pygame.draw.circle(spawn_surface, (*Colors.RED, 30),
-                             (self.spawn_radius, self.spawn_radius), self.spawn_radius)
-        screen.blit(spawn_surface, (self.x - self.spawn_radius, self.y - self.spawn_radius))
-
-    def _draw_health_bar(self, screen: pygame.Surface) -> None:
-        """Отрисовка полоски здоровья"""
+        pygame.draw.circle(screen, self.color, (x, y), self.radius)
+
+        # Отрисовка зоны спавна (полупрозрачный круг, поверхность создается один раз)
+        if self._spawn_surface is None:
+            self._spawn_surface = pygame.Surface((self.spawn_radius * 2, self.spawn_radius * 2), pygame.SRCALPHA)
+            if self.team == Team.BLUE:
+                pygame.draw.circle(self._spawn_surface, (*Colors.BLUE, 30),
+                                 (self.spawn_radius, self.spawn_radius), self.spawn_radius)
+            else:
+                pygame.draw.circle(self._spawn_surface, (*Colors.RED, 30),
+                                 (self.spawn_radius, self.spawn_radius), self.spawn_radius)
+        screen.blit(self._spawn_surface, (x - self.spawn_radius, y - self.spawn_radius))
+
+    def draw_health_bar(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """Отрисовка полоски здоровья, возвращает занятую ею область экрана"""
+        return self._draw_health_bar(screen, self.x - offset[0], self.y - offset[1])
+
+    def _draw_health_bar(self, screen: pygame.Surface, x: float, y: float) -> pygame.Rect:
+        """Отрисовка полоски здоровья над экранной точкой (x, y)"""
         health_bar_width = 80
         health_bar_height = 8
-        health_percentage = self.current_health / self.max_health
-
-        # Фон для текста HP (черный прямоугольник)
         text_background_height = 20
-        pygame.draw.rect(screen, Colors.BLACK,
-                        (self.x - health_bar_width/2,
-                         self.y - 80,
-                         health_bar_width,
-                         text_background_height))
-
-        # Фон полоски здоровья
-        pygame.draw.rect(screen, Colors.BLACK,
-                        (self.x - health_bar_width/2,
-                         self.y - 60,
-                         health_bar_width,
-                         health_bar_height))
-
-        # Определение цвета полоски здоровья
-        if health_percentage > 0.7:
-            health_color = Colors.GREEN
-        elif health_percentage > 0.3:
-            health_color = (255, 165, 0)  # Оранжевый
-        else:
-            health_color = Colors.RED
-
-        # Текущее здоровье
-        pygame.draw.rect(screen, health_color,
-                        (self.x - health_bar_width/2,
-                         self.y - 60,
-                         health_bar_width * health_percentage,
-                         health_bar_height))
-
-        # Добавление текста с количеством HP на ченом фоне
-        font = pygame.font.Font(None, 20)
-        hp_text = font.render(f"{self.current_health}/{self.max_health}", True, Colors.WHITE)
-        text_rect = hp_text.get_rect(center=(self.x, self.y - 70))
-        screen.blit(hp_text, text_rect)
+
+        # Надпись HP на черном фоне и полоска под ней собираются в одну поверхность
+        # и пересобираются только при изменении здоровья
+        key = (self.current_health, self.max_health)
+        if key != self._health_bar_key:
+            surface = pygame.Surface((health_bar_width, text_background_height + health_bar_height))
+            surface.fill(Colors.BLACK)
+            surface.blit(HUD.health_bar(health_bar_width, health_bar_height, self.current_health / self.max_health),
+                         (0, text_background_height))
+            hp_text = HUD.text(f"{self.current_health}/{self.max_health}", 20, Colors.WHITE)
+            surface.blit(hp_text, hp_text.get_rect(center=(health_bar_width / 2, text_background_height / 2)))
+            self._health_bar = surface.convert() if pygame.display.get_surface() is not None else surface
+            self._health_bar_key = key
+        return screen.blit(self._health_bar, (int(x - health_bar_width/2), int(y - 80)))
 
 class RedBase(GameBase):
     """Класс красной базы"""
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y, Colors.RED, Team.RED)
+    def __init__(self, x: int, y: int, rng: Optional[np.random.Generator] = None):
+        super().__init__(x, y, Colors.RED, Team.RED, rng=rng)
 
 class BlueBase(GameBase):
     """Класс синей базы"""
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y, Colors.BLUE, Team.BLUE)
+    def __init__(self, x: int, y: int, rng: Optional[np.random.Generator] = None):
+        super().__init__(x, y, Colors.BLUE, Team.BLUE, rng=rng)
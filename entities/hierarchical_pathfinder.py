@@ -0,0 +1,399 @@
+import heapq
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from entities.pathfinder import PathFinder, NEIGHBOR_OFFSETS, SQRT2, _octile
+
+Cell = Tuple[int, int]
+BorderKey = Tuple[str, int, int]  # ('v', cx, cy) - между (cx, cy) и (cx + 1, cy); ('h', cx, cy) - между (cx, cy) и (cx, cy + 1)
+STEPS = [(dx, dy, SQRT2 if dx and dy else 1.0) for dx, dy in NEIGHBOR_OFFSETS.tolist()]
+SINGLE_ENTRANCE_LIMIT = 6  # Проходы короче получают один вход посередине, длиннее - два по краям
+
+
+class _ClusterGraph:
+    """Абстрактный граф входов между кластерами для одного радиуса робота"""
+    def __init__(self, blocked: List[List[bool]], cols: int, rows: int, cluster_size: int):
+        self.cols = cols
+        self.rows = rows
+        self.cluster_size = cluster_size
+        self.cluster_cols = (cols + cluster_size - 1) // cluster_size
+        self.cluster_rows = (rows + cluster_size - 1) // cluster_size
+        self.blocked = blocked
+        self.borders: Dict[BorderKey, List[Tuple[Cell, Cell]]] = {}  # Пары клеток входа по обе стороны границы
+        self.inter: Dict[Cell, Dict[Cell, float]] = {}  # Ребра между кластерами
+        self.intra: Dict[Tuple[int, int], Dict[Cell, Dict[Cell, float]]] = {}  # Ребра внутри кластера
+        self.nodes_expanded = 0  # Узлы, раскрытые поисками внутри кластеров
+
+        for key in self._all_borders():
+            self._build_border(key)
+        for cluster in self._all_clusters():
+            self._build_cluster(cluster)
+
+    def _all_clusters(self) -> Iterator[Tuple[int, int]]:
+        for cx in range(self.cluster_cols):
+            for cy in range(self.cluster_rows):
+                yield cx, cy
+
+    def _all_borders(self) -> Iterator[BorderKey]:
+        for cx, cy in self._all_clusters():
+            if cx + 1 < self.cluster_cols:
+                yield 'v', cx, cy
+            if cy + 1 < self.cluster_rows:
+                yield 'h', cx, cy
+
+    def cluster_of(self, cell: Cell) -> Tuple[int, int]:
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def bounds(self, cluster: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """Границы кластера в клетках: (x0, y0, x1, y1), верхние границы не включаются"""
+        x0, y0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.cols), min(y0 + self.cluster_size, self.rows)
+
+    def _cluster_borders(self, cluster: Tuple[int, int]) -> List[BorderKey]:
+        cx, cy = cluster
+        keys = [('v', cx, cy), ('v', cx - 1, cy), ('h', cx, cy), ('h', cx, cy - 1)]
+        return [key for key in keys if key in self.borders]
+
+    def cluster_nodes(self, cluster: Tuple[int, int]) -> List[Cell]:
+        """Клетки входов, лежащие внутри кластера"""
+        nodes = set()
+        for key in self._cluster_borders(cluster):
+            for a, b in self.borders[key]:
+                nodes.update(cell for cell in (a, b) if self.cluster_of(cell) == cluster)
+        return sorted(nodes)
+
+    def _build_border(self, key: BorderKey) -> None:
+        """Поиск входов на границе двух кластеров: отрезки, свободные с обеих сторон"""
+        orientation, cx, cy = key
+        size = self.cluster_size
+        if orientation == 'v':
+            x = (cx + 1) * size - 1
+            cells = [((x, y), (x + 1, y)) for y in range(cy * size, min((cy + 1) * size, self.rows))]
+        else:
+            y = (cy + 1) * size - 1
+            cells = [((x, y), (x, y + 1)) for x in range(cx * size, min((cx + 1) * size, self.cols))]
+
+        pairs = []
+        run: List[Tuple[Cell, Cell]] = []
+        for pair in cells + [None]:
+            if pair is not None and not any(self.blocked[cell[0]][cell[1]] for cell in pair):
+                run.append(pair)
+                continue
+            if run:
+                if len(run) < SINGLE_ENTRANCE_LIMIT:
+                    pairs.append(run[len(run) // 2])
+                else:
+                    pairs.extend((run[0], run[-1]))
+                run = []
+
+        self.borders[key] = pairs
+        for a, b in pairs:
+            self.inter.setdefault(a, {})[b] = 1.0
+            self.inter.setdefault(b, {})[a] = 1.0
+
+    def _remove_border(self, key: BorderKey) -> None:
+        for a, b in self.borders.pop(key, []):
+            for node, partner in ((a, b), (b, a)):
+                edges = self.inter.get(node)
+                if edges is not None:
+                    edges.pop(partner, None)
+                    if not edges:
+                        del self.inter[node]
+
+    def _build_cluster(self, cluster: Tuple[int, int]) -> None:
+        """Стоимости путей между всеми входами кластера, не выходящих за его границы"""
+        nodes = self.cluster_nodes(cluster)
+        edges: Dict[Cell, Dict[Cell, float]] = {node: {} for node in nodes}
+        for index, node in enumerate(nodes):
+            costs = self.local_costs(node, cluster)
+            for other in nodes[index + 1:]:
+                if other in costs:
+                    edges[node][other] = costs[other]
+                    edges[other][node] = costs[other]
+        self.intra[cluster] = edges
+
+    def update_region(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Перестроение входов и внутренних ребер кластеров, пересекающих прямоугольник клеток"""
+        clusters = {(cx, cy)
+                    for cx in range(max(x0 // self.cluster_size, 0), min(x1 // self.cluster_size, self.cluster_cols - 1) + 1)
+                    for cy in range(max(y0 // self.cluster_size, 0), min(y1 // self.cluster_size, self.cluster_rows - 1) + 1)}
+        borders = {key for cluster in clusters for key in self._cluster_borders(cluster)}
+        for key in borders:
+            self._remove_border(key)
+        for key in borders:
+            self._build_border(key)
+
+        # Входы изменились и у соседей по затронутым границам
+        touched = set(clusters)
+        for orientation, cx, cy in borders:
+            touched.add((cx, cy))
+            touched.add((cx + 1, cy) if orientation == 'v' else (cx, cy + 1))
+        for cluster in touched:
+            self._build_cluster(cluster)
+
+    def local_costs(self, source: Cell, cluster: Tuple[int, int]) -> Dict[Cell, float]:
+        """Дейкстра от клетки по свободным клеткам кластера"""
+        return self.local_search(source, cluster)[0]
+
+    def local_search(self, source: Cell, cluster: Tuple[int, int],
+                     goal: Optional[Cell] = None) -> Tuple[Dict[Cell, float], Dict[Cell, Optional[Cell]]]:
+        """Поиск внутри кластера: A* до goal или Дейкстра по всему кластеру, если goal не задан"""
+        x0, y0, x1, y1 = self.bounds(cluster)
+        blocked = self.blocked
+        frontier = [(0.0, source)]
+        cost_so_far = {source: 0.0}
+        came_from: Dict[Cell, Optional[Cell]] = {source: None}
+        closed = set()
+        while frontier:
+            _, current = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            closed.add(current)
+            if current == goal:
+                break
+            base_cost = cost_so_far[current]
+            for dx, dy, step in STEPS:
+                x, y = current[0] + dx, current[1] + dy
+                if not (x0 <= x < x1 and y0 <= y < y1) or blocked[x][y]:
+                    continue
+                new_cost = base_cost + step
+                next_pos = (x, y)
+                if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
+                    cost_so_far[next_pos] = new_cost
+                    came_from[next_pos] = current
+                    priority = new_cost + (_octile(next_pos, goal) if goal is not None else 0.0)
+                    heapq.heappush(frontier, (priority, next_pos))
+        self.nodes_expanded += len(closed)
+        if goal is None:
+            return {cell: cost_so_far[cell] for cell in closed}, came_from
+        return cost_so_far, came_from
+
+
+class HierarchicalPath:
+    """Путь, уточняемый до клеток по одному отрезку по мере движения"""
+    def __init__(self, finder: 'HierarchicalPathFinder', radius: float, waypoints: List[Cell]):
+        self._finder = finder
+        self._radius = radius
+        self._waypoints = waypoints
+        self._segment = 0  # Индекс следующего неуточненного отрезка
+        self._points = [finder.point(waypoints[0])]
+        self._ensure()
+
+    def _ensure(self) -> None:
+        """Уточнение следующих отрезков, пока в буфере меньше двух точек"""
+        replanned = False
+        while len(self._points) < 2 and self._segment < len(self._waypoints) - 1:
+            start, end = self._waypoints[self._segment], self._waypoints[self._segment + 1]
+            cells = self._finder.refine(start, end, self._radius)
+            if cells is None:
+                # Кластер изменился после абстрактного поиска - поиск заново от начала отрезка
+                if replanned:
+                    self._segment = len(self._waypoints) - 1
+                    break
+                self._replan(start)
+                replanned = True
+                continue
+            self._points.extend(self._finder.point(cell) for cell in cells[1:])
+            self._segment += 1
+
+    def _replan(self, start: Cell) -> None:
+        """Новый путь от клетки start к цели вместо неуточняемого остатка"""
+        finder = self._finder
+        path = finder.find_path(finder.point(start), finder.point(self._waypoints[-1]), self._radius)
+        if isinstance(path, HierarchicalPath):
+            self._waypoints = path._waypoints
+            self._segment = 0
+        else:
+            self._points.extend(list(path)[1:])
+            self._segment = len(self._waypoints) - 1
+
+    @property
+    def remaining_segments(self) -> int:
+        return len(self._waypoints) - 1 - self._segment
+
+    def __len__(self) -> int:
+        self._ensure()
+        return len(self._points)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        self._ensure()
+        return self._points[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Итерация уточняет весь оставшийся путь"""
+        while self:
+            yield self.pop(0)
+
+    def pop(self, index: int = 0) -> np.ndarray:
+        self._ensure()
+        point = self._points.pop(index)
+        self._ensure()
+        return point
+
+
+class HierarchicalPathFinder:
+    """Иерархический поиск пути (HPA*) по кластерам сетки PathFinder"""
+    def __init__(self, pathfinder: PathFinder, cluster_size: int = 10, flat_search_limit: float = 2.0):
+        self.pathfinder = pathfinder
+        self.cluster_size = cluster_size
+        self.flat_search_limit = flat_search_limit  # Порог плоского поиска в размерах кластера
+        self._graphs: Dict[float, _ClusterGraph] = {}
+        # LRU-кэши абстрактных путей (ключ - PathFinder.path_key) и уточненных отрезков размером
+        # PathFinder.cache_size, сбрасываются вместе с графами
+        self._abstract_paths: 'OrderedDict[Tuple, Optional[List[Cell]]]' = OrderedDict()
+        self._segments: 'OrderedDict[Tuple[Cell, Cell, float], Optional[List[Cell]]]' = OrderedDict()
+        self._version = pathfinder.version
+        self.abstract_searches = 0
+        self.abstract_nodes_expanded = 0
+        self.segments_refined = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.pathfinder, name)
+
+    def graph(self, robot_radius: float) -> _ClusterGraph:
+        """Абстрактный граф для радиуса робота (строится один раз)"""
+        if self._version != self.pathfinder.version:
+            # Препятствия изменены в обход add_obstacle/remove_obstacle - полное перестроение
+            self._graphs.clear()
+            self._clear_caches()
+            self._version = self.pathfinder.version
+        key = float(robot_radius)
+        graph = self._graphs.get(key)
+        if graph is None:
+            pathfinder = self.pathfinder
+            graph = self._graphs[key] = _ClusterGraph(pathfinder.occupancy_rows(key), pathfinder.cols,
+                                                      pathfinder.rows, self.cluster_size)
+            pathfinder.nodes_expanded += graph.nodes_expanded  # Построение графа тоже списывается из бюджета
+        return graph
+
+    def point(self, cell: Cell) -> np.ndarray:
+        grid_size = self.pathfinder.grid_size
+        return np.array([cell[0] * grid_size, cell[1] * grid_size])
+
+    def add_obstacle(self, obstacle: 'Obstacle') -> None:
+        """Добавление препятствия с перестроением только затронутых кластеров"""
+        self.pathfinder.add_obstacle(obstacle)
+        self._update_around(obstacle)
+
+    def remove_obstacle(self, obstacle: 'Obstacle') -> None:
+        """Удаление препятствия с перестроением только затронутых кластеров"""
+        self.pathfinder.remove_obstacle(obstacle)
+        self._update_around(obstacle)
+
+    def _clear_caches(self) -> None:
+        self._abstract_paths.clear()
+        self._segments.clear()
+
+    def _update_around(self, obstacle: 'Obstacle') -> None:
+        self._clear_caches()
+        grid_size = self.pathfinder.grid_size
+        for radius, graph in self._graphs.items():
+            graph.blocked = self.pathfinder.occupancy_rows(radius)
+            reach = obstacle.radius + radius
+            graph.update_region(int((obstacle.x - reach) // grid_size), int((obstacle.y - reach) // grid_size),
+                                int((obstacle.x + reach) // grid_size) + 1, int((obstacle.y + reach) // grid_size) + 1)
+        self._version = self.pathfinder.version
+
+    def find_path(self, start: np.ndarray, goal: np.ndarray, robot_radius: float):
+        """Поиск пути: HierarchicalPath или список точек (если путь найден без абстрактного графа)"""
+        pathfinder = self.pathfinder
+        start_cell = (int(start[0] // pathfinder.grid_size), int(start[1] // pathfinder.grid_size))
+        goal_cell = (int(goal[0] // pathfinder.grid_size), int(goal[1] // pathfinder.grid_size))
+        if not (pathfinder._cell(start) and pathfinder._cell(goal)):
+            return pathfinder.find_path(start, goal, robot_radius)
+        if not pathfinder._is_valid_position(goal_cell, robot_radius):
+            return []
+
+        if _octile(start_cell, goal_cell) <= self.flat_search_limit * self.cluster_size:
+            # Короткие запросы дешевле и точнее искать плоским поиском
+            return pathfinder.find_path(start, goal, robot_radius)
+
+        graph = self.graph(robot_radius)
+        key = pathfinder.path_key(start, goal, robot_radius)
+        if key in self._abstract_paths:
+            pathfinder.cache_hits += 1
+            self._abstract_paths.move_to_end(key)
+            waypoints = self._abstract_paths[key]
+        else:
+            pathfinder.cache_misses += 1
+            start_cluster, goal_cluster = graph.cluster_of(start_cell), graph.cluster_of(goal_cell)
+            expanded_before = graph.nodes_expanded + self.abstract_nodes_expanded
+            waypoints = self._abstract_search(graph, start_cell, goal_cell, start_cluster, goal_cluster)
+            pathfinder.nodes_expanded += graph.nodes_expanded + self.abstract_nodes_expanded - expanded_before
+            if pathfinder.cache_size > 0:
+                self._abstract_paths[key] = waypoints
+                if len(self._abstract_paths) > pathfinder.cache_size:
+                    self._abstract_paths.popitem(last=False)
+        if waypoints is None:
+            # Путь через углы кластеров или его нет - плоский поиск
+            return pathfinder.find_path(start, goal, robot_radius)
+        return HierarchicalPath(self, float(robot_radius), waypoints)
+
+    def _abstract_search(self, graph: _ClusterGraph, start_cell: Cell, goal_cell: Cell,
+                         start_cluster: Tuple[int, int], goal_cluster: Tuple[int, int]) -> Optional[List[Cell]]:
+        """A* по графу входов; старт и цель временно подключаются к входам своих кластеров"""
+        self.abstract_searches += 1
+        start_edges = graph.local_costs(start_cell, start_cluster)
+        goal_edges = graph.local_costs(goal_cell, goal_cluster)
+
+        frontier = [(0.0, start_cell)]
+        cost_so_far = {start_cell: 0.0}
+        came_from: Dict[Cell, Optional[Cell]] = {start_cell: None}
+        closed = set()
+        while frontier:
+            _, current = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.abstract_nodes_expanded += 1
+            if current == goal_cell:
+                return self._trace(came_from, goal_cell)
+
+            if current == start_cell:
+                edges = {node: cost for node, cost in start_edges.items() if node in graph.inter}
+            else:
+                edges = dict(graph.intra.get(graph.cluster_of(current), {}).get(current, {}))
+            edges.update(graph.inter.get(current, {}))
+            if current in goal_edges:
+                edges[goal_cell] = goal_edges[current]
+
+            for next_pos, step in edges.items():
+                new_cost = cost_so_far[current] + step
+                if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
+                    cost_so_far[next_pos] = new_cost
+                    came_from[next_pos] = current
+                    heapq.heappush(frontier, (new_cost + _octile(next_pos, goal_cell), next_pos))
+        return None
+
+    @staticmethod
+    def _trace(came_from: Dict[Cell, Optional[Cell]], goal: Cell) -> List[Cell]:
+        path = []
+        current = goal
+        while current is not None:
+            path.append(current)
+            current = came_from[current]
+        return list(reversed(path))
+
+    def refine(self, start: Cell, end: Cell, robot_radius: float) -> Optional[List[Cell]]:
+        """Уточнение отрезка абстрактного пути до клеток; None, если отрезок больше не проходим"""
+        graph = self.graph(robot_radius)
+        if max(abs(start[0] - end[0]), abs(start[1] - end[1])) <= 1:
+            return [start, end]  # Переход через границу кластеров
+        key = (start, end, float(robot_radius))
+        if key in self._segments:
+            self._segments.move_to_end(key)
+            return self._segments[key]
+        self.segments_refined += 1
+        cluster = graph.cluster_of(start)
+        expanded_before = graph.nodes_expanded
+        _, came_from = graph.local_search(start, cluster, end)
+        self.pathfinder.nodes_expanded += graph.nodes_expanded - expanded_before
+        cells = self._trace(came_from, end) if end in came_from else None
+        if self.pathfinder.cache_size > 0:
+            self._segments[key] = cells
+            if len(self._segments) > self.pathfinder.cache_size:
+                self._segments.popitem(last=False)
+        return cells
@@ -0,0 +1,206 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from entities.pathfinder import PathFinder, NEIGHBOR_OFFSETS, SQRT2, _octile
+
+Cell = Tuple[int, int]
+INF = math.inf
+STEPS = [(dx, dy, SQRT2 if dx and dy else 1.0) for dx, dy in NEIGHBOR_OFFSETS.tolist()]
+
+
+class IncrementalPlanner:
+    """Инкрементальное перепланирование преследования (D* Lite)"""
+    def __init__(self, pathfinder: PathFinder, robot_radius: float, reroot_distance: int = 8):
+        self.pathfinder = pathfinder
+        self.robot_radius = float(robot_radius)
+        self.reroot_distance = reroot_distance
+        self.nodes_expanded = 0
+        self.replans = 0  # Перепланирования без перестроения дерева
+        self.resets = 0  # Построения дерева с нуля
+        self.root: Optional[Cell] = None
+        self._path: List[Cell] = []
+        self._path_target: Optional[Cell] = None
+
+    def _reset(self, root: Cell, target: Cell) -> None:
+        """Новое дерево поиска от клетки робота"""
+        self.resets += 1
+        self.root = root
+        self.target = target
+        self.km = 0.0
+        self.g: Dict[Cell, float] = {}
+        self.rhs: Dict[Cell, float] = {root: 0.0}
+        self.queue: List[Tuple[Tuple[float, float], Cell]] = [(self._key(root), root)]
+        self.version = self.pathfinder.version
+        # Сетки общие для всех планировщиков: PathFinder заменяет их, а не изменяет
+        self.blocked = self.pathfinder.occupancy(self.robot_radius)
+        self._blocked_rows = self.pathfinder.occupancy_rows(self.robot_radius)
+        self._adjacent: Dict[Cell, List[Tuple[Cell, float]]] = {}
+        self._path_target = None
+
+    def _key(self, cell: Cell) -> Tuple[float, float]:
+        value = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return value + _octile(self.target, cell) + self.km, value
+
+    def _neighbors(self, cell: Cell) -> List[Tuple[Cell, float]]:
+        """Соседние клетки и стоимости перехода (занятые клетки непроходимы, кроме корня)"""
+        result = self._adjacent.get(cell)
+        if result is not None:
+            return result
+        blocked = self._blocked_rows
+        cx, cy = cell
+        result = self._adjacent[cell] = []
+        if blocked[cx][cy] and cell != self.root:
+            return result
+        cols, rows = len(blocked), len(blocked[0])
+        root = self.root
+        for dx, dy, step in STEPS:
+            x, y = cx + dx, cy + dy
+            if 0 <= x < cols and 0 <= y < rows and (not blocked[x][y] or (x, y) == root):
+                result.append(((x, y), step))
+        return result
+
+    def _update_vertex(self, cell: Cell) -> None:
+        if cell != self.root:
+            g = self.g
+            best = INF
+            for neighbor, step in self._neighbors(cell):
+                cost = g.get(neighbor, INF) + step
+                if cost < best:
+                    best = cost
+            self.rhs[cell] = best
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            heapq.heappush(self.queue, (self._key(cell), cell))
+
+    def _compute(self) -> None:
+        """ComputeShortestPath из D* Lite с ленивым удалением устаревших записей очереди"""
+        g, rhs, queue = self.g, self.rhs, self.queue
+        target = self.target
+        while queue:
+            key, cell = queue[0]
+            g_cell, rhs_cell = g.get(cell, INF), rhs.get(cell, INF)
+            if g_cell == rhs_cell:
+                heapq.heappop(queue)  # Вершина уже согласована
+                continue
+            current_key = self._key(cell)
+            if key < current_key:
+                heapq.heapreplace(queue, (current_key, cell))
+                continue
+            if key >= self._key(target) and rhs.get(target, INF) == g.get(target, INF):
+                break
+
+            heapq.heappop(queue)
+            self.nodes_expanded += 1
+            if g_cell > rhs_cell:
+                g[cell] = rhs_cell
+            else:
+                g[cell] = INF
+                self._update_vertex(cell)
+            for neighbor, _ in self._neighbors(cell):
+                self._update_vertex(neighbor)
+
+    def _apply_obstacle_changes(self) -> None:
+        """Пересчет вершин, чья занятость изменилась"""
+        blocked = self.pathfinder.occupancy(self.robot_radius)
+        if blocked.shape != self.blocked.shape:
+            self._reset(self.root, self.target)
+            return
+        changed = np.argwhere(blocked != self.blocked)
+        self.blocked = blocked
+        self._blocked_rows = self.pathfinder.occupancy_rows(self.robot_radius)
+        self._adjacent.clear()
+        self.version = self.pathfinder.version
+        cols, rows = blocked.shape
+        for x, y in changed.tolist():
+            self._update_vertex((x, y))
+            for dx, dy, _ in STEPS:
+                if 0 <= x + dx < cols and 0 <= y + dy < rows:
+                    self._update_vertex((x + dx, y + dy))
+        self._path_target = None
+
+    def _update(self, position: np.ndarray, target_position: np.ndarray) -> Optional[int]:
+        """Перепланирование; индекс следующей клетки в self._path или None, если пути нет"""
+        pathfinder = self.pathfinder
+        cell = pathfinder._cell(position)
+        target = pathfinder._cell(target_position)
+        if target is None or cell is None or not pathfinder._is_valid_position(target, self.robot_radius):
+            return None
+
+        if self.root is None or _octile(cell, self.root) > self.reroot_distance:
+            self._reset(cell, target)
+        elif self.version != pathfinder.version:
+            self._apply_obstacle_changes()
+
+        if target != self.target:
+            # Смещение "старта" D* Lite: поправка km вместо пересчета ключей очереди
+            self.km += _octile(self.target, target)
+            self.target = target
+
+        if self._path_target != target:
+            self.replans += 1
+            self._compute()
+            self._path = self._extract()
+            self._path_target = target
+
+        index = self._next_index(cell)
+        if index is None and self._path:
+            # Робот далеко от пути - новое дерево от его клетки
+            self._reset(cell, target)
+            self._compute()
+            self._path = self._extract()
+            self._path_target = target
+            index = self._next_index(cell)
+        return index
+
+    def _next_index(self, cell: Cell) -> Optional[int]:
+        """Индекс следующей клетки пути для робота или None, если робот далеко от пути"""
+        window = self._path[:self.reroot_distance * 2 + 2]
+        if cell in window:
+            return window.index(cell) + 1
+        for index in range(len(window) - 1, -1, -1):
+            x, y = window[index]
+            if abs(x - cell[0]) <= 1 and abs(y - cell[1]) <= 1:
+                return index
+        return None
+
+    def _point(self, cell: Cell) -> np.ndarray:
+        grid_size = self.pathfinder.grid_size
+        return np.array([cell[0] * grid_size, cell[1] * grid_size], dtype=float)
+
+    def plan(self, position: np.ndarray, target_position: np.ndarray) -> List[np.ndarray]:
+        """Путь от клетки робота к цели (точки сетки); пустой список, если цель недостижима"""
+        index = self._update(position, target_position)
+        if index is None:
+            return []
+        start = self.pathfinder._cell(position)
+        return [self._point(start)] + [self._point(cell) for cell in self._path[index:]]
+
+    def next_waypoint(self, position: np.ndarray, target_position: np.ndarray) -> Optional[np.ndarray]:
+        """Следующая точка пути к цели (позиция цели в ее клетке); None, если цель недостижима"""
+        index = self._update(position, target_position)
+        if index is None:
+            return None
+        if index >= len(self._path):
+            return np.asarray(target_position, dtype=float)
+        return self._point(self._path[index])
+
+    def _extract(self) -> List[Cell]:
+        """Путь от корня к цели спуском по g от цели"""
+        g = self.g
+        if g.get(self.target, INF) == INF:
+            return []
+        path = [self.target]
+        current = self.target
+        limit = self.blocked.size
+        while current != self.root and len(path) <= limit:
+            best, best_cost = None, INF
+            for neighbor, step in self._neighbors(current):
+                cost = g.get(neighbor, INF) + step
+                if cost < best_cost:
+                    best, best_cost = neighbor, cost
+            if best is None:
+                return []
+            path.append(best)
+            current = best
+        path.reverse()
+        return path
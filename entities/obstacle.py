@@ -2,6 +2,7 @@ from game_system.config import Colors
 from entities.base import BaseEntity
 import pygame
 import math
+from typing import Tuple
 
 class Obstacle(BaseEntity):
     """Класс препятствий на карте"""
@@ -11,21 +12,22 @@ class Obstacle(BaseEntity):
         self.radius = 15 if obstacle_type == "tree" else 20
         self.color = Colors.BROWN if obstacle_type == "tree" else Colors.GRAY
 
-    def draw(self, screen) -> None:
+    def draw(self, screen, offset: Tuple[int, int] = (0, 0)) -> None:
+        x, y = self.x - offset[0], self.y - offset[1]
         if self.type == "tree":
-            self._draw_tree(screen)
+            self._draw_tree(screen, x, y)
         else:
             # Камни остаются круглыми
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.radius)
+            pygame.draw.circle(screen, self.color, (x, y), self.radius)
 
-    def _draw_tree(self, screen) -> None:
-        """Отрисовка дерева"""
+    def _draw_tree(self, screen, x: int, y: int) -> None:
+        """Отрисовка дерева в экранной точке (x, y)"""
         # Ствол дерева
         trunk_width = 16
         trunk_height = 45
         trunk_rect = pygame.Rect(
-            self.x - trunk_width // 2,
-            self.y - trunk_height // 2,
+            x - trunk_width // 2,
+            y - trunk_height // 2,
             trunk_width,
             trunk_height
         )
@@ -39,15 +41,15 @@ class Obstacle(BaseEntity):
 
         # Нижний круг кроны (самый большой)
         pygame.draw.circle(screen, dark_green,
-                         (self.x, self.y - trunk_height//4),  # Почти у основания ствола
+                         (x, y - trunk_height//4),  # Почти у основания ствола
                          crown_radius)
 
         # Средний круг кроны
         pygame.draw.circle(screen, forest_green,
-                         (self.x, self.y - trunk_height//4 - crown_radius//2),  # Вплотную к нижнему
+                         (x, y - trunk_height//4 - crown_radius//2),  # Вплотную к нижнему
                          crown_radius - 5)
 
         # Верхний круг кроны (самый маленький)
         pygame.draw.circle(screen, lime_green,
-                         (self.x, self.y - trunk_height//4 - crown_radius),  # Вплотную к среднему
+                         (x, y - trunk_height//4 - crown_radius),  # Вплотную к среднему
                          crown_radius - 10)
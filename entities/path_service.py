@@ -0,0 +1,125 @@
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from entities.pathfinder import PathFinder, AStarSearch
+
+SEARCH_CHUNK = 64  # Узлов за один шаг при проверке бюджета времени
+
+
+class PathRequest:
+    """Запрос пути одного робота"""
+    __slots__ = ('robot', 'key', 'priority', 'order', 'search')
+
+    def __init__(self, robot: 'Robot', key: Tuple, priority: float, order: int):
+        self.robot = robot
+        self.key = key
+        self.priority = priority
+        self.order = order  # Порядковый номер: отличает запрос от отмененных с тем же роботом
+        self.search: Optional[AStarSearch] = None  # Начатый, но не завершенный поиск
+
+
+class PathRequestService:
+    """Очередь запросов пути с бюджетом раскрытых узлов или времени на тик"""
+    def __init__(self, pathfinder: PathFinder, node_budget: Optional[int] = 500,
+                 time_budget_ms: Optional[float] = None):
+        self.pathfinder = pathfinder
+        self.node_budget = node_budget  # Детерминирован, в отличие от бюджета времени
+        self.time_budget_ms = time_budget_ms
+        self._queue: List[Tuple[float, int, int]] = []  # (приоритет, порядковый номер, id робота)
+        self._requests: Dict[int, PathRequest] = {}
+        self._counter = itertools.count()
+        self.requests_submitted = 0
+        self.requests_completed = 0
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def request(self, robot: 'Robot', goal: np.ndarray) -> Optional[List[np.ndarray]]:
+        """Путь из кэша или None, если запрос поставлен в очередь (готовый путь попадет в robot.current_path)"""
+        if id(robot) in self._requests:
+            # Один запрос на робота: новые цели не перезапускают начатый поиск
+            return None
+
+        key = self.pathfinder.path_key(robot.position, goal, robot.radius)
+        path = self.pathfinder.cached_path(key)
+        if path is not None:
+            return path
+
+        request = PathRequest(robot, key, robot.distance_to(goal), next(self._counter))
+        self._requests[id(robot)] = request
+        heapq.heappush(self._queue, (request.priority, request.order, id(robot)))
+        self.requests_submitted += 1
+        return None
+
+    def is_pending(self, robot: 'Robot') -> bool:
+        """Ожидает ли робот результата поиска"""
+        return id(robot) in self._requests
+
+    def cancel(self, robot: 'Robot') -> None:
+        """Отмена запроса робота"""
+        self._requests.pop(id(robot), None)
+
+    def process(self) -> None:
+        """Разбор очереди в пределах бюджета текущего тика"""
+        nodes_left = self.node_budget if self.node_budget is not None else float('inf')
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000
+
+        while self._queue and nodes_left > 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            priority, order, robot_key = self._queue[0]
+            request = self._requests.get(robot_key)
+            if request is None or order != request.order or not request.robot.is_alive():
+                # Запрос отменен или робот погиб
+                heapq.heappop(self._queue)
+                if request is not None and not request.robot.is_alive():
+                    del self._requests[robot_key]
+                continue
+
+            path, expanded = self._advance(request, nodes_left, deadline)
+            nodes_left -= expanded
+            if path is not None:
+                heapq.heappop(self._queue)
+                del self._requests[robot_key]
+                self._deliver(request.robot, path)
+
+    def _advance(self, request: PathRequest, nodes_left: float,
+                 deadline: Optional[float]) -> Tuple[Optional[List[np.ndarray]], int]:
+        """Продолжение поиска по запросу: (путь или None, раскрыто узлов)"""
+        pathfinder = self.pathfinder
+        if not isinstance(pathfinder, PathFinder) or pathfinder.backend != 'astar':
+            # Другие алгоритмы выполняются целиком, их узлы списываются из бюджета
+            expanded_before = pathfinder.nodes_expanded
+            start = np.array(request.key[0], dtype=float) * pathfinder.grid_size
+            goal = np.array(request.key[1], dtype=float) * pathfinder.grid_size
+            path = pathfinder.find_path(start, goal, request.key[2])
+            return path, max(pathfinder.nodes_expanded - expanded_before, 1)
+
+        if request.search is None:
+            path = pathfinder.cached_path(request.key)
+            if path is not None:
+                return path, 1
+            request.search = pathfinder.create_search(request.key)
+
+        expanded = 0
+        search = request.search
+        while not search.finished and expanded < nodes_left:
+            chunk = min(nodes_left - expanded, SEARCH_CHUNK) if deadline is not None else nodes_left - expanded
+            expanded += search.step(chunk)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        if not search.finished:
+            return None, max(expanded, 1)
+        return pathfinder.complete_search(request.key, search), max(expanded, 1)
+
+    def _deliver(self, robot: 'Robot', path: List[np.ndarray]) -> None:
+        """Передача готового пути роботу"""
+        self.requests_completed += 1
+        # Клетка старта уже пройдена, пока запрос ждал своей очереди
+        if len(path) > 1:
+            path.pop(0)
+        robot.current_path = path
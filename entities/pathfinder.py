@@ -1,15 +1,248 @@
-from typing import List, Tuple
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
 import numpy as np
 import heapq
-from game_system.config import WINDOW_WIDTH, WINDOW_HEIGHT
+import math
+from game_system.config import WORLD_WIDTH, WORLD_HEIGHT
+from entities.visibility_graph import VisibilityGraph
+
+SQRT2 = math.sqrt(2)
+PATHFINDING_BACKENDS = ('astar', 'jps', 'visibility')
+NEIGHBOR_OFFSETS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1)])
+
+
+def _octile(a: Tuple[int, int], b: Tuple[int, int]) -> float:
+    """Длина кратчайшего пути между клетками на пустой 8-связной сетке (диагональ - sqrt(2))"""
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def _shift(array: np.ndarray, dx: int, dy: int, fill) -> np.ndarray:
+    """Сдвинутая копия сетки: result[x, y] = array[x + dx, y + dy], за границами - fill"""
+    result = np.full_like(array, fill)
+    cols, rows = array.shape
+    result[max(-dx, 0):cols - max(dx, 0), max(-dy, 0):rows - max(dy, 0)] = \
+        array[max(dx, 0):cols - max(-dx, 0), max(dy, 0):rows - max(-dy, 0)]
+    return result
+
+
+class FlowField:
+    """Поле направлений к одной цели, общее для всех роботов одного радиуса"""
+    def __init__(self, blocked: np.ndarray, goal_cell: Tuple[int, int], grid_size: int):
+        self.goal_cell = goal_cell
+        self.grid_size = grid_size
+        self.distance = self._distances(blocked, goal_cell)
+        self.next_x, self.next_y = self._directions()
+
+    @staticmethod
+    def _distances(blocked: np.ndarray, goal_cell: Tuple[int, int]) -> np.ndarray:
+        """Расстояния до цели алгоритмом Дейкстры с теми же стоимостями шагов, что в A* (диагональ - sqrt(2))"""
+        cols, rows = blocked.shape
+        free = (~blocked).ravel().tolist()
+        distance = [math.inf] * (cols * rows)
+        goal = goal_cell[0] * rows + goal_cell[1]
+        distance[goal] = 0.0
+        queue = [(0.0, goal)]
+        steps = [(dx * rows + dy, dx, dy, SQRT2 if dx and dy else 1.0) for dx, dy in NEIGHBOR_OFFSETS.tolist()]
+        while queue:
+            current, index = heapq.heappop(queue)
+            if current > distance[index]:
+                continue  # Устаревшая запись очереди
+            x, y = divmod(index, rows)
+            for offset, dx, dy, step in steps:
+                if 0 <= x + dx < cols and 0 <= y + dy < rows:
+                    neighbor = index + offset
+                    cost = current + step
+                    if free[neighbor] and cost < distance[neighbor]:
+                        distance[neighbor] = cost
+                        heapq.heappush(queue, (cost, neighbor))
+        return np.array(distance).reshape(cols, rows)
+
+    def _directions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Следующая клетка для каждой клетки сетки (-1 - направления нет)"""
+        neighbor_distances = np.stack([_shift(self.distance, dx, dy, np.inf) for dx, dy in NEIGHBOR_OFFSETS])
+        step_costs = np.where(np.all(NEIGHBOR_OFFSETS != 0, axis=1), SQRT2, 1.0)[:, None, None]
+        best = np.argmin(neighbor_distances + step_costs, axis=0)
+        best_distance = np.take_along_axis(neighbor_distances, best[None], axis=0)[0]
+        # Занятые и недостижимые клетки тоже получают направление, если рядом есть достижимая клетка
+        valid = np.isfinite(best_distance) & (best_distance < self.distance)
+
+        cols, rows = self.distance.shape
+        xs, ys = np.meshgrid(np.arange(cols), np.arange(rows), indexing='ij')
+        next_x = np.where(valid, xs + NEIGHBOR_OFFSETS[best, 0], -1)
+        next_y = np.where(valid, ys + NEIGHBOR_OFFSETS[best, 1], -1)
+        return next_x, next_y
+
+    def waypoint(self, cell: Tuple[int, int]) -> Optional[np.ndarray]:
+        """Точка следующей клетки на пути к цели или None (клетка цели или нет направления)"""
+        next_x = self.next_x[cell]
+        if next_x < 0:
+            return None
+        return np.array([next_x * self.grid_size, self.next_y[cell] * self.grid_size], dtype=float)
+
+
+class WaypointPath:
+    """Путь - массив точек (n, 2) с курсором; pop(0) сдвигает курсор, копия делит массив с кэшем путей"""
+    __slots__ = ('points', 'cursor')
+
+    def __init__(self, points: np.ndarray, cursor: int = 0):
+        self.points = points
+        self.cursor = cursor
+
+    @classmethod
+    def from_points(cls, points: List[np.ndarray]) -> 'WaypointPath':
+        array = np.array(points, dtype=float).reshape(-1, 2)
+        array.flags.writeable = False
+        return cls(array)
+
+    def copy(self) -> 'WaypointPath':
+        return WaypointPath(self.points, self.cursor)
+
+    def __len__(self) -> int:
+        return len(self.points) - self.cursor
+
+    def __bool__(self) -> bool:
+        return self.cursor < len(self.points)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс за пределами пути")
+        return self.points[self.cursor + index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self.points[self.cursor:])
+
+    def pop(self, index: int = 0) -> np.ndarray:
+        """Снятие первой точки пути (другие индексы не поддерживаются)"""
+        if index != 0:
+            raise IndexError("точки снимаются только с начала пути")
+        point = self[0]
+        self.cursor += 1
+        return point
+
 
 class PathFinder:
-    """Класс для поиска пути (A* алгоритм)"""
-    def __init__(self, obstacles: List['Obstacle'], grid_size: int = 20):
+    """Класс для поиска пути (A* или Jump Point Search по 8-связной сетке, либо граф видимости)"""
+    def __init__(self, obstacles: List['Obstacle'], grid_size: int = 20,
+                 width: int = WORLD_WIDTH, height: int = WORLD_HEIGHT, cache_size: int = 4096,
+                 backend: str = 'astar', smoothing: bool = True):
+        if backend not in PATHFINDING_BACKENDS:
+            raise ValueError(f"Неизвестный алгоритм поиска пути: {backend}")
+        self.backend = backend
+        self.smoothing = smoothing  # Спрямление путей по сетке (string pulling)
         self.grid_size = grid_size
         self.obstacles = obstacles
-        self.rows = WINDOW_HEIGHT // grid_size
-        self.cols = WINDOW_WIDTH // grid_size
+        self.rows = height // grid_size
+        self.cols = width // grid_size
+        self.searches = 0  # Счетчики для профилирования
+        self.nodes_expanded = 0
+        self.version = 0  # Увеличивается при каждом изменении набора препятствий
+        # Растеризованные препятствия, раздутые на радиус робота: radius -> bool[cols, rows]
+        self._occupancy: Dict[float, np.ndarray] = {}
+        self._occupancy_rows: Dict[float, List[List[bool]]] = {}  # Те же сетки в виде списков
+        # LRU-кэш путей: (клетка старта, клетка цели, радиус) -> путь, включая пустые (неудачные) результаты
+        self.cache_size = cache_size
+        self._path_cache: 'OrderedDict[Tuple, List[np.ndarray]]' = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Поля направлений: (клетка цели, радиус) -> FlowField
+        self._flow_fields: Dict[Tuple, FlowField] = {}
+        self.flow_fields_built = 0
+        # Данные JPS: radius -> (занятость, {(dx, dy): координата следующей остановки}) в виде списков
+        self._jump_tables: Dict[float, Tuple[List, Dict[Tuple[int, int], List]]] = {}
+        # Графы видимости: radius -> VisibilityGraph
+        self._visibility_graphs: Dict[float, VisibilityGraph] = {}
+
+    def set_obstacles(self, obstacles: List['Obstacle']) -> None:
+        """Замена набора препятствий"""
+        self.obstacles = obstacles
+        self.invalidate()
+
+    def add_obstacle(self, obstacle: 'Obstacle') -> None:
+        """Добавление препятствия"""
+        self.obstacles.append(obstacle)
+        self.invalidate()
+
+    def remove_obstacle(self, obstacle: 'Obstacle') -> None:
+        """Удаление препятствия"""
+        self.obstacles.remove(obstacle)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Сброс данных, зависящих от препятствий (вызывать при изменении списка obstacles извне)"""
+        self.version += 1
+        self._occupancy.clear()
+        self._occupancy_rows.clear()
+        self._path_cache.clear()
+        self._flow_fields.clear()
+        self._jump_tables.clear()
+        self._visibility_graphs.clear()
+
+    def occupancy(self, robot_radius: float) -> np.ndarray:
+        """Сетка занятых клеток для робота заданного радиуса (строится один раз, только для чтения)"""
+        key = float(robot_radius)
+        grid = self._occupancy.get(key)
+        if grid is None:
+            grid = self._occupancy[key] = self._rasterize(key)
+            grid.flags.writeable = False  # Сетка общая для всех пользователей PathFinder
+        return grid
+
+    def occupancy_rows(self, robot_radius: float) -> List[List[bool]]:
+        """Сетка occupancy в виде списков (поэлементный доступ быстрее, чем к ndarray); не изменять"""
+        key = float(robot_radius)
+        rows = self._occupancy_rows.get(key)
+        if rows is None:
+            rows = self._occupancy_rows[key] = self.occupancy(key).tolist()
+        return rows
+
+    def _cell(self, point) -> Optional[Tuple[int, int]]:
+        """Клетка сетки, содержащая точку, или None за пределами сетки"""
+        x, y = int(point[0] // self.grid_size), int(point[1] // self.grid_size)
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return x, y
+        return None
+
+    def flow_field(self, goal: np.ndarray, robot_radius: float) -> Optional[FlowField]:
+        """Поле направлений к цели для роботов заданного радиуса (строится один раз)"""
+        goal_cell = self._cell(goal)
+        if goal_cell is None:
+            return None
+        key = (goal_cell, float(robot_radius))
+        field = self._flow_fields.get(key)
+        if field is None:
+            field = self._flow_fields[key] = FlowField(self.occupancy(robot_radius), goal_cell, self.grid_size)
+            self.flow_fields_built += 1
+        return field
+
+    def next_waypoint(self, position: np.ndarray, goal: np.ndarray, robot_radius: float) -> Optional[np.ndarray]:
+        """Следующая точка к цели по полю направлений за O(1); None - двигаться прямо к цели"""
+        cell = self._cell(position)
+        if cell is None:
+            return None
+        field = self.flow_field(goal, robot_radius)
+        if field is None:
+            return None
+        return field.waypoint(cell)
+
+    def _rasterize(self, robot_radius: float) -> np.ndarray:
+        """Растеризация препятствий: каждое препятствие обрабатывается только в своем ограничивающем квадрате"""
+        # Клетка занята, если ее точка ближе obstacle.radius + robot_radius к центру - как в _is_valid_exact
+        grid = np.zeros((self.cols, self.rows), dtype=bool)
+        for obstacle in self.obstacles:
+            reach = obstacle.radius + robot_radius
+            x0 = max(int(np.floor((obstacle.x - reach) / self.grid_size)), 0)
+            x1 = min(int(np.ceil((obstacle.x + reach) / self.grid_size)), self.cols - 1)
+            y0 = max(int(np.floor((obstacle.y - reach) / self.grid_size)), 0)
+            y1 = min(int(np.ceil((obstacle.y + reach) / self.grid_size)), self.rows - 1)
+            if x0 > x1 or y0 > y1:
+                continue
+            xs = np.arange(x0, x1 + 1) * self.grid_size - obstacle.x
+            ys = np.arange(y0, y1 + 1) * self.grid_size - obstacle.y
+            distances = np.hypot(xs[:, None], ys[None, :])
+            grid[x0:x1 + 1, y0:y1 + 1] |= distances < reach
+        return grid
 
     def _get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Получение соседних клеток"""
@@ -23,46 +256,343 @@ class PathFinder:
 
     def _is_valid_position(self, pos: Tuple[int, int], robot_radius: int) -> bool:
         """Проверка валидности позиции"""
+        if 0 <= pos[0] < self.cols and 0 <= pos[1] < self.rows:
+            return not self.occupancy(robot_radius)[pos[0], pos[1]]
+        # Клетки за пределами сетки (например, точка отступления за краем карты)
+        return self._is_valid_exact(pos, robot_radius)
+
+    def _is_valid_exact(self, pos: Tuple[int, int], robot_radius: int) -> bool:
+        """Точная проверка валидности позиции перебором препятствий"""
         x, y = pos[0] * self.grid_size, pos[1] * self.grid_size
         for obstacle in self.obstacles:
             if np.linalg.norm(np.array([x, y]) - np.array([obstacle.x, obstacle.y])) < (obstacle.radius + robot_radius):
                 return False
         return True
 
-    def find_path(self, start: np.ndarray, goal: np.ndarray, robot_radius: int) -> List[np.ndarray]:
-        """Поиск пути с помощью A*"""
+    def path_key(self, start: np.ndarray, goal: np.ndarray, robot_radius: float) -> Tuple:
+        """Ключ кэша путей: клетки старта и цели и радиус робота"""
         start_pos = (int(start[0] // self.grid_size), int(start[1] // self.grid_size))
         goal_pos = (int(goal[0] // self.grid_size), int(goal[1] // self.grid_size))
+        return start_pos, goal_pos, float(robot_radius)
+
+    def cached_path(self, key: Tuple) -> Optional[WaypointPath]:
+        """Копия пути из кэша или None"""
+        path = self._path_cache.get(key)
+        if path is None:
+            return None
+        self.cache_hits += 1
+        self._path_cache.move_to_end(key)
+        # Роботы расходуют путь через pop(0), поэтому наружу отдается копия с собственным курсором
+        return path.copy()
+
+    def _store_path(self, key: Tuple, points: List[np.ndarray]) -> WaypointPath:
+        path = WaypointPath.from_points(points)
+        self._path_cache[key] = path
+        if len(self._path_cache) > self.cache_size:
+            self._path_cache.popitem(last=False)
+        return path.copy()
+
+    def find_path(self, start: np.ndarray, goal: np.ndarray, robot_radius: int) -> WaypointPath:
+        """Поиск кратчайшего пути (результаты кэшируются по клеткам старта и цели)"""
+        key = self.path_key(start, goal, robot_radius)
+        path = self.cached_path(key)
+        if path is not None:
+            return path
+        self.cache_misses += 1
+        return self._store_path(key, self._search(key[0], key[1], robot_radius))
 
+    def create_search(self, key: Tuple) -> 'AStarSearch':
+        """Поиск A* по ключу path_key, выполняемый по частям (см. AStarSearch.step)"""
+        self.cache_misses += 1
+        self.searches += 1
+        start_pos, goal_pos, robot_radius = key
+        if not self._is_valid_position(goal_pos, robot_radius):
+            return AStarSearch(self, start_pos, goal_pos, None)
+        return AStarSearch(self, start_pos, goal_pos, self.occupancy(robot_radius))
+
+    def complete_search(self, key: Tuple, search: 'AStarSearch') -> WaypointPath:
+        """Путь по завершенному поиску create_search (сохраняется в кэш)"""
+        path = self._reconstruct(search.came_from, search.goal_pos, key[2]) if search.goal_valid else []
+        return self._store_path(key, path)
+
+    def _search(self, start_pos: Tuple[int, int], goal_pos: Tuple[int, int],
+                robot_radius: int) -> List[np.ndarray]:
+        """Поиск пути между клетками выбранным алгоритмом"""
+        self.searches += 1
         if not self._is_valid_position(goal_pos, robot_radius):
             return []
 
+        if self.backend == 'visibility':
+            return self._search_visibility(start_pos, goal_pos, robot_radius)
+        if self.backend == 'jps':
+            came_from = self._search_jps(start_pos, goal_pos, robot_radius)
+        else:
+            came_from = self._search_astar(start_pos, goal_pos, self.occupancy(robot_radius))
+        return self._reconstruct(came_from, goal_pos, robot_radius)
+
+    def _reconstruct(self, came_from: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+                     goal_pos: Tuple[int, int], robot_radius: float) -> List[np.ndarray]:
+        """Восстановление пути (промежуточные клетки между точками прыжков добавляются по прямой)"""
+        cells = []
+        current = goal_pos
+        while current is not None:
+            previous = came_from.get(current)
+            cells.append(current)
+            if previous is not None:
+                step_x = int(np.sign(previous[0] - current[0]))
+                step_y = int(np.sign(previous[1] - current[1]))
+                x, y = current[0] + step_x, current[1] + step_y
+                while (x, y) != previous:
+                    cells.append((x, y))
+                    x, y = x + step_x, y + step_y
+            current = previous
+
+        cells.reverse()
+        if self.smoothing:
+            cells = self._smooth(cells, self.occupancy(robot_radius))
+        return [np.array([x * self.grid_size, y * self.grid_size]) for x, y in cells]
+
+    def _smooth(self, cells: List[Tuple[int, int]], blocked: np.ndarray) -> List[Tuple[int, int]]:
+        """Спрямление пути (string pulling): от опорной клетки - к самой дальней видимой клетке пути"""
+        if len(cells) <= 2:
+            return cells
+        # Точки поворота: клетки внутри прямых участков проверять не нужно
+        corners = [cells[0]]
+        for previous, cell, following in zip(cells, cells[1:], cells[2:]):
+            if (cell[0] - previous[0], cell[1] - previous[1]) != (following[0] - cell[0], following[1] - cell[1]):
+                corners.append(cell)
+        corners.append(cells[-1])
+
+        result = [corners[0]]
+        anchor = corners[0]
+        for index in range(2, len(corners)):
+            if not self._line_of_sight(anchor, corners[index], blocked):
+                anchor = corners[index - 1]
+                result.append(anchor)
+        result.append(corners[-1])
+        return result
+
+    def _line_of_sight(self, start: Tuple[int, int], end: Tuple[int, int], blocked: np.ndarray) -> bool:
+        """Свободны ли клетки растеризованного отрезка (без клетки start)"""
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        steps = max(abs(dx), abs(dy))
+        if steps <= 1:
+            return True
+        # Шаг в полклетки: спрямленный отрезок срезает углы примерно как диагональные ходы A*
+        t = np.arange(2, 2 * steps + 1) / (2 * steps)
+        xs = start[0] + np.rint(t * dx).astype(int)
+        ys = start[1] + np.rint(t * dy).astype(int)
+        cols, rows = blocked.shape
+        if xs.min() < 0 or ys.min() < 0 or xs.max() >= cols or ys.max() >= rows:
+            return False
+        return not blocked[xs, ys].any()
+
+    def _search_astar(self, start_pos: Tuple[int, int], goal_pos: Tuple[int, int],
+                      blocked: np.ndarray) -> Dict[Tuple[int, int], Optional[Tuple[int, int]]]:
+        """A* по соседним клеткам, возвращает словарь предков"""
+        search = AStarSearch(self, start_pos, goal_pos, blocked)
+        search.step()
+        return search.came_from
+
+    def visibility_graph(self, robot_radius: float) -> VisibilityGraph:
+        """Граф видимости для роботов заданного радиуса (строится один раз на радиус)"""
+        key = float(robot_radius)
+        graph = self._visibility_graphs.get(key)
+        if graph is None:
+            graph = self._visibility_graphs[key] = VisibilityGraph(
+                self.obstacles, key, self.cols * self.grid_size, self.rows * self.grid_size)
+        return graph
+
+    def _search_visibility(self, start_pos: Tuple[int, int], goal_pos: Tuple[int, int],
+                           robot_radius: float) -> List[np.ndarray]:
+        """Путь по графу видимости: несколько точек поворота вместо точки на каждую клетку"""
+        graph = self.visibility_graph(robot_radius)
+        expanded_before = graph.nodes_expanded
+        path = graph.find_path(np.array(start_pos, dtype=float) * self.grid_size,
+                               np.array(goal_pos, dtype=float) * self.grid_size)
+        self.nodes_expanded += graph.nodes_expanded - expanded_before
+        return path
+
+    def jump_tables(self, robot_radius: float) -> Tuple[List, Dict[Tuple[int, int], List]]:
+        """Таблицы прямых прыжков для JPS (строятся один раз на радиус)"""
+        key = float(robot_radius)
+        tables = self._jump_tables.get(key)
+        if tables is None:
+            blocked = self.occupancy(key)
+            # Вложенные списки индексируются поэлементно быстрее массивов NumPy
+            tables = self._jump_tables[key] = (
+                self.occupancy_rows(key),
+                {direction: table.tolist() for direction, table in self._build_jump_tables(blocked).items()}
+            )
+        return tables
+
+    def _build_jump_tables(self, blocked: np.ndarray) -> Dict[Tuple[int, int], np.ndarray]:
+        # Для каждого прямого направления - координата первой клетки, где прыжок останавливается
+        # (занятой или с вынужденным соседом); за краем сетки -1 или размер сетки
+        free = ~blocked
+        cols, rows = blocked.shape
+        xs = np.arange(cols)[:, None]
+        ys = np.arange(rows)[None, :]
+        tables = {}
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            # Вынужденный сосед: клетка сбоку занята, а клетка по диагонали вперед свободна
+            px, py = dy, dx  # Перпендикулярное направление
+            forced = np.zeros_like(free)
+            for side in (1, -1):
+                forced |= (_shift(free, dx + side * px, dy + side * py, False) &
+                           ~_shift(free, side * px, side * py, False))
+            stop = blocked | forced
+            axis, coords, size = (0, xs, cols) if dx else (1, ys, rows)
+            forward = dx + dy > 0
+            index = np.where(stop, coords, size if forward else -1)
+            if forward:
+                # Минимум по клеткам строго впереди
+                nearest = np.flip(np.minimum.accumulate(np.flip(index, axis), axis=axis), axis)
+                table = _shift(nearest, dx, dy, size)
+            else:
+                nearest = np.maximum.accumulate(index, axis=axis)
+                table = _shift(nearest, dx, dy, -1)
+            tables[(dx, dy)] = table
+        return tables
+
+    def _search_jps(self, start_pos: Tuple[int, int], goal_pos: Tuple[int, int],
+                    robot_radius: float) -> Dict[Tuple[int, int], Optional[Tuple[int, int]]]:
+        """Jump Point Search со срезанием углов (ходы как в _get_neighbors), возвращает словарь предков"""
+        cols, rows = self.cols, self.rows
+        goal_x, goal_y = goal_pos
+        blocked_rows, tables = self.jump_tables(robot_radius)
+
+        def walkable(x: int, y: int) -> bool:
+            return 0 <= x < cols and 0 <= y < rows and not blocked_rows[x][y]
+
+        def jump_straight(x: int, y: int, dx: int, dy: int) -> Optional[Tuple[int, int]]:
+            """Прямой прыжок по таблице остановок"""
+            if not (0 <= x < cols and 0 <= y < rows):
+                return None
+            stop = tables[(dx, dy)][x][y]
+            if dx:
+                # Цель на этой строке между текущей клеткой и остановкой
+                if goal_y == y and (x < goal_x <= stop if dx > 0 else stop <= goal_x < x):
+                    return goal_pos
+                point = (stop, y)
+            else:
+                if goal_x == x and (y < goal_y <= stop if dy > 0 else stop <= goal_y < y):
+                    return goal_pos
+                point = (x, stop)
+            if not walkable(*point):
+                return None
+            return point
+
+        def jump(x: int, y: int, dx: int, dy: int) -> Optional[Tuple[int, int]]:
+            """Движение из (x, y) в направлении (dx, dy) до точки прыжка"""
+            if not (dx and dy):
+                return jump_straight(x, y, dx, dy)
+            while True:
+                x, y = x + dx, y + dy
+                if not walkable(x, y):
+                    return None
+                if x == goal_x and y == goal_y:
+                    return x, y
+                # Вынужденные соседи при диагональном движении
+                if ((walkable(x - dx, y + dy) and not walkable(x - dx, y)) or
+                        (walkable(x + dx, y - dy) and not walkable(x, y - dy))):
+                    return x, y
+                if jump_straight(x, y, dx, 0) is not None or jump_straight(x, y, 0, dy) is not None:
+                    return x, y
+
+        def directions(node: Tuple[int, int], parent: Optional[Tuple[int, int]]) -> List[Tuple[int, int]]:
+            """Направления после отсечения соседей, до которых есть путь не хуже в обход node"""
+            if parent is None:
+                return [tuple(offset) for offset in NEIGHBOR_OFFSETS.tolist()]
+            x, y = node
+            dx = int(np.sign(x - parent[0]))
+            dy = int(np.sign(y - parent[1]))
+            if dx and dy:
+                result = [(dx, 0), (0, dy), (dx, dy)]
+                if not walkable(x - dx, y):
+                    result.append((-dx, dy))
+                if not walkable(x, y - dy):
+                    result.append((dx, -dy))
+            elif dx:
+                result = [(dx, 0)]
+                if not walkable(x, y + 1):
+                    result.append((dx, 1))
+                if not walkable(x, y - 1):
+                    result.append((dx, -1))
+            else:
+                result = [(0, dy)]
+                if not walkable(x + 1, y):
+                    result.append((1, dy))
+                if not walkable(x - 1, y):
+                    result.append((-1, dy))
+            return result
+
         frontier = [(0, start_pos)]
         came_from = {start_pos: None}
         cost_so_far = {start_pos: 0}
 
         while frontier:
             _, current = heapq.heappop(frontier)
+            self.nodes_expanded += 1
 
             if current == goal_pos:
                 break
 
-            for next_pos in self._get_neighbors(current):
-                if not self._is_valid_position(next_pos, robot_radius):
+            for dx, dy in directions(current, came_from[current]):
+                next_pos = jump(current[0], current[1], dx, dy)
+                if next_pos is None:
                     continue
 
-                new_cost = cost_so_far[current] + 1
+                new_cost = cost_so_far[current] + _octile(current, next_pos)
                 if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
                     cost_so_far[next_pos] = new_cost
-                    priority = new_cost + np.linalg.norm(np.array(goal_pos) - np.array(next_pos))
+                    priority = new_cost + _octile(goal_pos, next_pos)
                     heapq.heappush(frontier, (priority, next_pos))
                     came_from[next_pos] = current
 
-        # Восстановление пути
-        path = []
-        current = goal_pos
-        while current is not None:
-            path.append(np.array([current[0] * self.grid_size, current[1] * self.grid_size]))
-            current = came_from.get(current)
+        return came_from
+
+
+class AStarSearch:
+    """Состояние поиска A*, который можно выполнять по частям между тиками"""
+    def __init__(self, pathfinder: PathFinder, start_pos: Tuple[int, int], goal_pos: Tuple[int, int],
+                 blocked: Optional[np.ndarray]):
+        self.pathfinder = pathfinder
+        self.goal_pos = goal_pos
+        self.goal_valid = blocked is not None  # None - цель занята, искать нечего
+        self.blocked = blocked
+        self.frontier = [(0, start_pos)] if self.goal_valid else []
+        self.came_from: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start_pos: None}
+        self.cost_so_far = {start_pos: 0}
+        self.finished = not self.goal_valid
+
+    def step(self, max_nodes: float = math.inf) -> int:
+        """Раскрытие не более max_nodes узлов, возвращает число раскрытых"""
+        frontier, came_from, cost_so_far = self.frontier, self.came_from, self.cost_so_far
+        blocked, goal_pos = self.blocked, self.goal_pos
+        expanded = 0
+
+        while frontier and expanded < max_nodes:
+            _, current = heapq.heappop(frontier)
+            expanded += 1
+
+            if current == goal_pos:
+                self.finished = True
+                break
+
+            for next_pos in self.pathfinder._get_neighbors(current):
+                if blocked[next_pos]:  # Соседи всегда внутри сетки
+                    continue
+
+                step = SQRT2 if next_pos[0] != current[0] and next_pos[1] != current[1] else 1
+                new_cost = cost_so_far[current] + step
+                if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
+                    cost_so_far[next_pos] = new_cost
+                    priority = new_cost + _octile(goal_pos, next_pos)
+                    heapq.heappush(frontier, (priority, next_pos))
+                    came_from[next_pos] = current
 
-        return list(reversed(path))
+        if not frontier:
+            self.finished = True
+        self.pathfinder.nodes_expanded += expanded
+        return expanded
@@ -1,37 +1,117 @@
 import pygame
 import numpy as np
-from game_system.config import Colors
-
-class Projectile:
-    """Класс для управления снарядами"""
-    def __init__(self, start_pos: np.ndarray, target_pos: np.ndarray, speed: float, damage: float):
-        self.position = start_pos
-        self.target_pos = target_pos
-        self.speed = speed
-        self.damage = damage
-        self.active = True
-
-        # Вычисление направления движения
-        direction = target_pos - start_pos
-        self.direction = direction / np.linalg.norm(direction)
-
-    def update(self) -> None:
-        """Обновление позиции снаряда"""
-        if self.active:
-            self.position += self.direction * self.speed
-            # Проверка достижения цели
-            if np.linalg.norm(self.position - self.target_pos) < self.speed:
-                self.active = False
-
-    def draw(self, screen: pygame.Surface) -> None:
-        """Отрисовка снаряда"""
-        if self.active:
-            pygame.draw.circle(screen, (255, 255, 0), self.position.astype(int), 3)
-
-    def check_collision(self, target: 'Robot') -> bool:
-        """Проверка столкновения с роботом"""
-        return np.linalg.norm(self.position - target.position) < target.radius
-
-    def check_collision_with_base(self, base: 'GameBase') -> bool:
-        """Проверка столкновения с базой"""
-        return np.linalg.norm(self.position - np.array([base.x, base.y])) < base.radius
+from typing import Dict, List, Optional, Tuple
+
+PROJECTILE_COLOR = (255, 255, 0)
+PROJECTILE_RADIUS = 3
+
+def draw_projectiles(screen: pygame.Surface, positions: np.ndarray,
+                     offset: Tuple[int, int] = (0, 0)) -> List[pygame.Rect]:
+    """Отрисовка снарядов по массиву позиций, возвращает занятые области экрана"""
+    return [pygame.draw.circle(screen, PROJECTILE_COLOR, (x, y), PROJECTILE_RADIUS)
+            for x, y in (positions - offset).astype(int).tolist()]
+
+class ProjectilePool:
+    """Общий пул снарядов всей игры в виде предвыделенных массивов (снаряды переживают стрелка)"""
+    def __init__(self, capacity: int = 256):
+        self.capacity = 0
+        self.position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.target = np.zeros((0, 2))
+        self.speed = np.zeros(0)
+        self.damage = np.zeros(0)
+        self.team = np.zeros(0, dtype=np.int8)  # Код команды стрелка
+        self.active = np.zeros(0, dtype=bool)
+        self._free: List[int] = []  # Освободившиеся слоты переиспользуются без новых выделений
+        self._grow(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        """Расширение массивов пула до новой емкости"""
+        old = self.capacity
+        for name, shape, dtype in (('position', (capacity, 2), float), ('velocity', (capacity, 2), float),
+                                   ('target', (capacity, 2), float), ('speed', (capacity,), float),
+                                   ('damage', (capacity,), float), ('team', (capacity,), np.int8),
+                                   ('active', (capacity,), bool)):
+            column = np.zeros(shape, dtype=dtype)
+            column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        # Свободные слоты выдаются с меньших индексов
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free)
+
+    def spawn(self, start_pos: np.ndarray, target_pos: np.ndarray, speed: float,
+              damage: float, team_code: int) -> int:
+        """Выпуск снаряда, возвращает слот (-1, если цель совпадает с точкой выстрела)"""
+        direction = np.asarray(target_pos, dtype=float) - start_pos
+        distance = np.hypot(direction[0], direction[1])
+        if distance == 0:
+            return -1
+        if not self._free:
+            self._grow(self.capacity * 2)
+
+        slot = self._free.pop()
+        self.position[slot] = start_pos
+        self.target[slot] = target_pos
+        self.velocity[slot] = direction / distance * speed
+        self.speed[slot] = speed
+        self.damage[slot] = damage
+        self.team[slot] = team_code
+        self.active[slot] = True
+        return slot
+
+    def update(self, world: 'WorldState', enemy_bases: Dict[int, 'GameBase']) -> None:
+        """Пакетный шаг: перемещение, попадания и выход за карту (enemy_bases - база врага по коду команды)"""
+        slots = np.flatnonzero(self.active)
+        if slots.size == 0:
+            return
+
+        # Интегрирование и проверка достижения точки прицеливания
+        self.position[slots] += self.velocity[slots]
+        position = self.position[slots]
+        delta = position - self.target[slots]
+        alive = np.hypot(delta[:, 0], delta[:, 1]) >= self.speed[slots]
+
+        for team_code, enemy_base in enemy_bases.items():
+            flying = alive & (self.team[slots] == team_code)
+            if not flying.any():
+                continue
+            indices = np.flatnonzero(flying)
+
+            # Попадания по роботам: кандидаты из пространственного индекса противника
+            grid = world.grids[1 - team_code]
+            query, robot_slots = grid.candidate_pairs(position[indices], world.max_radius)
+            if query.size:
+                delta = position[indices[query]] - world.position[robot_slots]
+                hit = np.hypot(delta[:, 0], delta[:, 1]) < world.radius[robot_slots]
+                query, robot_slots = query[hit], robot_slots[hit]
+                # Каждый снаряд поражает только одного робота
+                query, first = np.unique(query, return_index=True)
+                for index, robot_slot in zip(indices[query], robot_slots[first]):
+                    world.robots[robot_slot].take_damage(self.damage[slots[index]])
+                alive[indices[query]] = False
+                indices = indices[alive[indices]]
+
+            # Попадания по базе
+            delta = position[indices] - (enemy_base.x, enemy_base.y)
+            hit = np.hypot(delta[:, 0], delta[:, 1]) < enemy_base.radius
+            if hit.any():
+                enemy_base.current_health -= float(self.damage[slots[indices[hit]]].sum())
+                alive[indices[hit]] = False
+
+        # Выход за пределы карты
+        alive &= ((position[:, 0] >= 0) & (position[:, 0] <= world.width) &
+                  (position[:, 1] >= 0) & (position[:, 1] <= world.height))
+
+        finished = slots[~alive]
+        self.active[finished] = False
+        self._free.extend(finished.tolist())
+
+    def draw(self, screen: pygame.Surface, camera: Optional['Camera'] = None) -> List[pygame.Rect]:
+        """Отрисовка всех активных снарядов (с камерой - только видимых), возвращает занятые области"""
+        positions = self.position[self.active]
+        if camera is None:
+            return draw_projectiles(screen, positions)
+        return draw_projectiles(screen, positions[camera.visible_mask(positions, PROJECTILE_RADIUS)], camera.offset)
@@ -1,10 +1,15 @@
 from genetic.genetic_robot import GeneticRobot
-from game_system.config import Colors, WINDOW_WIDTH, WINDOW_HEIGHT
+from game_system.config import Colors, WORLD_WIDTH, WORLD_HEIGHT
+from game_system.assets import ASSETS
+from game_system.hud import HUD
 import pygame
+import math
 import numpy as np
 from enum import Enum
-from typing import List, Optional
-from entities.projectile import Projectile
+from typing import List, Optional, Tuple
+from entities.world_state import RobotColumn
+from entities.incremental_planner import IncrementalPlanner
+from entities.pathfinder import PathFinder
 
 class Team(Enum):
     """Перечисление для команд"""
@@ -13,8 +18,25 @@ class Team(Enum):
 
 class Robot(GeneticRobot):
     """Базовый класс для всех роботов"""
+    # Атрибуты, хранящиеся в столбцах WorldState после добавления робота в мир
+    position = RobotColumn()
+    health = RobotColumn()
+    max_health = RobotColumn()
+    speed = RobotColumn()
+    damage = RobotColumn()
+    radius = RobotColumn()
+    attack_range = RobotColumn()
+    attack_cooldown = RobotColumn()
+    last_attack_time = RobotColumn()
+    kills = RobotColumn()
+    damage_taken = RobotColumn()
+    base_damage_dealt = RobotColumn()
+
     def __init__(self, x: int, y: int, team: Team):
         super().__init__()  # Инициализация генетических свойств
+        self.world = None  # Общее состояние мира (WorldState)
+        self.slot = -1  # Индекс робота в столбцах WorldState
+        self.robot_id = -1
         self.genes = None  # Убедитесь, что атрибут существует
         self.position = np.array([x, y], dtype=float)
         self.team = team
@@ -24,7 +46,11 @@ class Robot(GeneticRobot):
         self.radius = 15
         self.current_path = []
         self.pathfinder = None
-        self.spawn_time = pygame.time.get_ticks()
+        self.path_service = None  # Очередь запросов пути (PathRequestService), при отсутствии - поиск сразу
+        self.heading = None  # Направление последнего движения (единичный вектор)
+        self.planner = None  # Инкрементальный планировщик преследования (IncrementalPlanner)
+        self.clock = None  # Игровые часы (SimulationClock), при отсутствии - часы pygame
+        self.spawn_time = self._get_time()
         self.kills = 0  # Инициализация счетчика убийств
         self.base_damage_dealt = 0.0  # Инициализация урона по базе
         self.damage_taken = 0.0  # Инициализация полученного урона
@@ -33,6 +59,21 @@ class Robot(GeneticRobot):
         """Установка pathfinder для робота"""
         self.pathfinder = pathfinder
 
+    def set_path_service(self, path_service: 'PathRequestService') -> None:
+        """Установка очереди запросов пути для робота"""
+        self.path_service = path_service
+
+    def set_clock(self, clock: 'SimulationClock') -> None:
+        """Установка игровых часов для робота"""
+        self.clock = clock
+        self.spawn_time = clock.get_ticks()
+
+    def _get_time(self) -> int:
+        """Текущее игровое время в миллисекундах"""
+        if self.clock is not None:
+            return self.clock.get_ticks()
+        return pygame.time.get_ticks()
+
     def is_alive(self) -> bool:
         """Проверка, жив ли робот"""
         return self.health > 0
@@ -44,7 +85,7 @@ class Robot(GeneticRobot):
             print("Warning: Robot has no genes")
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = self._get_time()
 
         # Обновление метрик боя
         self.update_battle_metrics(
@@ -69,10 +110,13 @@ class Robot(GeneticRobot):
                 if nearest_enemy and self.health / self.max_health > 0.3:
                     self._attack(nearest_enemy)
                 else:
-                    self.move_along_path(np.array([enemy_base.x, enemy_base.y]), obstacles)
+                    self.move_to_base(enemy_base, obstacles)
 
     def _is_strong_enemy_present(self, enemies: List['Robot']) -> bool:
         """Проверка наличия сильного врага"""
+        if self.world is not None and self.world.queries_valid:
+            return self.world.max_team_health[self.world.enemy_code(self.slot)] > 100
+
         for enemy in enemies:
             if enemy.is_alive() and enemy.health > 100:  # Пример порога
                 return True
@@ -80,6 +124,13 @@ class Robot(GeneticRobot):
 
     def _coordinate_attack(self, allies: List['Robot'], enemies: List['Robot']) -> None:
         """Координация атаки с союзниками"""
+        if self.world is not None and self.world.queries_valid:
+            # Координация одинакова для всей команды, достаточно провести ее раз за тик
+            team_code = int(self.world.team[self.slot])
+            if self.world.coordinated[team_code]:
+                return
+            self.world.coordinated[team_code] = True
+
         target = self._find_strongest_enemy(enemies)
         if target:
             for ally in allies:
@@ -89,73 +140,101 @@ class Robot(GeneticRobot):
 
     def _find_strongest_enemy(self, enemies: List['Robot']) -> Optional['Robot']:
         """Поиск самого сильного врага"""
+        if self.world is not None and self.world.queries_valid:
+            strongest = self.world.strongest[self.world.enemy_code(self.slot)]
+            return self.world.robots[strongest] if strongest >= 0 else None
         return max(enemies, key=lambda e: e.health if e.is_alive() else 0, default=None)
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Отрисовка робота"""
-        screen.blit(self.image, self.rect)
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """Отрисовка полоски здоровья (offset - сдвиг камеры), возвращает занятую область экрана"""
+        x, y = self.position[0] - offset[0], self.position[1] - offset[1]
 
-        # Отрисовка полоски здоровья
-        health_percentage = self.health / self.max_health
+        # Полоска здоровья в белой рамке: готовая поверхность для текущего уровня здоровья
         health_bar_width = 30
         health_bar_height = 5
-
-        # елый фон для полоски здоровья
-        pygame.draw.rect(screen, Colors.WHITE,
-                        (self.position[0] - health_bar_width/2 - 1,
-                         self.position[1] - self.radius - 11,
-                         health_bar_width + 2,
-                         health_bar_height + 2))
-
-        # Черная рамка
-        pygame.draw.rect(screen, Colors.BLACK,
-                        (self.position[0] - health_bar_width/2,
-                         self.position[1] - self.radius - 10,
-                         health_bar_width,
-                         health_bar_height))
-
-        # Текущее здоровье
-        if health_percentage > 0.7:
-            health_color = Colors.GREEN
-        elif health_percentage > 0.3:
-            health_color = (255, 165, 0)  # Оранжевый
-        else:
-            health_color = Colors.RED
-
-        pygame.draw.rect(screen, health_color,
-                        (self.position[0] - health_bar_width/2,
-                         self.position[1] - self.radius - 10,
-                         health_bar_width * health_percentage,
-                         health_bar_height))
+        bar = HUD.health_bar(health_bar_width, health_bar_height, self.health / self.max_health, Colors.WHITE)
+        return screen.blit(bar, (int(x - health_bar_width/2 - 1), int(y - self.radius - 11)))
 
     def distance_to(self, target_position: np.ndarray) -> float:
         """Вычисление расстояния до целевой позиции"""
-        return np.linalg.norm(self.position - target_position)
+        position = self.position
+        return math.hypot(position[0] - target_position[0], position[1] - target_position[1])
 
     def move_along_path(self, target_position: np.ndarray, obstacles: List['Obstacle']) -> None:
         """Движение по пути с обходом препятствий"""
         if not self.current_path:
-            if self.pathfinder:
+            if self.path_service is not None:
+                path = self.path_service.request(self, target_position)
+                if path is None:
+                    # Путь еще ищется - движение в прежнем направлении
+                    if self.heading is not None:
+                        self.move_towards(self.position + self.heading * self.speed)
+                    return
+                self.current_path = path
+            elif self.pathfinder:
                 self.current_path = self.pathfinder.find_path(self.position, target_position, self.radius)
 
         if self.current_path:
             next_point = self.current_path[0]
-            if np.linalg.norm(self.position - next_point) < self.speed:
+            if self.distance_to(next_point) < self.speed:
                 self.current_path.pop(0)
             else:
                 self.move_towards(next_point)
 
+    def _grid_navigation(self) -> bool:
+        """Доступны ли поле направлений и D* Lite: они дают те же кратчайшие пути, что A* на сетке"""
+        return isinstance(self.pathfinder, PathFinder) and self.pathfinder.backend == 'astar'
+
+    def move_to_base(self, enemy_base: 'GameBase', obstacles: List['Obstacle']) -> None:
+        """Движение к вражеской базе: при A* - по общему полю направлений, иначе выбранным алгоритмом"""
+        target_position = np.array([enemy_base.x, enemy_base.y], dtype=float)
+        if not self._grid_navigation():
+            self.move_along_path(target_position, obstacles)
+            return
+
+        self.current_path = []  # Следующий поиск пути начнется с текущей позиции
+        if self.path_service is not None:
+            self.path_service.cancel(self)
+        waypoint = self.pathfinder.next_waypoint(self.position, target_position, self.radius)
+        self.move_towards(waypoint if waypoint is not None else target_position)
+
+    def pursue(self, target_position: np.ndarray, obstacles: List['Obstacle']) -> None:
+        """Преследование движущейся цели: при A* - с инкрементальным перепланированием (D* Lite)"""
+        if not self._grid_navigation():
+            self.move_along_path(target_position, obstacles)
+            return
+
+        if self.planner is None or self.planner.pathfinder is not self.pathfinder:
+            self.planner = IncrementalPlanner(self.pathfinder, self.radius)
+        self.current_path = []
+        if self.path_service is not None:
+            self.path_service.cancel(self)
+        waypoint = self.planner.next_waypoint(self.position, target_position)
+        if waypoint is not None:
+            self.move_towards(waypoint)
+
     def move_towards(self, target_position: np.ndarray) -> None:
         """Движение к целевой позиции с учетом границ карты"""
+        offset_x = target_position[0] - self.position[0]
+        offset_y = target_position[1] - self.position[1]
+        length = math.hypot(offset_x, offset_y)
+        if length > 0:
+            self.heading = np.array([offset_x / length, offset_y / length])
+
+        if self.world is not None:
+            # Перемещение будет применено пакетно в конце тика
+            self.world.set_move_target(self.slot, target_position)
+            return
+
         direction = target_position - self.position
         distance = np.linalg.norm(direction)
         if distance > 0:
             normalized_direction = direction / distance
             new_position = self.position + normalized_direction * min(self.speed, distance)
 
-            # Проверка границ карты
-            new_position[0] = np.clip(new_position[0], self.radius, WINDOW_WIDTH - self.radius)
-            new_position[1] = np.clip(new_position[1], self.radius, WINDOW_HEIGHT - self.radius)
+            # Проверка границ карты (без WorldState - границы мира по умолчанию)
+            new_position[0] = np.clip(new_position[0], self.radius, WORLD_WIDTH - self.radius)
+            new_position[1] = np.clip(new_position[1], self.radius, WORLD_HEIGHT - self.radius)
 
             self.position = new_position
 
@@ -173,11 +252,20 @@ class Robot(GeneticRobot):
 
     def _can_attack_base(self, enemy_base: 'GameBase') -> bool:
         """Проверка возможности атаки базы"""
-        distance = np.linalg.norm(self.position - np.array([enemy_base.x, enemy_base.y]))
-        return distance <= self.attack_range
+        return self._distance_to_base(enemy_base) <= self.attack_range
+
+    def _distance_to_base(self, enemy_base: 'GameBase') -> float:
+        """Расстояние до вражеской базы"""
+        if self.world is not None and self.world.queries_valid:
+            return self.world.base_distance[self.slot]
+        return self.distance_to((enemy_base.x, enemy_base.y))
 
     def _find_nearest_enemy(self, enemies: List['Robot']) -> Optional['Robot']:
         """Поиск ближайшего врага"""
+        if self.world is not None and self.world.queries_valid:
+            nearest = self.world.find_nearest_enemy(self.slot)
+            return self.world.robots[nearest] if nearest >= 0 else None
+
         living_enemies = [e for e in enemies if e.is_alive()]
         if not living_enemies:
             return None
@@ -185,6 +273,10 @@ class Robot(GeneticRobot):
 
     def _find_weakest_ally(self, allies: List['Robot']) -> Optional['Robot']:
         """Поиск союзника с наименьшим здоровьем"""
+        if self.world is not None and self.world.queries_valid:
+            weakest = self.world.weakest_ally(self.slot)
+            return self.world.robots[weakest] if weakest >= 0 else None
+
         living_allies = [a for a in allies if a.is_alive() and a != self]
         if not living_allies:
             return None
@@ -193,29 +285,35 @@ class Robot(GeneticRobot):
     def _attack(self, target: 'Robot' or 'GameBase') -> None:
         """Атака цели"""
         if isinstance(target, Robot):
-            current_time = pygame.time.get_ticks()
+            current_time = self._get_time()
             if current_time - self.last_attack_time >= self.attack_cooldown:
-                target.take_damage(self.damage)
-                if not target.is_alive():
-                    self.kills += 1  # Увеличиваем счетчик убийств
+                target.take_damage(self.damage, attacker=self)
                 self.last_attack_time = current_time
         else:
             self._attack_base(target)
 
     def _attack_base(self, enemy_base: 'GameBase') -> None:
         """Атака базы"""
-        current_time = pygame.time.get_ticks()
+        current_time = self._get_time()
         if current_time - self.last_attack_time >= self.attack_cooldown:
             enemy_base.current_health -= self.damage
             self.base_damage_dealt += self.damage  # Увеличиваем урон по базе
             self.last_attack_time = current_time
 
-    def take_damage(self, damage: float) -> None:
-        """Получение урона"""
+    def take_damage(self, damage: float, attacker: Optional['Robot'] = None) -> None:
+        """Получение урона (attacker получает убийство, если удар оказался смертельным)"""
+        if self.world is not None:
+            # Урон будет применен пакетно в конце тика
+            attacker_slot = attacker.slot if attacker is not None and attacker.world is self.world else -1
+            self.world.queue_damage(self.slot, damage, attacker_slot)
+            return
+
         self.health = max(0, self.health - damage)
         self.damage_taken += damage  # Увеличиваем полученный урон
         if self.health <= 0:
             self.alive = False
+            if attacker is not None:
+                attacker.kills += 1  # Увеличиваем счетчик убийств
 
 class MeleeRobot(Robot):
     """Робот ближнего боя"""
@@ -231,13 +329,12 @@ class MeleeRobot(Robot):
         self.detection_range = 200
         self.attack_threshold = 0.5  # Добавлен атрибут
 
-        # Загрузка изображения
+        # Спрайт из общего кэша: загружается один раз на процесс
         if team == Team.BLUE:
-            self.image = pygame.image.load("./pic/BlueMeleeAgent.png")
+            self.image = ASSETS.sprite("BlueMeleeAgent", (40, 40))
         else:
-            self.image = pygame.image.load("./pic/RedMeleeAgent.png")
-        self.image = pygame.transform.scale(self.image, (40, 40))
-        self.rect = self.image.get_rect()
+            self.image = ASSETS.sprite("RedMeleeAgent", (40, 40))
+        self.rect = pygame.Rect(0, 0, 40, 40)
 
     def update(self, allies: List[Robot], enemies: List[Robot],
                obstacles: List['Obstacle'], enemy_base: 'GameBase') -> None:
@@ -263,33 +360,33 @@ class MeleeRobot(Robot):
                 self._attack(nearest_enemy)
             elif dist_to_enemy <= self.detection_range:
                 if relative_strength > self.attack_threshold:
-                    self.move_along_path(nearest_enemy.position, obstacles)
+                    self.pursue(nearest_enemy.position, obstacles)
                 else:
                     # Отступление при низкой агрессивности или здоровье
                     retreat_pos = self.position + (self.position - nearest_enemy.position) * 2
                     self.move_along_path(retreat_pos, obstacles)
         else:
             # Движение к базе при отсутствии врагов
-            self.move_along_path(np.array([enemy_base.x, enemy_base.y]), obstacles)
+            self.move_to_base(enemy_base, obstacles)
 
     def _attack_base(self, enemy_base: 'GameBase') -> None:
         """Атака базы"""
-        current_time = pygame.time.get_ticks()
+        current_time = self._get_time()
         if current_time - self.last_attack_time >= self.attack_cooldown:
             enemy_base.current_health -= self.damage
             self.base_damage_dealt += self.damage  # Увеличиваем урон по базе
             self.last_attack_time = current_time
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Отрисовка робота"""
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """Отрисовка робота, возвращает занятую область экрана"""
         # Обновление позиции прямоугольника изображения
-        self.rect.center = self.position.astype(int)
+        self.rect.center = (self.position - offset).astype(int)
 
         # Отрисовка изображения
-        screen.blit(self.image, self.rect)
+        sprite_rect = screen.blit(self.image, self.rect)
 
         # Отрисовка полоски здоровья
-        super().draw(screen)
+        return sprite_rect.union(super().draw(screen, offset))
 
 class RangedRobot(Robot):
     """Робот дальнего боя"""
@@ -304,18 +401,16 @@ class RangedRobot(Robot):
         self.attack_range = 200
         self.optimal_range = 150
         self.retreat_range = 100
-        self.projectiles = []
         self.projectile_speed = 8
         self.attack_cooldown = 1500
         self.attack_threshold = 0.5  # Добавлен атрибут
 
-        # Загрузка изображения
+        # Спрайт из общего кэша: загружается один раз на процесс
         if team == Team.BLUE:
-            self.image = pygame.image.load("./pic/BlueRangedAgent.png")
+            self.image = ASSETS.sprite("BlueRangedAgent", (36, 36))
         else:
-            self.image = pygame.image.load("./pic/RedRangedAgent.png")
-        self.image = pygame.transform.scale(self.image, (36, 36))
-        self.rect = self.image.get_rect()
+            self.image = ASSETS.sprite("RedRangedAgent", (36, 36))
+        self.rect = pygame.Rect(0, 0, 36, 36)
 
     def update(self, allies: List[Robot], enemies: List[Robot],
                obstacles: List['Obstacle'], enemy_base: 'GameBase') -> None:
@@ -325,11 +420,8 @@ class RangedRobot(Robot):
 
         super().update(allies, enemies, obstacles, enemy_base)
 
-        # Обновление снарядов
-        self._update_projectiles(enemies, enemy_base)
-
         # Проверка агрессивности для принятия решений
-        base_distance = np.linalg.norm(self.position - np.array([enemy_base.x, enemy_base.y]))
+        base_distance = self._distance_to_base(enemy_base)
         if self.optimal_range <= base_distance <= self.attack_range:
             self._attack_base_with_projectile(enemy_base)
             return
@@ -343,60 +435,36 @@ class RangedRobot(Robot):
                 retreat_pos = self.position + (self.position - nearest_enemy.position) * 2
                 self.move_along_path(retreat_pos, obstacles)
             elif dist_to_enemy > self.optimal_range:
-                self.move_along_path(nearest_enemy.position, obstacles)
+                self.pursue(nearest_enemy.position, obstacles)
             elif dist_to_enemy <= self.attack_range:
                 self._attack(nearest_enemy)
 
-    def _update_projectiles(self, enemies: List[Robot], enemy_base: 'GameBase') -> None:
-        """Обновление всех активных снарядов"""
-        for projectile in self.projectiles:
-            projectile.update()
-
-            # Проверка попаданий по роботам
-            for enemy in enemies:
-                if enemy.is_alive() and projectile.active and projectile.check_collision(enemy):
-                    enemy.take_damage(projectile.damage)
-                    projectile.active = False
-
-            # Проверка попаданий по базе
-            if projectile.active and projectile.check_collision_with_base(enemy_base):
-                enemy_base.current_health -= projectile.damage
-                projectile.active = False
-
-            # Проверка выхода за пределы экрана
-            if (projectile.position[0] < 0 or projectile.position[0] > WINDOW_WIDTH or
-                projectile.position[1] < 0 or projectile.position[1] > WINDOW_HEIGHT):
-                projectile.active = False
-
-        self.projectiles = [p for p in self.projectiles if p.active]
-
     def _attack_base_with_projectile(self, enemy_base: 'GameBase') -> None:
-        """Атака базы снарядом"""
-        current_time = pygame.time.get_ticks()
+        """Атака базы снарядом из общего пула снарядов"""
+        if self.world is None:
+            return
+
+        current_time = self._get_time()
         if current_time - self.last_attack_time >= self.attack_cooldown:
-            projectile = Projectile(
-                self.position.copy(),
+            self.world.projectiles.spawn(
+                self.position,
                 np.array([enemy_base.x, enemy_base.y]),
                 self.projectile_speed,
-                self.damage * 0.5  # Уменьшенный урон по базе для баланса
+                self.damage * 0.5,  # Уменьшенный урон по базе для баланса
+                self.world.team[self.slot]
             )
-            self.projectiles.append(projectile)
             self.last_attack_time = current_time
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Отрисовка робота и снарядов"""
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """Отрисовка робота, возвращает занятую область экрана"""
         # Обновление позиции прямоугольника изображения
-        self.rect.center = self.position.astype(int)
+        self.rect.center = (self.position - offset).astype(int)
 
         # Отрисовка изображения
-        screen.blit(self.image, self.rect)
+        sprite_rect = screen.blit(self.image, self.rect)
 
         # Отрисовка полоски здоровья
-        super().draw(screen)
-
-        # Отрисовка снарядов
-        for projectile in self.projectiles:
-            projectile.draw(screen)
+        return sprite_rect.union(super().draw(screen, offset))
 
 class TankRobot(Robot):
     """Робот-танк"""
@@ -413,13 +481,12 @@ class TankRobot(Robot):
         self.damage_reduction = 0.5
         self.attack_threshold = 0.5  # Добавлен атибут
 
-        # Загрузка изображения
+        # Спрайт из общего кэша: загружается один раз на процесс
         if team == Team.BLUE:
-            self.image = pygame.image.load("./pic/BlueTankAgent.png")
+            self.image = ASSETS.sprite("BlueTankAgent", (50, 50))
         else:
-            self.image = pygame.image.load("./pic/RedTankAgent.png")
-        self.image = pygame.transform.scale(self.image, (50, 50))
-        self.rect = self.image.get_rect()
+            self.image = ASSETS.sprite("RedTankAgent", (50, 50))
+        self.rect = pygame.Rect(0, 0, 50, 50)
 
     def update(self, allies: List[Robot], enemies: List[Robot],
                obstacles: List['Obstacle'], enemy_base: 'GameBase') -> None:
@@ -439,26 +506,30 @@ class TankRobot(Robot):
         weak_ally = self._find_weakest_ally(allies)
         if weak_ally and weak_ally.health < weak_ally.max_health * 0.5:
             self.move_along_path(weak_ally.position, obstacles)
-            for enemy in enemies:
+            if self.world is not None and self.world.queries_valid:
+                candidates = self.world.enemies_within(self.slot, self.position, self.attack_range)
+            else:
+                candidates = enemies
+            for enemy in candidates:
                 if (enemy.is_alive() and
                     enemy.distance_to(weak_ally.position) <= enemy.attack_range and
                     self.distance_to(enemy.position) <= self.attack_range):
                     self._attack(enemy)
         else:
-            self.move_along_path(np.array([enemy_base.x, enemy_base.y]), obstacles)
+            self.move_to_base(enemy_base, obstacles)
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Отрисовка робота"""
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """Отрисовка робота, возвращает занятую область экрана"""
         # Обновление позиции прямоугольника изображения
-        self.rect.center = self.position.astype(int)
+        self.rect.center = (self.position - offset).astype(int)
 
         # Отрисовка изображения
-        screen.blit(self.image, self.rect)
+        sprite_rect = screen.blit(self.image, self.rect)
 
         # Отрисовка полоски здоровья
-        super().draw(screen)
+        return sprite_rect.union(super().draw(screen, offset))
 
-    def take_damage(self, damage: float) -> None:
+    def take_damage(self, damage: float, attacker: Optional[Robot] = None) -> None:
         """Переопределенное получение урона с учетом брони"""
-        super().take_damage(damage * self.damage_reduction)
+        super().take_damage(damage * self.damage_reduction, attacker)
 
@@ -0,0 +1,171 @@
+import math
+import numpy as np
+from typing import Dict, Tuple
+
+KEY_OFFSET = 1 << 20  # Смещение координат клеток, чтобы ключи были неотрицательными
+KEY_SHIFT = 1 << 21
+BRUTE_FORCE_LIMIT = 32  # При малом числе точек полный перебор быстрее обхода колец
+
+
+class SpatialHash:
+    """Равномерная сетка для запросов ближайших соседей и попадания в радиус (перестраивается целиком за O(n))"""
+    def __init__(self, cell_size: float = 100.0):
+        self.cell_size = cell_size
+        self.positions = np.zeros((0, 2))
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.distance_checks = 0  # Счетчик проверок расстояний (для профилирования)
+        self._order = np.zeros(0, dtype=np.int64)
+        self._sorted_keys = np.zeros(0, dtype=np.int64)
+        self._cells: Dict[int, Tuple[int, int]] = {}
+        self._bounds = (0, 0, -1, -1)
+
+    def _key(self, cx, cy):
+        """Ключ клетки по ее координатам"""
+        return (cx + KEY_OFFSET) * KEY_SHIFT + (cy + KEY_OFFSET)
+
+    def build(self, positions: np.ndarray, ids: np.ndarray) -> None:
+        """Перестроение сетки по позициям точек и их идентификаторам"""
+        self.positions = positions
+        self.ids = ids
+        if len(positions) == 0:
+            self._order = np.zeros(0, dtype=np.int64)
+            self._sorted_keys = np.zeros(0, dtype=np.int64)
+            self._cells = {}
+            self._bounds = (0, 0, -1, -1)
+            return
+
+        cells = np.floor(positions / self.cell_size).astype(np.int64)
+        keys = self._key(cells[:, 0], cells[:, 1])
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+
+        unique_keys, starts, counts = np.unique(self._sorted_keys, return_index=True, return_counts=True)
+        self._cells = dict(zip(unique_keys.tolist(), zip(starts.tolist(), (starts + counts).tolist())))
+        self._bounds = (int(cells[:, 0].min()), int(cells[:, 1].min()),
+                        int(cells[:, 0].max()), int(cells[:, 1].max()))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _cell_of(self, point) -> Tuple[int, int]:
+        return math.floor(point[0] / self.cell_size), math.floor(point[1] / self.cell_size)
+
+    def _members(self, cx: int, cy: int) -> np.ndarray:
+        """Индексы точек (в массиве positions), попавших в клетку"""
+        span = self._cells.get(self._key(cx, cy))
+        if span is None:
+            return self._order[:0]
+        return self._order[span[0]:span[1]]
+
+    def _gather(self, point, radius: float) -> np.ndarray:
+        """Индексы точек из всех клеток, пересекающих квадрат вокруг окружности запроса"""
+        min_x, min_y, max_x, max_y = self._bounds
+        cx0 = max(math.floor((point[0] - radius) / self.cell_size), min_x)
+        cy0 = max(math.floor((point[1] - radius) / self.cell_size), min_y)
+        cx1 = min(math.floor((point[0] + radius) / self.cell_size), max_x)
+        cy1 = min(math.floor((point[1] + radius) / self.cell_size), max_y)
+
+        chunks = [self._members(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+        chunks = [chunk for chunk in chunks if chunk.size]
+        if not chunks:
+            return self._order[:0]
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def _distances(self, point, indices: np.ndarray) -> np.ndarray:
+        self.distance_checks += indices.size
+        delta = self.positions[indices] - (point[0], point[1])
+        return np.hypot(delta[:, 0], delta[:, 1])
+
+    def query_radius(self, point, radius: float) -> np.ndarray:
+        """Идентификаторы всех точек на расстоянии не больше radius"""
+        indices = self._gather(point, radius)
+        if indices.size == 0:
+            return self.ids[:0]
+        return self.ids[indices[self._distances(point, indices) <= radius]]
+
+    def any_within(self, point, radius: float) -> bool:
+        """Проверка наличия хотя бы одной точки на расстоянии не больше radius"""
+        indices = self._gather(point, radius)
+        return bool(indices.size) and bool(np.any(self._distances(point, indices) <= radius))
+
+    def k_nearest(self, point, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """k ближайших точек: (идентификаторы, расстояния) по возрастанию расстояния"""
+        if len(self.ids) == 0 or k <= 0:
+            return self.ids[:0], np.zeros(0)
+        if len(self.ids) <= BRUTE_FORCE_LIMIT:
+            distances = self._distances(point, self._order)
+            nearest = np.argsort(distances, kind='stable')[:k]
+            return self.ids[self._order[nearest]], distances[nearest]
+
+        cx, cy = self._cell_of(point)
+        min_x, min_y, max_x, max_y = self._bounds
+        max_ring = max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y))
+
+        found_indices = []
+        found_distances = []
+        found = 0
+        # Клетки просматриваются кольцами вокруг точки запроса
+        for ring in range(max_ring + 1):
+            ring_chunks = []
+            for x in range(max(cx - ring, min_x), min(cx + ring, max_x) + 1):
+                if x == cx - ring or x == cx + ring:
+                    ys = range(max(cy - ring, min_y), min(cy + ring, max_y) + 1)
+                else:
+                    ys = [y for y in (cy - ring, cy + ring) if min_y <= y <= max_y]
+                for y in ys:
+                    members = self._members(x, y)
+                    if members.size:
+                        ring_chunks.append(members)
+
+            if ring_chunks:
+                indices = np.concatenate(ring_chunks)
+                found_indices.append(indices)
+                found_distances.append(self._distances(point, indices))
+                found += indices.size
+
+            # Все непросмотренные точки находятся дальше ring * cell_size
+            if found >= k:
+                kth = np.partition(np.concatenate(found_distances), k - 1)[k - 1]
+                if kth <= ring * self.cell_size:
+                    break
+
+        indices = np.concatenate(found_indices)
+        distances = np.concatenate(found_distances)
+        nearest = np.argsort(distances, kind='stable')[:k]
+        return self.ids[indices[nearest]], distances[nearest]
+
+    def candidate_pairs(self, points: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Пакетный поиск пар (индекс точки запроса, идентификатор точки сетки) на расстоянии < radius"""
+        empty = (np.zeros(0, dtype=np.int64), self.ids[:0])
+        if len(points) == 0 or len(self.ids) == 0:
+            return empty
+
+        reach = int(math.ceil(radius / self.cell_size))
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        query_parts = []
+        member_parts = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                # Диапазоны точек соседней клетки - бинарным поиском по отсортированным ключам
+                keys = self._key(cells[:, 0] + dx, cells[:, 1] + dy)
+                starts = np.searchsorted(self._sorted_keys, keys, side='left')
+                ends = np.searchsorted(self._sorted_keys, keys, side='right')
+                counts = ends - starts
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                query = np.repeat(np.arange(len(points)), counts)
+                # Позиции внутри диапазонов [start, end) для каждой точки запроса
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                query_parts.append(query)
+                member_parts.append(self._order[np.repeat(starts, counts) + offsets])
+
+        if not query_parts:
+            return empty
+
+        query = np.concatenate(query_parts)
+        members = np.concatenate(member_parts)
+        self.distance_checks += query.size
+        delta = points[query] - self.positions[members]
+        close = np.hypot(delta[:, 0], delta[:, 1]) < radius
+        return query[close], self.ids[members[close]]
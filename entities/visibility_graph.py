@@ -0,0 +1,291 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+EPSILON = 1e-6  # Допуск касания: касательная проходит по границе раздутого круга
+SEGMENT_CHUNK = 4096  # Отрезков за одну векторизованную проверку пересечений
+MAX_ARC_STEP = math.pi / 4  # Наибольший угол дуги между соседними точками выдаваемого пути
+
+Edge = Tuple[int, float, float]  # (узел, длина, угол дуги со знаком; 0 - прямой отрезок)
+
+
+class VisibilityGraph:
+    """Граф видимости над круглыми препятствиями, раздутыми на радиус робота"""
+    def __init__(self, obstacles: List['Obstacle'], clearance: float, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.centers = np.array([(obstacle.x, obstacle.y) for obstacle in obstacles], dtype=float).reshape(-1, 2)
+        self.radii = np.array([obstacle.radius + clearance for obstacle in obstacles], dtype=float)
+        self.points: List[Tuple[float, float]] = []
+        self.node_circle: List[int] = []  # Круг, на котором лежит узел
+        self.edges: List[List[Edge]] = []
+        self.circle_nodes: List[List[Tuple[float, int]]] = [[] for _ in range(len(self.radii))]
+        # Закрытые участки окружностей (внутри других кругов или за краем карты): (начальный угол, длина)
+        self.blocked_arcs = [self._blocked_arcs(circle) for circle in range(len(self.radii))]
+        self.nodes_expanded = 0
+        self._build()
+
+    def _add_node(self, point: Tuple[float, float], circle: int) -> int:
+        node = len(self.points)
+        center = self.centers[circle]
+        angle = math.atan2(point[1] - center[1], point[0] - center[0])
+        self.points.append(point)
+        self.node_circle.append(circle)
+        self.edges.append([])
+        self.circle_nodes[circle].append((angle, node))
+        return node
+
+    def _build(self) -> None:
+        """Касательные между всеми парами кругов и дуги между соседними точками касания"""
+        starts, ends, first, second = self._bitangents()
+        if len(starts):
+            free = self._segments_free(starts, ends)
+            for p, q, i, j in zip(starts[free].tolist(), ends[free].tolist(),
+                                  first[free].tolist(), second[free].tolist()):
+                a, b = self._add_node(tuple(p), i), self._add_node(tuple(q), j)
+                length = math.dist(p, q)
+                self.edges[a].append((b, length, 0.0))
+                self.edges[b].append((a, length, 0.0))
+
+        for circle, nodes in enumerate(self.circle_nodes):
+            nodes.sort()
+            for (angle_a, a), (angle_b, b) in self._adjacent_pairs(nodes):
+                self._add_arc(circle, a, angle_a, b, angle_b, self.edges)
+
+    @staticmethod
+    def _adjacent_pairs(nodes: List[Tuple[float, int]]) -> List[Tuple[Tuple[float, int], Tuple[float, int]]]:
+        """Соседние по углу узлы круга, включая переход через -pi"""
+        if len(nodes) < 2:
+            return []
+        return list(zip(nodes, nodes[1:] + nodes[:1]))
+
+    def _add_arc(self, circle: int, a: int, angle_a: float, b: int, angle_b: float,
+                 edges: 'List[List[Edge]] | Dict[int, List[Edge]]') -> None:
+        """Ребро-дуга от a к b против часовой стрелки, если дуга не заходит в другие круги"""
+        sweep = (angle_b - angle_a) % (2 * math.pi)
+        if not self._arc_free(circle, angle_a, sweep):
+            return
+        length = self.radii[circle] * sweep
+        edges[a].append((b, length, sweep))
+        edges[b].append((a, length, -sweep))
+
+    def _bitangents(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Все общие касательные пар кругов: (начала, концы, круг начала, круг конца)"""
+        count = len(self.radii)
+        first, second = np.triu_indices(count, k=1)
+        if not len(first):
+            empty = np.zeros((0, 2))
+            return empty, empty, first, second
+        c1, c2 = self.centers[first], self.centers[second]
+        r1, r2 = self.radii[first], self.radii[second]
+        delta = c2 - c1
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        distance[distance == 0] = np.nan
+        vx, vy = delta[:, 0] / distance, delta[:, 1] / distance
+
+        starts, ends, circles_a, circles_b = [], [], [], []
+        # sign = 1 - внешние касательные, -1 - внутренние (между кругами)
+        for sign in (1, -1):
+            c = (r1 - sign * r2) / distance
+            with np.errstate(invalid='ignore'):
+                h = np.sqrt(1 - c * c)
+            valid = np.isfinite(h)
+            for k in (1, -1):
+                nx = vx * c - k * h * vy
+                ny = vy * c + k * h * vx
+                normal = np.stack([nx, ny], axis=1)
+                starts.append((c1 + r1[:, None] * normal)[valid])
+                ends.append((c2 + sign * r2[:, None] * normal)[valid])
+                circles_a.append(first[valid])
+                circles_b.append(second[valid])
+        return np.concatenate(starts), np.concatenate(ends), np.concatenate(circles_a), np.concatenate(circles_b)
+
+    def _segments_free(self, starts: np.ndarray, ends: np.ndarray,
+                       ignore: Optional[np.ndarray] = None) -> np.ndarray:
+        """Маска отрезков, не заходящих внутрь кругов и не выходящих за пределы карты"""
+        inside_map = ((starts >= 0) & (starts <= (self.width, self.height))).all(axis=1) & \
+                     ((ends >= 0) & (ends <= (self.width, self.height))).all(axis=1)
+        free = inside_map.copy()
+        radii = self.radii if ignore is None else np.where(ignore, -np.inf, self.radii)
+        cx, cy = self.centers[:, 0], self.centers[:, 1]
+        for chunk in range(0, len(starts), SEGMENT_CHUNK):
+            p, q = starts[chunk:chunk + SEGMENT_CHUNK], ends[chunk:chunk + SEGMENT_CHUNK]
+            # Отбор кандидатов: круг может задеть отрезок, только если его центр ближе
+            # половины длины отрезка плюс радиус к середине отрезка
+            middle = (p + q) / 2
+            half = np.hypot(q[:, 0] - p[:, 0], q[:, 1] - p[:, 1]) / 2
+            near = np.hypot(middle[:, 0, None] - cx, middle[:, 1, None] - cy) < half[:, None] + radii
+            segments, circles = np.nonzero(near)
+            if not len(segments):
+                continue
+            start = p[segments]
+            direction = q[segments] - start
+            offset = self.centers[circles] - start
+            length_sq = (direction ** 2).sum(axis=1)
+            t = np.clip((offset * direction).sum(axis=1) / np.maximum(length_sq, EPSILON), 0, 1)
+            closest = start + t[:, None] * direction - self.centers[circles]
+            hit = np.hypot(closest[:, 0], closest[:, 1]) < radii[circles] - EPSILON
+            free[chunk + segments[hit]] = False
+        return free
+
+    def _blocked_arcs(self, circle: int) -> List[Tuple[float, float]]:
+        """Участки окружности, по которым нельзя пройти: пересечения с другими кругами и краями карты"""
+        center, radius = self.centers[circle], self.radii[circle]
+        arcs = []
+        offsets = self.centers - center
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        for other in np.flatnonzero(distances < radius + self.radii).tolist():
+            if other == circle:
+                continue
+            distance, other_radius = distances[other], self.radii[other]
+            if distance + radius <= other_radius:
+                return [(0.0, 2 * math.pi)]  # Окружность целиком внутри другого круга
+            if distance + other_radius <= radius:
+                continue  # Другой круг целиком внутри, окружности он не касается
+            half = math.acos((radius * radius + distance * distance - other_radius * other_radius)
+                             / (2 * radius * distance))
+            arcs.append((math.atan2(offsets[other, 1], offsets[other, 0]), half))
+
+        # Края карты: (направление наружу, расстояние от центра до края)
+        for direction, gap in ((math.pi, center[0]), (0.0, self.width - center[0]),
+                               (-math.pi / 2, center[1]), (math.pi / 2, self.height - center[1])):
+            if gap < radius:
+                arcs.append((direction, math.acos(max(gap / radius, -1.0))))
+        return [(middle - half + EPSILON, 2 * half - 2 * EPSILON) for middle, half in arcs if half > EPSILON]
+
+    def _arc_free(self, circle: int, start_angle: float, sweep: float) -> bool:
+        """Не пересекает ли дуга закрытые участки окружности"""
+        full_turn = 2 * math.pi
+        for blocked_start, blocked_sweep in self.blocked_arcs[circle]:
+            if (blocked_start - start_angle) % full_turn < sweep or \
+                    (start_angle - blocked_start) % full_turn < blocked_sweep:
+                return False
+        return True
+
+    def contains(self, point: np.ndarray) -> np.ndarray:
+        """Маска кругов, внутри которых лежит точка"""
+        distance = np.hypot(self.centers[:, 0] - point[0], self.centers[:, 1] - point[1])
+        return distance < self.radii - EPSILON
+
+    def _point_tangents(self, point: np.ndarray, inside: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Точки касания касательных из точки ко всем кругам, кроме содержащих ее: (точки, круги)"""
+        outside = np.flatnonzero(~inside)
+        if not len(outside):
+            return np.zeros((0, 2)), outside
+        offset = point[None, :] - self.centers[outside]
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        base = np.arctan2(offset[:, 1], offset[:, 0])
+        spread = np.arccos(np.clip(self.radii[outside] / np.maximum(distance, EPSILON), -1, 1))
+        angles = np.concatenate([base + spread, base - spread])
+        circles = np.concatenate([outside, outside])
+        tangents = self.centers[circles] + self.radii[circles, None] * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        return tangents, circles
+
+    def find_path(self, start: np.ndarray, goal: np.ndarray) -> List[np.ndarray]:
+        """Кратчайший путь через точки поворота вокруг препятствий; пустой список, если пути нет"""
+        start = np.asarray(start, dtype=float)
+        goal = np.asarray(goal, dtype=float)
+        if self.contains(goal).any():
+            return []
+        start_inside = self.contains(start)
+        if self._segments_free(start[None], goal[None], start_inside)[0]:
+            return [start, goal]
+
+        # Временные узлы запроса: старт, цель и точки касания из них
+        base_count = len(self.points)
+        start_node, goal_node = base_count, base_count + 1
+        points = {start_node: tuple(start), goal_node: tuple(goal)}
+        node_circles: Dict[int, int] = {}
+        extra: Dict[int, List[Edge]] = {start_node: [], goal_node: []}
+        circle_extra: Dict[int, List[Tuple[float, int]]] = {}
+        next_node = base_count + 2
+        no_circles = np.zeros(len(self.radii), dtype=bool)
+        for node, point, inside in ((start_node, start, start_inside), (goal_node, goal, no_circles)):
+            tangents, circles = self._point_tangents(point, inside)
+            if not len(circles):
+                continue
+            free = self._segments_free(np.repeat(point[None], len(tangents), axis=0), tangents, inside)
+            for tangent, circle in zip(tangents[free].tolist(), circles[free].tolist()):
+                tangent_node = next_node
+                next_node += 1
+                center = self.centers[circle]
+                points[tangent_node] = tuple(tangent)
+                node_circles[tangent_node] = circle
+                extra[tangent_node] = []
+                length = math.dist(tangent, point)
+                extra[node].append((tangent_node, length, 0.0))
+                extra[tangent_node].append((node, length, 0.0))
+                angle = math.atan2(tangent[1] - center[1], tangent[0] - center[0])
+                circle_extra.setdefault(circle, []).append((angle, tangent_node))
+
+        # Временные узлы соединяются дугами с соседними узлами своего круга
+        for circle, nodes in circle_extra.items():
+            merged = sorted(self.circle_nodes[circle] + nodes)
+            for (angle_a, a), (angle_b, b) in self._adjacent_pairs(merged):
+                if a >= base_count or b >= base_count:
+                    for node in (a, b):
+                        if node not in extra:
+                            extra[node] = []
+                    self._add_arc(circle, a, angle_a, b, angle_b, extra)
+
+        came_from = self._search(start_node, goal_node, points, extra)
+        if goal_node not in came_from:
+            return []
+        return self._expand(came_from, goal_node, points, node_circles)
+
+    def _point(self, node: int, points: Dict[int, Tuple[float, float]]) -> Tuple[float, float]:
+        return points[node] if node >= len(self.points) else self.points[node]
+
+    def _search(self, start_node: int, goal_node: int, points: Dict[int, Tuple[float, float]],
+                extra: Dict[int, List[Edge]]) -> Dict[int, Tuple[Optional[int], float]]:
+        """A* по графу с евклидовой эвристикой; словарь предков (узел -> (предок, угол дуги))"""
+        base_count = len(self.points)
+        goal = points[goal_node]
+        g_score = {start_node: 0.0}
+        came_from: Dict[int, Tuple[Optional[int], float]] = {start_node: (None, 0.0)}
+        queue = [(math.dist(points[start_node], goal), start_node)]
+        closed = set()
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node in closed:
+                continue
+            closed.add(node)
+            self.nodes_expanded += 1
+            if node == goal_node:
+                break
+            edges = self.edges[node] + extra.get(node, []) if node < base_count else extra.get(node, [])
+            for neighbor, length, sweep in edges:
+                cost = g_score[node] + length
+                if cost < g_score.get(neighbor, math.inf):
+                    g_score[neighbor] = cost
+                    came_from[neighbor] = (node, sweep)
+                    heapq.heappush(queue, (cost + math.dist(self._point(neighbor, points), goal), neighbor))
+        return came_from
+
+    def _expand(self, came_from: Dict[int, Tuple[Optional[int], float]], goal_node: int,
+                points: Dict[int, Tuple[float, float]], node_circles: Dict[int, int]) -> List[np.ndarray]:
+        """Точки пути; дуги заменяются ломаной, описанной вокруг окружности (не заходит внутрь круга)"""
+        path = []
+        node = goal_node
+        while node is not None:
+            previous, sweep = came_from[node]
+            path.append(np.array(self._point(node, points)))
+            if previous is not None and sweep:
+                circle = node_circles[previous] if previous >= len(self.points) else self.node_circle[previous]
+                path.extend(reversed(self._arc_points(circle, self._point(previous, points), sweep)))
+            node = previous
+        path.reverse()
+        return path
+
+    def _arc_points(self, circle: int, point: Tuple[float, float], sweep: float) -> List[np.ndarray]:
+        """Вершины описанной ломаной на дуге от точки point на угол sweep (без концов дуги)"""
+        center, radius = self.centers[circle], self.radii[circle]
+        start_angle = math.atan2(point[1] - center[1], point[0] - center[0])
+        steps = max(int(math.ceil(abs(sweep) / MAX_ARC_STEP)), 1)
+        step = sweep / steps
+        # Вершины описанного многоугольника лежат на середине каждого шага на расстоянии radius / cos(step / 2)
+        distance = radius / math.cos(step / 2)
+        return [center + distance * np.array([math.cos(start_angle + (k + 0.5) * step),
+                                              math.sin(start_angle + (k + 0.5) * step)])
+                for k in range(steps)]
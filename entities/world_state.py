@@ -0,0 +1,284 @@
+import numpy as np
+from typing import Dict, List, Tuple
+from entities.spatial_hash import SpatialHash
+from entities.projectile import ProjectilePool
+
+TEAM_CODES = {'blue': 0, 'red': 1}  # Коды команд по значению Team
+NOT_COMPUTED = -2  # Ближайший враг еще не вычислялся на текущем тике
+ROBOT_KINDS = ('MeleeRobot', 'RangedRobot', 'TankRobot')
+
+
+class RobotColumn:
+    """Дескриптор атрибута робота, хранящегося в столбце WorldState (до добавления в мир - в самом объекте)"""
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.local_name = '_' + name
+
+    def __get__(self, robot, owner=None):
+        if robot is None:
+            return self
+        world = robot.__dict__.get('world')
+        if world is None:
+            try:
+                return robot.__dict__[self.local_name]
+            except KeyError:
+                raise AttributeError(self.name) from None
+        return getattr(world, self.name)[robot.slot]
+
+    def __set__(self, robot, value) -> None:
+        world = robot.__dict__.get('world')
+        if world is None:
+            robot.__dict__[self.local_name] = value
+        else:
+            getattr(world, self.name)[robot.slot] = value
+
+
+class WorldState:
+    """Состояние всех роботов в виде непрерывных столбцов NumPy (structure of arrays)"""
+    FLOAT_COLUMNS = ('health', 'max_health', 'speed', 'damage', 'radius', 'attack_range',
+                     'attack_cooldown', 'last_attack_time', 'damage_taken', 'base_damage_dealt')
+    INT_COLUMNS = ('kills',)
+
+    def __init__(self, width: int, height: int, capacity: int = 64, cell_size: float = 100.0):
+        self.width = width
+        self.height = height
+        self.grids = [SpatialHash(cell_size), SpatialHash(cell_size)]  # Пространственный индекс каждой команды
+        self.strongest = np.full(2, -1, dtype=np.int64)  # Слот самого здорового робота команды
+        self.max_team_health = np.zeros(2)
+        self.weakest = [np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)]  # Два самых раненых робота команды
+        self.coordinated = np.zeros(2, dtype=bool)  # Проведена ли координация атаки команды на текущем тике
+        self.max_radius = 0.0
+        self.projectiles = ProjectilePool()  # Общий пул снарядов всех команд
+        self.count = 0
+        self.capacity = 0
+        self.robots: List['Robot'] = []
+        self.next_id = 0
+        self.queries_valid = False  # Актуальность расстояний до врагов и баз на текущем тике
+
+        # Очередь урона текущего тика
+        self._damage_targets: List[int] = []
+        self._damage_amounts: List[float] = []
+        self._damage_attackers: List[int] = []
+
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Выделение (или расширение) памяти под столбцы"""
+        def grow(name: str, shape: Tuple[int, ...], dtype, fill=0) -> None:
+            column = np.full(shape, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                column[:self.count] = old[:self.count]
+            setattr(self, name, column)
+
+        grow('position', (capacity, 2), float)
+        grow('target', (capacity, 2), float)
+        grow('moving', (capacity,), bool, False)
+        for name in self.FLOAT_COLUMNS:
+            grow(name, (capacity,), float)
+        for name in self.INT_COLUMNS:
+            grow(name, (capacity,), np.int64)
+        grow('team', (capacity,), np.int8)
+        grow('kind', (capacity,), np.int8)
+        grow('ids', (capacity,), np.int64)
+        grow('nearest_enemy', (capacity,), np.int64, -1)
+        grow('nearest_distance', (capacity,), float, np.inf)
+        grow('base_distance', (capacity,), float, np.inf)
+        self.capacity = capacity
+
+    def _row_columns(self) -> List[str]:
+        """Имена всех построчно хранимых столбцов"""
+        return (['position', 'target', 'moving', 'team', 'kind', 'ids',
+                 'nearest_enemy', 'nearest_distance', 'base_distance'] +
+                list(self.FLOAT_COLUMNS) + list(self.INT_COLUMNS))
+
+    def add(self, robot: 'Robot') -> int:
+        """Добавление робота в мир, возвращает его слот"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        slot = self.count
+        self.position[slot] = robot.__dict__.pop('_position')
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+            getattr(self, name)[slot] = robot.__dict__.pop('_' + name, 0)
+        self.moving[slot] = False
+        self.team[slot] = TEAM_CODES[robot.team.value]
+        self.kind[slot] = ROBOT_KINDS.index(type(robot).__name__)
+        self.ids[slot] = self.next_id
+        self.nearest_enemy[slot] = -1
+        self.nearest_distance[slot] = np.inf
+        self.base_distance[slot] = np.inf
+
+        robot.robot_id = self.next_id
+        robot.world = self
+        robot.slot = slot
+        self.robots.append(robot)
+        self.next_id += 1
+        self.count += 1
+        self.queries_valid = False
+        return slot
+
+    def remove(self, slot: int) -> 'Robot':
+        """Удаление робота из мира с перестановкой последнего слота на место удаленного"""
+        robot = self.robots[slot]
+
+        # Возвращаем значения в объект, чтобы статистика робота оставалась доступной
+        robot.__dict__['_position'] = self.position[slot].copy()
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+            robot.__dict__['_' + name] = getattr(self, name)[slot].item()
+        robot.world = None
+        robot.slot = -1
+        robot.alive = robot.health > 0
+
+        last = self.count - 1
+        if slot != last:
+            for name in self._row_columns():
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved = self.robots[last]
+            moved.slot = slot
+            self.robots[slot] = moved
+        self.robots.pop()
+        self.count -= 1
+        self.queries_valid = False
+        return robot
+
+    @property
+    def distance_checks(self) -> int:
+        """Суммарное число проверок расстояний в пространственных индексах команд"""
+        return sum(grid.distance_checks for grid in self.grids)
+
+    def remove_dead(self) -> List['Robot']:
+        """Удаление всех погибших роботов, возвращает список удаленных"""
+        dead_slots = np.flatnonzero(self.health[:self.count] <= 0)
+        # Удаление с конца, чтобы на место удаленного всегда переставлялся живой робот
+        return [self.remove(int(slot)) for slot in dead_slots[::-1]]
+
+    def team_robots(self, team: 'Team') -> List['Robot']:
+        """Список роботов команды в порядке слотов"""
+        slots = np.flatnonzero(self.team[:self.count] == TEAM_CODES[team.value])
+        return [self.robots[slot] for slot in slots]
+
+    def update_queries(self, enemy_bases: Dict[str, Tuple[float, float]]) -> None:
+        """Подготовка пространственных запросов тика (enemy_bases - вражеская база каждой команды)"""
+        n = self.count
+        positions = self.position[:n]
+        teams = self.team[:n]
+
+        self.nearest_enemy[:n] = NOT_COMPUTED
+        self.nearest_distance[:n] = np.inf
+        self.coordinated[:] = False
+        self.max_radius = float(self.radius[:n].max()) if n else 0.0
+        for team, code in TEAM_CODES.items():
+            own = np.flatnonzero(teams == code)
+            self.grids[code].build(positions[own], own)
+            self.strongest[code] = -1
+            self.max_team_health[code] = 0.0
+            self.weakest[code] = own[:0]
+            if own.size == 0:
+                continue
+
+            base_x, base_y = enemy_bases[team]
+            delta = positions[own] - np.array([base_x, base_y], dtype=float)
+            self.base_distance[own] = np.hypot(delta[:, 0], delta[:, 1])
+
+            health = self.health[own]
+            strongest = int(np.argmax(health))
+            self.strongest[code] = own[strongest]
+            self.max_team_health[code] = health[strongest]
+            ratio = health / self.max_health[own]
+            self.weakest[code] = own[np.argsort(ratio, kind='stable')[:2]]
+
+        self.queries_valid = True
+
+    def enemy_code(self, slot: int) -> int:
+        """Код команды противника для робота в слоте"""
+        return 1 - int(self.team[slot])
+
+    def find_nearest_enemy(self, slot: int) -> int:
+        """Слот ближайшего врага (-1, если врагов нет), результат кэшируется до конца тика"""
+        nearest = self.nearest_enemy[slot]
+        if nearest == NOT_COMPUTED:
+            slots, distances = self.grids[self.enemy_code(slot)].k_nearest(self.position[slot])
+            nearest = int(slots[0]) if slots.size else -1
+            self.nearest_enemy[slot] = nearest
+            self.nearest_distance[slot] = distances[0] if slots.size else np.inf
+        return int(nearest)
+
+    def enemies_within(self, slot: int, point, radius: float) -> List['Robot']:
+        """Враги робота из слота на расстоянии не больше radius от точки"""
+        return [self.robots[enemy] for enemy in self.grids[self.enemy_code(slot)].query_radius(point, radius)]
+
+    def any_enemy_within(self, slot: int, point, radius: float) -> bool:
+        """Есть ли враг робота из слота на расстоянии не больше radius от точки"""
+        return self.grids[self.enemy_code(slot)].any_within(point, radius)
+
+    def weakest_ally(self, slot: int) -> int:
+        """Слот союзника с наименьшей долей здоровья, не считая самого робота (-1, если нет)"""
+        for ally in self.weakest[int(self.team[slot])]:
+            if ally != slot:
+                return int(ally)
+        return -1
+
+    def update_projectiles(self, enemy_bases: Dict[str, 'GameBase']) -> None:
+        """Пакетное обновление всех снарядов (enemy_bases - вражеская база для каждой команды)"""
+        self.projectiles.update(self, {TEAM_CODES[team]: base for team, base in enemy_bases.items()})
+
+    def set_move_target(self, slot: int, target_position: np.ndarray) -> None:
+        """Задание цели движения робота на текущий тик"""
+        self.target[slot] = target_position
+        self.moving[slot] = True
+
+    def apply_movement(self) -> None:
+        """Пакетное перемещение всех роботов к их целям с учетом границ карты"""
+        n = self.count
+        slots = np.flatnonzero(self.moving[:n])
+        if slots.size:
+            delta = self.target[slots] - self.position[slots]
+            distance = np.hypot(delta[:, 0], delta[:, 1])
+            step = np.minimum(self.speed[slots], distance)
+            scale = np.divide(step, distance, out=np.zeros_like(distance), where=distance > 0)
+            new_position = self.position[slots] + delta * scale[:, None]
+
+            radius = self.radius[slots]
+            new_position[:, 0] = np.clip(new_position[:, 0], radius, self.width - radius)
+            new_position[:, 1] = np.clip(new_position[:, 1], radius, self.height - radius)
+            self.position[slots] = new_position
+            self.moving[:n] = False
+        self.queries_valid = False
+
+    def queue_damage(self, slot: int, damage: float, attacker_slot: int = -1) -> None:
+        """Постановка урона в очередь текущего тика"""
+        self._damage_targets.append(slot)
+        self._damage_amounts.append(damage)
+        self._damage_attackers.append(attacker_slot)
+
+    def apply_damage(self) -> None:
+        """Пакетное применение урона и подсчет убийств"""
+        if not self._damage_targets:
+            return
+
+        targets = np.array(self._damage_targets, dtype=np.int64)
+        amounts = np.array(self._damage_amounts, dtype=float)
+        attackers = np.array(self._damage_attackers, dtype=np.int64)
+        self._damage_targets.clear()
+        self._damage_amounts.clear()
+        self._damage_attackers.clear()
+
+        # Накопленный урон по каждой цели в порядке постановки в очередь
+        order = np.argsort(targets, kind='stable')
+        targets, amounts, attackers = targets[order], amounts[order], attackers[order]
+        total = np.cumsum(amounts)
+        group_start = np.r_[True, targets[1:] != targets[:-1]]
+        group_offset = (total - amounts)[group_start][np.cumsum(group_start) - 1]
+        dealt_after = total - group_offset
+        dealt_before = dealt_after - amounts
+
+        # Убийство засчитывается атакующему, чей удар опустил здоровье до нуля
+        health = self.health[targets]
+        lethal = (dealt_before < health) & (dealt_after >= health) & (attackers >= 0)
+        np.add.at(self.kills, attackers[lethal], 1)
+
+        np.add.at(self.damage_taken, targets, amounts)
+        np.subtract.at(self.health, targets, amounts)
+        np.maximum(self.health[:self.count], 0, out=self.health[:self.count])
@@ -0,0 +1,35 @@
+import os
+import pygame
+from typing import Dict, Optional, Tuple
+
+SPRITE_DIR = "./pic"
+
+
+class AssetRegistry:
+    """Общий кэш спрайтов процесса: каждое изображение загружается и масштабируется один раз"""
+    def __init__(self, directory: str = SPRITE_DIR):
+        self.directory = directory
+        self.headless = False  # Без окна изображения не загружаются
+        self._sprites: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+        self.loads = 0  # Количество чтений с диска
+
+    def sprite(self, name: str, size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        """Спрайт pic/<name>.png размером size; None в режиме без окна"""
+        if self.headless:
+            return None
+        key = (name, size)
+        surface = self._sprites.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(pygame.image.load(os.path.join(self.directory, f"{name}.png")), size)
+            self.loads += 1
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()  # Формат окна: blit не конвертирует на каждом кадре
+            self._sprites[key] = surface
+        return surface
+
+    def clear(self) -> None:
+        """Сброс кэша (например, после смены режима окна)"""
+        self._sprites.clear()
+
+
+ASSETS = AssetRegistry()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_warm_up_barrier = None  # Барьер прогрева пула, задается в _init_worker
+
+
+@dataclass
+class MatchSpec:
+    """Описание одного матча для пакетного запуска"""
+    blue_genes: List[Dict] = field(default_factory=list)  # Пустой список - случайная популяция
+    red_genes: List[Dict] = field(default_factory=list)
+    seed: Optional[int] = None
+    max_ticks: int = 36000
+    match_id: Optional[int] = None  # None - номер матча в списке
+
+
+@dataclass
+class MatchResult:
+    """Итог матча"""
+    match_id: int
+    seed: Optional[int]
+    winner: Optional[str]
+    ticks: int
+    blue_base_health: float
+    red_base_health: float
+    blue_robots_alive: int
+    red_robots_alive: int
+    elapsed: float  # Время симуляции в секундах
+
+
+@dataclass
+class MatchError:
+    """Матч, завершившийся исключением"""
+    match_id: int
+    seed: Optional[int]
+    error: str  # Тип и текст исключения
+
+
+def _init_worker(quiet: bool, warm_up_barrier: 'multiprocessing.synchronize.Barrier') -> None:
+    """Подготовка процесса-исполнителя: окружение без дисплея и предзагрузка модулей"""
+    global _warm_up_barrier
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    os.chdir(PROJECT_ROOT)  # Спрайты загружаются по относительным путям
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+
+    import game_system.game_manager  # noqa: F401 - импорт заранее, чтобы первый матч не платил за него
+    _warm_up_barrier = warm_up_barrier
+
+
+def _warm_up(_: int) -> int:
+    """Задача прогрева: держит исполнителя, пока остальные задачи прогрева не займут свои"""
+    _warm_up_barrier.wait()
+    return os.getpid()
+
+
+def run_match(spec: MatchSpec) -> MatchResult:
+    """Запуск одного матча без окна"""
+    from game_system.game_manager import GameManager
+
+    start = time.perf_counter()
+    game = GameManager(headless=True, enable_logging=False,
+                       initial_genes={'blue': spec.blue_genes, 'red': spec.red_genes},
+                       seed=spec.seed)
+    winner = game.run_headless(spec.max_ticks)
+    return MatchResult(
+        match_id=spec.match_id,
+        seed=game.seed,  # Фактический seed, даже если в описании матча он не задан
+        winner=winner,
+        ticks=game.sim_clock.tick_count,
+        blue_base_health=float(game.blue_base.current_health),
+        red_base_health=float(game.red_base.current_health),
+        blue_robots_alive=len(game.blue_robots),
+        red_robots_alive=len(game.red_robots),
+        elapsed=time.perf_counter() - start
+    )
+
+
+class BatchRunner:
+    """Параллельный запуск матчей на пуле процессов с заранее запущенными исполнителями"""
+    def __init__(self, workers: Optional[int] = None, quiet: bool = True):
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=_init_worker,
+                                            initargs=(quiet, context.Barrier(self.workers)))
+        # Прогрев: барьер пропускает задачи, только когда все они выполняются одновременно,
+        # то есть каждая в своем процессе, прошедшем initializer
+        self.worker_pids = sorted(self.executor.map(_warm_up, range(self.workers)))
+
+    def run(self, specs: Iterable[MatchSpec]) -> Iterator[Union[MatchResult, MatchError]]:
+        """Запуск матчей, результаты выдаются по мере завершения; упавший матч дает MatchError"""
+        futures = {self.executor.submit(run_match, spec): spec for spec in specs}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                spec = futures[future]
+                yield MatchError(match_id=spec.match_id, seed=spec.seed, error=f"{type(e).__name__}: {e}")
+
+    def close(self) -> None:
+        """Остановка пула процессов"""
+        self.executor.shutdown()
+
+    def __enter__(self) -> 'BatchRunner':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def load_specs(path: str) -> List[MatchSpec]:
+    """Загрузка списка матчей из JSON-файла (список объектов с полями MatchSpec)"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    specs = [MatchSpec(**item) for item in data]
+    for index, spec in enumerate(specs):
+        spec.match_id = index if spec.match_id is None else spec.match_id
+    return specs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки"""
+    parser = argparse.ArgumentParser(description="Пакетный запуск матчей без окна")
+    parser.add_argument('specs', nargs='?', help='JSON-файл со списком матчей')
+    parser.add_argument('--matches', type=int, default=0,
+                        help='количество матчей со случайными популяциями (если файл не указан)')
+    parser.add_argument('--seed', type=int, default=0, help='начальный seed для --matches')
+    parser.add_argument('--max-ticks', type=int, default=36000, help='лимит тиков для --matches')
+    parser.add_argument('--workers', type=int, default=None, help='количество процессов')
+    parser.add_argument('--output', default=None, help='файл для результатов (JSON Lines)')
+    args = parser.parse_args(argv)
+
+    if args.specs:
+        specs = load_specs(args.specs)
+    else:
+        specs = [MatchSpec(seed=args.seed + index, max_ticks=args.max_ticks, match_id=index)
+                 for index in range(args.matches)]
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    start = time.perf_counter()
+    failed = 0
+    try:
+        with BatchRunner(args.workers) as runner:
+            for result in runner.run(specs):
+                failed += isinstance(result, MatchError)
+                output.write(json.dumps(asdict(result)) + '\n')
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Сыграно матчей: {len(specs)} за {elapsed:.1f} с, с ошибкой: {failed}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
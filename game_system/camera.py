@@ -0,0 +1,53 @@
+import pygame
+import numpy as np
+from typing import Tuple
+from game_system.config import CAMERA_PAN_SPEED
+
+# Клавиши прокрутки камеры (стрелки в просмотре повтора заняты перемоткой)
+PAN_KEYS = {pygame.K_a: (-1, 0), pygame.K_d: (1, 0), pygame.K_w: (0, -1), pygame.K_s: (0, 1)}
+
+# Наибольший выступ изображения объекта от его центра: кроны деревьев, полоски здоровья и зоны спавна
+OBSTACLE_DRAW_MARGIN = 60
+BASE_DRAW_MARGIN = 90
+ROBOT_DRAW_MARGIN = 50
+
+
+class Camera:
+    """Область просмотра мира размером с окно (объекты за пределами окна не рисуются)"""
+    def __init__(self, width: int, height: int, world_width: int, world_height: int):
+        self.width = width
+        self.height = height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0  # Мировые координаты левого верхнего угла окна; нулевые, если мир не больше окна
+        self.y = 0
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        return self.x, self.y
+
+    def move(self, dx: float, dy: float) -> None:
+        """Сдвиг камеры в пределах мира"""
+        self.x = int(min(max(self.x + dx, 0), max(self.world_width - self.width, 0)))
+        self.y = int(min(max(self.y + dy, 0), max(self.world_height - self.height, 0)))
+
+    def center_on(self, x: float, y: float) -> None:
+        """Камера с центром в точке мира"""
+        self.x, self.y = 0, 0
+        self.move(x - self.width / 2, y - self.height / 2)
+
+    def pan(self, pressed: 'pygame.key.ScancodeWrapper') -> None:
+        """Прокрутка по зажатым клавишам WASD"""
+        for key, (dx, dy) in PAN_KEYS.items():
+            if pressed[key]:
+                self.move(dx * CAMERA_PAN_SPEED, dy * CAMERA_PAN_SPEED)
+
+    def is_visible(self, x: float, y: float, margin: float) -> bool:
+        """Попадает ли в окно объект с центром (x, y), выступающий от центра не больше чем на margin"""
+        return (self.x - margin <= x <= self.x + self.width + margin and
+                self.y - margin <= y <= self.y + self.height + margin)
+
+    def visible_mask(self, positions: np.ndarray, margin: float) -> np.ndarray:
+        """Маска видимых точек массива позиций (n, 2)"""
+        return ((positions[:, 0] >= self.x - margin) & (positions[:, 0] <= self.x + self.width + margin) &
+                (positions[:, 1] >= self.y - margin) & (positions[:, 1] <= self.y + self.height + margin))
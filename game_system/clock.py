@@ -0,0 +1,15 @@
+from game_system.config import TICK_MS
+
+class SimulationClock:
+    """Симулированные игровые часы с фиксированным шагом времени"""
+    def __init__(self, dt: float = TICK_MS):
+        self.dt = dt  # Длительность одного тика в миллисекундах
+        self.tick_count = 0
+
+    def get_ticks(self) -> int:
+        """Текущее игровое время в миллисекундах (аналог pygame.time.get_ticks)"""
+        return int(self.tick_count * self.dt)
+
+    def advance(self) -> None:
+        """Переход к следующему тику"""
+        self.tick_count += 1
@@ -1,7 +1,37 @@
+from dataclasses import dataclass
+
 # Константы игры
-WINDOW_WIDTH = 800
+WINDOW_WIDTH = 800  # Размер окна - области просмотра мира
 WINDOW_HEIGHT = 700
 FPS = 60
+TICK_MS = 1000 / FPS  # Фиксированный шаг симуляции в миллисекундах
+CAMERA_PAN_SPEED = 20  # Сдвиг камеры за кадр при прокрутке, пиксели
+RENDER_FPS = FPS  # Частота отрисовки по умолчанию (не влияет на шаг симуляции)
+MAX_SPEED = 64  # Наибольший множитель ускорения симуляции
+MAX_BACKLOG_MS = 250  # Наибольшее отставание симуляции от реального времени при нехватке скорости, мс
+
+
+@dataclass(frozen=True)
+class ScaleProfile:
+    """Масштаб матча: размер мира, препятствия, роботы в команде и шаг сетки поиска пути"""
+    name: str
+    world_width: int
+    world_height: int
+    obstacle_count: int
+    robots_per_team: int
+    grid_size: int
+
+
+# Профили масштаба: площадь мира и число роботов растут вместе (x1, x4, x10, x100)
+SCALE_PROFILES = {profile.name: profile for profile in (
+    ScaleProfile('small', 800, 700, 10, 6, 20),  # Исходная карта размером с окно
+    ScaleProfile('medium', 1600, 1400, 40, 24, 20),
+    ScaleProfile('large', 2560, 2240, 100, 60, 20),
+    ScaleProfile('huge', 8000, 7000, 1000, 600, 40),
+)}
+DEFAULT_SCALE = 'small'
+WORLD_WIDTH = SCALE_PROFILES[DEFAULT_SCALE].world_width  # Размер мира по умолчанию
+WORLD_HEIGHT = SCALE_PROFILES[DEFAULT_SCALE].world_height
 
 # Цвета
 class Colors:
@@ -1,52 +1,134 @@
-import csv
-import os
-from typing import List, Dict
-
-class CSVLogger:
-    """Класс для логирования статистики в CSV"""
-    def __init__(self, output_dir: str = 'logs'):
-        self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
-
-    def log_team_statistics(self, team: str, robots: List['Robot']) -> None:
-        """Логирование статистики команды"""
-        filename = os.path.join(self.output_dir, f'{team}_team_stats.csv')
-        fieldnames = ['robot_type', 'team', 'damage', 'speed', 'kills', 'damage_to_enemies', 'damage_to_base']
-
-        with open(filename, 'a', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if f.tell() == 0:
-                writer.writeheader()
-
-            for robot in robots:
-                writer.writerow({
-                    'robot_type': type(robot).__name__,
-                    'team': team,
-                    'damage': robot.damage,
-                    'speed': robot.speed,
-                    'kills': robot.kills,
-                    'damage_to_enemies': robot._get_base_damage(),
-                    'damage_to_base': robot.base_damage_dealt
-                })
-
-    def log_robot_statistics(self, robot_type: str, robots: List['Robot']) -> None:
-        """Логирование статистики по типу роботов"""
-        filename = os.path.join(self.output_dir, f'{robot_type}_stats.csv')
-        fieldnames = ['robot_type', 'team', 'damage', 'speed', 'kills', 'damage_to_enemies', 'damage_to_base']
-
-        with open(filename, 'a', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if f.tell() == 0:
-                writer.writeheader()
-
-            for robot in robots:
-                if type(robot).__name__ == robot_type:
-                    writer.writerow({
-                        'robot_type': type(robot).__name__,
-                        'team': robot.team.value,
-                        'damage': robot.damage,
-                        'speed': robot.speed,
-                        'kills': robot.kills,
-                        'damage_to_enemies': robot._get_base_damage(),
-                        'damage_to_base': robot.base_damage_dealt
-                    })
+import csv
+import os
+import queue
+import threading
+from typing import Any, Dict, IO, List, NamedTuple, Optional, Sequence, Tuple
+
+BATCH_ROWS = 4096  # Строк в одной пачке, передаваемой потоку записи
+QUEUE_BATCHES = 64  # Емкость очереди в пачках; при заполнении игровой поток ждет запись
+FILE_BUFFER = 1 << 16  # Буфер открытого файла, байт
+
+
+class StatRecord(NamedTuple):
+    """Строка статистики робота (порядок полей совпадает со столбцами CSV)"""
+    robot_type: str
+    team: str
+    damage: float
+    speed: float
+    kills: int
+    damage_to_enemies: float
+    damage_to_base: float
+
+
+FIELDNAMES = list(StatRecord._fields)
+
+
+class CSVLogger:
+    """Класс для логирования статистики в CSV (запись пачками в отдельном потоке)"""
+    def __init__(self, output_dir: str = 'logs'):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self._pending: Dict[str, List[StatRecord]] = {}
+        # Ограниченная очередь: если запись не успевает, игровой поток ждет, и память не растет
+        self._queue: 'queue.Queue[Optional[Tuple[str, List[StatRecord]]]]' = queue.Queue(QUEUE_BATCHES)
+        self._files: Dict[str, Tuple[IO, Any]] = {}  # Имя файла -> (файл, csv.writer)
+        self.error: Optional[BaseException] = None  # Ошибка потока записи, передается в игровой поток
+        self.rows_written = 0
+        self._writer = threading.Thread(target=self._write_loop, name='csv-logger', daemon=True)
+        self._writer.start()
+
+    def log_tick(self, teams: Dict[str, List['Robot']], robot_types: Sequence[str]) -> None:
+        """Статистика за тик в файлы команд и типов роботов (строка каждого робота строится один раз)"""
+        by_type: Dict[str, List[StatRecord]] = {robot_type: [] for robot_type in robot_types}
+        for team, robots in teams.items():
+            records = [StatRecord(type(robot).__name__, team, robot.damage, robot.speed, robot.kills,
+                                  robot._get_base_damage(), robot.base_damage_dealt)
+                       for robot in robots]
+            self._append(f'{team}_team_stats.csv', records)
+            for record in records:
+                type_records = by_type.get(record.robot_type)
+                if type_records is not None:
+                    type_records.append(record)
+        for robot_type, records in by_type.items():
+            self._append(f'{robot_type}_stats.csv', records)
+
+    def log_team_statistics(self, team: str, robots: List['Robot']) -> None:
+        """Логирование статистики команды"""
+        self._append(f'{team}_team_stats.csv',
+                     [StatRecord(type(robot).__name__, team, robot.damage, robot.speed, robot.kills,
+                                 robot._get_base_damage(), robot.base_damage_dealt)
+                      for robot in robots])
+
+    def log_robot_statistics(self, robot_type: str, robots: List['Robot']) -> None:
+        """Логирование статистики по типу роботов"""
+        self._append(f'{robot_type}_stats.csv',
+                     [StatRecord(robot_type, robot.team.value, robot.damage, robot.speed, robot.kills,
+                                 robot._get_base_damage(), robot.base_damage_dealt)
+                      for robot in robots if type(robot).__name__ == robot_type])
+
+    def _append(self, filename: str, records: List[StatRecord]) -> None:
+        if self.error is not None:
+            raise RuntimeError("Ошибка записи CSV-лога") from self.error
+        pending = self._pending.get(filename)
+        if pending is None:
+            pending = self._pending[filename] = []
+            # Пустая пачка: поток записи создает файл с заголовком, даже если строк не будет
+            self._queue.put((filename, []))
+        pending.extend(records)
+        if len(pending) >= BATCH_ROWS:
+            self._queue.put((filename, pending))
+            self._pending[filename] = []
+
+    def flush(self) -> None:
+        """Передача накопленных строк потоку записи и ожидание их записи на диск"""
+        for filename, pending in self._pending.items():
+            if pending:
+                self._queue.put((filename, pending))
+                self._pending[filename] = []
+        self._queue.join()
+        if self.error is not None:
+            raise RuntimeError("Ошибка записи CSV-лога") from self.error
+
+    def close(self) -> None:
+        """Запись оставшихся строк, остановка потока записи и закрытие файлов"""
+        if not self._writer.is_alive():
+            return
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._writer.join()
+
+    def _file(self, filename: str) -> Any:
+        """Открытый файл лога (заголовок пишется в новый файл)"""
+        entry = self._files.get(filename)
+        if entry is None:
+            f = open(os.path.join(self.output_dir, filename), 'a', newline='', buffering=FILE_BUFFER)
+            writer = csv.writer(f)
+            if f.tell() == 0:
+                writer.writerow(FIELDNAMES)
+            entry = self._files[filename] = (f, writer)
+        return entry[1]
+
+    def _write_loop(self) -> None:
+        """Поток записи: пачки из очереди дописываются в открытые файлы"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    for f, _ in self._files.values():
+                        f.close()
+                    self._files.clear()
+                    return
+                filename, records = item
+                if self.error is None:
+                    self._file(filename).writerows(records)
+                    self.rows_written += len(records)
+                    if self._queue.empty():
+                        # Очередь разобрана - данные на диск, чтобы лог не отставал от игры
+                        for f, _ in self._files.values():
+                            f.flush()
+            except Exception as e:
+                self.error = e
+            finally:
+                self._queue.task_done()
@@ -1,114 +1,211 @@
+import time
 import pygame
-import random
-import math
-from typing import List
-from game_system.config import Colors, WINDOW_WIDTH, WINDOW_HEIGHT, FPS
+from typing import List, Optional, Dict, Union
+from game_system.config import (WINDOW_WIDTH, WINDOW_HEIGHT, TICK_MS, RENDER_FPS, MAX_SPEED, MAX_BACKLOG_MS,
+                                ScaleProfile, SCALE_PROFILES, DEFAULT_SCALE)
+from game_system.assets import ASSETS
+from game_system.camera import Camera
+from game_system.renderer import SceneRenderer
+from game_system.clock import SimulationClock
+from game_system.random_streams import RandomStreams
+from game_system.poisson_disk import PoissonDiskSampler
 from entities.base import RedBase, BlueBase
 from entities.obstacle import Obstacle
 from entities.robot import Robot, MeleeRobot, Team, RangedRobot, TankRobot
 from entities.pathfinder import PathFinder
+from entities.hierarchical_pathfinder import HierarchicalPathFinder
+from entities.path_service import PathRequestService
+from entities.world_state import WorldState
 from genetic.evolution import Evolution
+from genetic.chromosome import RobotGenes
 from genetic.config import GeneticConfig
 from genetic.data_handler import DataHandler
 from game_system.csv_logger import CSVLogger
+from game_system.replay import ReplayRecorder
+from game_system.profiler import TickProfiler
+
+OBSTACLE_DISTANCE_RELAX = 0.85  # Уменьшение расстояния между препятствиями при нехватке места
+MIN_OBSTACLE_DISTANCE = 60  # Меньше этого между препятствиями не пройти роботу
+
 
 class GameManager:
     """Класс управления игровым процессом"""
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Битва роботов")
+    def __init__(self, headless: bool = False, dt: float = TICK_MS, enable_logging: bool = True,
+                 max_robots_per_team: Optional[int] = None, initial_genes: Optional[Dict[str, List[Dict]]] = None,
+                 seed: Optional[int] = None, replay_path: Optional[str] = None,
+                 profiler: Optional[TickProfiler] = None, pathfinding_backend: str = 'astar',
+                 path_node_budget: Optional[int] = 500, scale: Union[str, ScaleProfile] = DEFAULT_SCALE,
+                 render_fps: int = RENDER_FPS, speed: int = 1):
+        self.headless = headless  # Режим без окна для быстрой симуляции
+        # Масштаб матча: размер мира (не зависит от окна), препятствия, роботы и сетка поиска пути
+        self.scale = SCALE_PROFILES[scale] if isinstance(scale, str) else scale
+        self.world_width = self.scale.world_width
+        self.world_height = self.scale.world_height
+        self.camera = Camera(min(WINDOW_WIDTH, self.world_width), min(WINDOW_HEIGHT, self.world_height),
+                             self.world_width, self.world_height)
+        ASSETS.headless = headless  # Без окна спрайты роботов не загружаются
+        if not headless:
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.camera.width, self.camera.height))
+            pygame.display.set_caption("Битва роботов")
+            self.renderer = SceneRenderer(self.screen, self.camera)
+        else:
+            self.screen = None
+            self.renderer = None
         self.clock = pygame.time.Clock()
+        self.render_fps = render_fps  # Кадров отрисовки в секунду реального времени
+        self.speed = 1  # Множитель скорости симуляции относительно реального времени (клавиши +/-)
+        self.set_speed(speed)
+        self.dropped_frames = 0  # Пропущенные кадры отрисовки
+        self.random_streams = RandomStreams(seed)  # Отдельные генераторы для карты, спавна и эволюции
+        self.seed = self.random_streams.seed
+        self.sim_clock = SimulationClock(dt)  # Игровое время с фиксированным шагом
         self.running = True
-        self.max_robots_per_team = 6  # Максимальное количество роботов в команде
+        self.closed = False  # close() уже вызван
+        # Максимальное количество роботов в команде
+        self.max_robots_per_team = max_robots_per_team if max_robots_per_team is not None else self.scale.robots_per_team
+        self.world = WorldState(self.world_width, self.world_height)  # Столбцовое состояние всех роботов
 
         self._initialize_game_objects()
+        self.camera.center_on(self.blue_base.x, self.blue_base.y)
         self.blue_robots = []
         self.red_robots = []
-        self.pathfinder = PathFinder(self.obstacles)
+        grid = {'grid_size': self.scale.grid_size, 'width': self.world_width, 'height': self.world_height}
+        if pathfinding_backend == 'hpa':
+            self.pathfinder = HierarchicalPathFinder(PathFinder(self.obstacles, **grid))
+        else:
+            self.pathfinder = PathFinder(self.obstacles, backend=pathfinding_backend, **grid)
+        # Очередь запросов пути с бюджетом раскрытых узлов на тик (None - поиск сразу в update робота)
+        self.path_service = PathRequestService(self.pathfinder, path_node_budget) if path_node_budget is not None else None
 
         # Инициализация эволюции должна быт до инициализации роботов
-        self.evolution = Evolution(GeneticConfig.POPULATION_SIZE, GeneticConfig.MUTATION_RATE)
+        self.evolution = Evolution(GeneticConfig.POPULATION_SIZE, GeneticConfig.MUTATION_RATE,
+                                   rng=self.random_streams.genetics)
         self.spawned_robots_count = {'blue': 0, 'red': 0}
-        self.data_handler = DataHandler(GeneticConfig.DATA_DIR)
+        self.enable_logging = enable_logging
+        self.data_handler = DataHandler(GeneticConfig.DATA_DIR) if enable_logging else None
 
-        # Инициализация популяций
-        self._initialize_populations()
+        # Инициализация популяций (initial_genes - готовые гены команд вместо случайных)
+        self._initialize_populations(initial_genes or {})
 
         # Инициализация роботов
         self._initialize_robots()
 
-        self.csv_logger = CSVLogger()
+        self.csv_logger = CSVLogger() if enable_logging else None
+
+        # Профилирование фаз тика (по умолчанию выключено и почти ничего не стоит)
+        self.profiler = profiler if profiler is not None else TickProfiler(enabled=False)
+        if self.profiler.enabled:
+            self.profiler.add_counter('astar_searches', lambda: self.pathfinder.searches)
+            self.profiler.add_counter('astar_nodes', lambda: self.pathfinder.nodes_expanded)
+            self.profiler.add_counter('path_cache_hits', lambda: self.pathfinder.cache_hits)
+            self.profiler.add_counter('path_cache_misses', lambda: self.pathfinder.cache_misses)
+            self.profiler.add_counter('flow_fields_built', lambda: self.pathfinder.flow_fields_built)
+            if self.path_service is not None:
+                self.profiler.add_counter('path_requests', lambda: self.path_service.requests_completed)
+            self.profiler.add_counter('distance_checks', lambda: self.world.distance_checks)
+
+        # Запись повтора матча
+        self.replay_recorder = None
+        if replay_path:
+            self.replay_recorder = ReplayRecorder(replay_path)
+            self.replay_recorder.record_initial(self)
 
     def _generate_obstacles(self) -> List[Obstacle]:
-        """Генерация препятствий на карте"""
-        obstacles = []
+        """Генерация препятствий на карте выборкой Пуассона"""
+        rng = self.random_streams.map
         min_distance = 150  # Минимальное расстояние между препятствиями
         base_safe_distance = 180  # Безопасное расстояние от баз
+        margin = 180  # Отступ от краев карты
+
+        count = self.scale.obstacle_count
+        bounds = (margin, margin, self.world_width - margin, self.world_height - margin)
+        exclusions = [(base.x, base.y, base_safe_distance) for base in (self.blue_base, self.red_base)]
+        points = PoissonDiskSampler(bounds, min_distance, rng, exclusions=exclusions).sample()
+        while len(points) < count:
+            # Препятствия не поместились - выборка заново с уменьшенным расстоянием
+            min_distance *= OBSTACLE_DISTANCE_RELAX
+            if min_distance < MIN_OBSTACLE_DISTANCE:
+                raise ValueError(f"На карте {self.scale.name} не помещается {count} препятствий")
+            points = PoissonDiskSampler(bounds, min_distance, rng, exclusions=exclusions).sample()
+        # Случайное подмножество плотной выборки равномерно покрывает карту
+        points = points[rng.choice(len(points), count, replace=False)]
 
-        for _ in range(10):  # Уменьшили количество препятствий
-            attempts = 0
-            while attempts < 100:  # Максимальное количество попыток
-                x = random.randint(180, WINDOW_WIDTH - 180)
-                y = random.randint(180, WINDOW_HEIGHT - 180)
-
-                # Проверка расстояния до баз
-                if (math.dist((x, y), (100, 100)) > base_safe_distance and
-                    math.dist((x, y), (WINDOW_WIDTH - 100, WINDOW_HEIGHT - 100)) > base_safe_distance):
-
-                    # Проверка расстояния до других препятствий
-                    valid_position = True
-                    for obstacle in obstacles:
-                        if math.dist((x, y), (obstacle.x, obstacle.y)) < min_distance:
-                            valid_position = False
-                            break
-
-                    if valid_position:
-                        obstacle_type = random.choice(["tree", "tree", "tree", "rock", "rock"])
-                        obstacles.append(Obstacle(x, y, obstacle_type))
-                        break
-
-                attempts += 1
-
+        obstacles = []
+        for x, y in points.tolist():
+            obstacle_type = ["tree", "tree", "tree", "rock", "rock"][rng.integers(5)]
+            obstacles.append(Obstacle(int(x), int(y), obstacle_type))
         return obstacles
 
     def _initialize_game_objects(self) -> None:
         """Инициализация игровых объектов"""
         # Создание баз
-        self.blue_base = BlueBase(100, 100)
-        self.red_base = RedBase(WINDOW_WIDTH - 100, WINDOW_HEIGHT - 100)
+        self.blue_base = BlueBase(100, 100, self.random_streams.spawns)
+        self.red_base = RedBase(self.world_width - 100, self.world_height - 100, self.random_streams.spawns)
 
         # Создание препятствий
         self.obstacles = self._generate_obstacles()
 
     def update(self) -> None:
         """Обновление игровой логики"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.get_ticks()
+        profiler = self.profiler
 
         # Спавн новых роботов
-        self._handle_robot_spawning(current_time)
+        with profiler.phase('spawning'):
+            self._handle_robot_spawning(current_time)
 
-        # Обновление роботов
-        for robot in self.blue_robots:
-            if robot.is_alive():
-                # Синие роботы атакуют красную базу
-                robot.update(self.blue_robots, self.red_robots, self.obstacles, self.red_base)
+        # Пакетный расчет расстояний до врагов и баз
+        with profiler.phase('queries'):
+            self.world.update_queries({
+                'blue': (self.red_base.x, self.red_base.y),
+                'red': (self.blue_base.x, self.blue_base.y)
+            })
 
-        for robot in self.red_robots:
-            if robot.is_alive():
-                # Красные роботы атакуют синюю базу
-                robot.update(self.red_robots, self.blue_robots, self.obstacles, self.blue_base)
+        # Обновление роботов
+        with profiler.phase('blue_ai'):
+            for robot in self.blue_robots:
+                if robot.is_alive():
+                    # Синие роботы атакуют красную базу
+                    robot.update(self.blue_robots, self.red_robots, self.obstacles, self.red_base)
+
+        with profiler.phase('red_ai'):
+            for robot in self.red_robots:
+                if robot.is_alive():
+                    # Красные роботы атакуют синюю базу
+                    robot.update(self.red_robots, self.blue_robots, self.obstacles, self.blue_base)
+
+        # Поиск путей из очереди в пределах бюджета тика
+        if self.path_service is not None:
+            with profiler.phase('path_requests'):
+                self.path_service.process()
+
+        # Пакетное обновление снарядов всех команд
+        with profiler.phase('projectiles'):
+            self.world.update_projectiles({'blue': self.red_base, 'red': self.blue_base})
+
+        # Пакетное применение урона и движения
+        with profiler.phase('physics'):
+            self.world.apply_damage()
+            self.world.apply_movement()
 
         # Удаление мертвых роботов
-        self.blue_robots = [robot for robot in self.blue_robots if robot.is_alive()]
-        self.red_robots = [robot for robot in self.red_robots if robot.is_alive()]
+        with profiler.phase('removal'):
+            if self.world.remove_dead():
+                self.blue_robots = self.world.team_robots(Team.BLUE)
+                self.red_robots = self.world.team_robots(Team.RED)
 
         # Логирование статистики после каждого матча
-        self.csv_logger.log_team_statistics('blue', self.blue_robots)
-        self.csv_logger.log_team_statistics('red', self.red_robots)
+        if self.csv_logger:
+            with profiler.phase('csv_logging'):
+                self.csv_logger.log_tick({'blue': self.blue_robots, 'red': self.red_robots},
+                                         ['MeleeRobot', 'RangedRobot', 'TankRobot'])
 
-        for robot_type in ['MeleeRobot', 'RangedRobot', 'TankRobot']:
-            self.csv_logger.log_robot_statistics(robot_type, self.blue_robots + self.red_robots)
+        self.sim_clock.advance()
+
+        if self.replay_recorder:
+            with profiler.phase('replay'):
+                self.replay_recorder.record_tick(self)
 
     def _handle_robot_spawning(self, current_time: int) -> None:
         """Обработка спавна новых роботов"""
@@ -116,13 +213,13 @@ class GameManager:
         if len(self.blue_robots) < self.max_robots_per_team:
             new_robot = self.blue_base.spawn_robot(current_time)
             if new_robot:
-                new_robot.set_pathfinder(self.pathfinder)
+                self._register_robot(new_robot)
                 self.blue_robots.append(new_robot)
                 self.spawned_robots_count['blue'] += 1
                 if self.spawned_robots_count['blue'] >= 3:
                     self.evolution.evolve_population('blue')
                     individuals = [robot.genes.to_dict() for robot in self.blue_robots if robot.genes is not None]
-                    if individuals:  # Проверка, что список не пуст
+                    if individuals and self.data_handler:  # Проверка, что список не пуст
                         self.data_handler.save_generation(
                             'blue',
                             self.evolution.populations['blue'].generation,
@@ -134,13 +231,13 @@ class GameManager:
         if len(self.red_robots) < self.max_robots_per_team:
             new_robot = self.red_base.spawn_robot(current_time)
             if new_robot:
-                new_robot.set_pathfinder(self.pathfinder)
+                self._register_robot(new_robot)
                 self.red_robots.append(new_robot)
                 self.spawned_robots_count['red'] += 1
                 if self.spawned_robots_count['red'] >= 3:
                     self.evolution.evolve_population('red')
                     individuals = [robot.genes.to_dict() for robot in self.red_robots if robot.genes is not None]
-                    if individuals:  # Проверка, что список не пуст
+                    if individuals and self.data_handler:  # Проверка, что список не пуст
                         self.data_handler.save_generation(
                             'red',
                             self.evolution.populations['red'].generation,
@@ -148,18 +245,27 @@ class GameManager:
                         )
                     self.spawned_robots_count['red'] = 0
 
+    def _register_robot(self, robot: Robot) -> None:
+        """Подключение робота к игровым системам (поиск пути, игровые часы и состояние мира)"""
+        robot.set_pathfinder(self.pathfinder)
+        if self.path_service is not None:
+            robot.set_path_service(self.path_service)
+        robot.set_clock(self.sim_clock)
+        self.world.add(robot)
+
     def _initialize_robots(self) -> None:
         """Инициализация начальных роботов"""
         robot_types = [MeleeRobot, RangedRobot, TankRobot]
+        rng = self.random_streams.spawns
 
         for robot_class in robot_types:
             # Синие роботы
             blue_robot = robot_class(
-                self.blue_base.x + random.randint(-30, 30),
-                self.blue_base.y + random.randint(-30, 30),
+                self.blue_base.x + int(rng.integers(-30, 30, endpoint=True)),
+                self.blue_base.y + int(rng.integers(-30, 30, endpoint=True)),
                 Team.BLUE
             )
-            blue_robot.set_pathfinder(self.pathfinder)
+            self._register_robot(blue_robot)
             if self.evolution.populations['blue'].individuals:
                 blue_robot.genes = self.evolution.populations['blue'].individuals[0]  # Присваиваем гены
             else:
@@ -168,11 +274,11 @@ class GameManager:
 
             # Красные роботы
             red_robot = robot_class(
-                self.red_base.x + random.randint(-30, 30),
-                self.red_base.y + random.randint(-30, 30),
+                self.red_base.x + int(rng.integers(-30, 30, endpoint=True)),
+                self.red_base.y + int(rng.integers(-30, 30, endpoint=True)),
                 Team.RED
             )
-            red_robot.set_pathfinder(self.pathfinder)
+            self._register_robot(red_robot)
             if self.evolution.populations['red'].individuals:
                 red_robot.genes = self.evolution.populations['red'].individuals[0]  # Присваиваем гены
             else:
@@ -184,39 +290,106 @@ class GameManager:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.set_speed(self.speed * 2)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.set_speed(self.speed // 2)
+        self.camera.pan(pygame.key.get_pressed())
 
     def draw(self) -> None:
         """Отрисовка игровых объектов"""
-        self.screen.fill(Colors.GREEN)
+        if self.screen is None:
+            return
 
-        # Отрисовка препятствий
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
+        with self.profiler.phase('render'):
+            self.renderer.render(self.obstacles, (self.blue_base, self.red_base),
+                                 self.blue_robots + self.red_robots, self.world.projectiles)
 
-        # Отрисовка баз
-        self.blue_base.draw(self.screen)
-        self.red_base.draw(self.screen)
-
-        # Отрисовка роботов
-        for robot in self.blue_robots + self.red_robots:
-            if robot.is_alive():
-                robot.draw(self.screen)
-
-        pygame.display.flip()
+    def set_speed(self, speed: int) -> None:
+        """Изменение множителя скорости симуляции (1..MAX_SPEED)"""
+        self.speed = min(max(speed, 1), MAX_SPEED)
+        if self.screen is not None:
+            pygame.display.set_caption(f"Битва роботов x{self.speed}" if self.speed > 1 else "Битва роботов")
 
     def run(self) -> None:
-        """Главный игровой цикл"""
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-
-    def _initialize_populations(self) -> None:
+        """Главный игровой цикл: тики по накопленному реальному времени, отрисовка с частотой render_fps"""
+        dt = self.sim_clock.dt
+        # Тики не пропускаются: если они не успевают, пропускаются кадры отрисовки, но кадр рисуется
+        # не реже раза в MAX_BACKLOG_MS. Отставание сверх этого отбрасывается - игра замедляется, а не зависает
+        accumulator = 0.0  # Реальное время, еще не отработанное тиками, мс
+        previous = time.perf_counter()
+        last_draw = previous
+        try:
+            while self.running:
+                with self.profiler.frame():
+                    self.handle_events()
+                    now = time.perf_counter()
+                    accumulator = min(accumulator + (now - previous) * 1000 * self.speed, MAX_BACKLOG_MS * self.speed)
+                    previous = now
+                    frame_deadline = now + MAX_BACKLOG_MS / 1000
+                    while accumulator >= dt and self.running:
+                        self.update()
+                        accumulator -= dt
+                        if time.perf_counter() > frame_deadline:
+                            break
+                    self.draw()
+                    drawn = time.perf_counter()
+                    if self.render_fps > 0:
+                        # Интервалы 1 / render_fps между двумя отрисовками, в которые кадр не был нарисован
+                        self.dropped_frames += max(int((drawn - last_draw) * self.render_fps) - 1, 0)
+                    last_draw = drawn
+                self.clock.tick(self.render_fps)
+        finally:
+            self.close()
+
+    def run_headless(self, max_ticks: int) -> Optional[str]:
+        """Симуляция без отрисовки и ожидания; победившая команда или None, если матч не завершился за max_ticks"""
+        try:
+            while self.sim_clock.tick_count < max_ticks and not self.is_finished():
+                with self.profiler.frame():
+                    self.update()
+        finally:
+            self.close()
+        return self.get_winner()
+
+    def close(self) -> None:
+        """Завершение матча: сохранение незаписанных данных (повторный вызов ничего не делает)"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self.csv_logger:
+                self.csv_logger.close()
+        finally:
+            try:
+                if self.replay_recorder:
+                    self.replay_recorder.close()
+            finally:
+                self.profiler.close()
+
+    def is_finished(self) -> bool:
+        """Проверка завершения матча (уничтожена одна из баз)"""
+        return self.blue_base.current_health <= 0 or self.red_base.current_health <= 0
+
+    def get_winner(self) -> Optional[str]:
+        """Определение победителя матча"""
+        if self.red_base.current_health <= 0 < self.blue_base.current_health:
+            return 'blue'
+        if self.blue_base.current_health <= 0 < self.red_base.current_health:
+            return 'red'
+        return None
+
+    def _initialize_populations(self, initial_genes: Dict[str, List[Dict]]) -> None:
         """Инициализация популяций для каждой команды"""
         # Создаем временных роботов для инициализации популяций
         temp_blue_robot = MeleeRobot(self.blue_base.x, self.blue_base.y, Team.BLUE)
         temp_red_robot = MeleeRobot(self.red_base.x, self.red_base.y, Team.RED)
 
-        self.evolution.initialize_population('blue', temp_blue_robot)
-        self.evolution.initialize_population('red', temp_red_robot)
+        for team, temp_robot in (('blue', temp_blue_robot), ('red', temp_red_robot)):
+            if initial_genes.get(team):
+                self.evolution.populations[team].individuals = [
+                    RobotGenes(**genes) for genes in initial_genes[team]
+                ]
+            else:
+                self.evolution.initialize_population(team, temp_robot)
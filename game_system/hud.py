@@ -0,0 +1,67 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from game_system.config import Colors
+
+MAX_CACHED_TEXTS = 1024  # Надписи с меняющимися числами вытесняются по давности использования
+
+Color = Tuple[int, int, int]
+
+
+def health_color(fraction: float) -> Color:
+    """Цвет полоски здоровья по доле оставшегося здоровья"""
+    if fraction > 0.7:
+        return Colors.GREEN
+    if fraction > 0.3:
+        return (255, 165, 0)  # Оранжевый
+    return Colors.RED
+
+
+class HudCache:
+    """Кэш элементов интерфейса: шрифтов, надписей и полосок здоровья"""
+    def __init__(self):
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        self._texts: 'OrderedDict[Tuple[str, int, Color], pygame.Surface]' = OrderedDict()
+        # Полоска здоровья кэшируется по заполнению, квантованному до целых пикселей ширины
+        self._bars: Dict[Tuple[int, int, int, Color, Optional[Color]], pygame.Surface] = {}
+
+    def font(self, size: int) -> pygame.font.Font:
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def text(self, value: str, size: int, color: Color) -> pygame.Surface:
+        """Отрендеренная надпись (сглаженная, с прозрачным фоном)"""
+        key = (value, size, color)
+        surface = self._texts.get(key)
+        if surface is not None:
+            self._texts.move_to_end(key)
+            return surface
+        surface = self.font(size).render(value, True, color)
+        self._texts[key] = surface
+        if len(self._texts) > MAX_CACHED_TEXTS:
+            self._texts.popitem(last=False)
+        return surface
+
+    def health_bar(self, width: int, height: int, fraction: float,
+                   border: Optional[Color] = None) -> pygame.Surface:
+        """Полоска здоровья на черном фоне; border - цвет рамки толщиной 1 пиксель"""
+        filled = min(max(int(width * fraction), 0), width)
+        color = health_color(fraction)
+        key = (width, height, filled, color, border)
+        surface = self._bars.get(key)
+        if surface is None:
+            pad = 1 if border is not None else 0
+            surface = pygame.Surface((width + 2 * pad, height + 2 * pad))
+            if border is not None:
+                surface.fill(border)
+            surface.fill(Colors.BLACK, (pad, pad, width, height))
+            surface.fill(color, (pad, pad, filled, height))
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self._bars[key] = surface
+        return surface
+
+
+HUD = HudCache()
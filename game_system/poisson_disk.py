@@ -0,0 +1,99 @@
+import math
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+Exclusion = Tuple[float, float, float]  # (x, y, радиус) - круг, в котором точек быть не должно
+
+
+class PoissonDiskSampler:
+    """Выборка точек с минимальным расстоянием между ними (алгоритм Бридсона)"""
+    def __init__(self, bounds: Tuple[float, float, float, float], min_distance: float,
+                 seed: Union[int, np.random.Generator, None] = None,
+                 exclusions: Sequence[Exclusion] = (), candidates: int = 30):
+        self.x_min, self.y_min, self.x_max, self.y_max = bounds
+        self.min_distance = float(min_distance)
+        self.rng = np.random.default_rng(seed)  # Generator передается без копирования
+        self.exclusions = np.array(exclusions, dtype=float).reshape(-1, 3)
+        self.candidates = candidates
+        self.cell_size = self.min_distance / math.sqrt(2)
+        self.cols = int((self.x_max - self.x_min) / self.cell_size) + 1
+        self.rows = int((self.y_max - self.y_min) / self.cell_size) + 1
+
+    def _allowed(self, points: np.ndarray) -> np.ndarray:
+        """Маска точек внутри области и вне исключенных кругов"""
+        mask = ((points[:, 0] >= self.x_min) & (points[:, 0] <= self.x_max) &
+                (points[:, 1] >= self.y_min) & (points[:, 1] <= self.y_max))
+        for x, y, radius in self.exclusions:
+            mask &= (points[:, 0] - x) ** 2 + (points[:, 1] - y) ** 2 > radius * radius
+        return mask
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        cells = ((points - (self.x_min, self.y_min)) // self.cell_size).astype(int)
+        return np.minimum(cells, (self.cols - 1, self.rows - 1))
+
+    def _initial_point(self, attempts: int = 1000) -> Optional[np.ndarray]:
+        """Случайная допустимая точка для начала выборки"""
+        low, high = (self.x_min, self.y_min), (self.x_max, self.y_max)
+        for _ in range(attempts):
+            point = self.rng.uniform(low, high)
+            if self._allowed(point[None])[0]:
+                return point
+        return None
+
+    def sample(self) -> np.ndarray:
+        """Все точки выборки, массив (n, 2) в порядке добавления"""
+        first = self._initial_point()
+        if first is None:
+            return np.zeros((0, 2))
+
+        # Индекс точки в клетке фоновой сетки, -1 - клетка пуста. Запас в 2 клетки
+        # по краям позволяет брать окрестность 5x5 без проверки границ
+        grid = np.full((self.cols + 4, self.rows + 4), -1, dtype=np.int64)
+        points: List[np.ndarray] = []
+        stored = np.zeros((0, 2))  # Копия points для векторной проверки расстояний
+        window = np.arange(-2, 3)
+        offsets = np.stack(np.meshgrid(window, window, indexing='ij'), axis=-1).reshape(-1, 2)
+        min_distance_sq = self.min_distance ** 2
+
+        def add(point: np.ndarray) -> None:
+            nonlocal stored
+            cx, cy = self._cells(point[None])[0]
+            grid[cx + 2, cy + 2] = len(points)
+            points.append(point)
+            if len(points) > len(stored):
+                grown = np.zeros((max(len(stored) * 2, 64), 2))
+                grown[:len(stored)] = stored
+                stored = grown
+            stored[len(points) - 1] = point
+            active.append(len(points) - 1)
+
+        active: List[int] = []
+        add(first)
+        while active:
+            slot = int(self.rng.integers(len(active)))
+            origin = points[active[slot]]
+
+            # Кандидаты в кольце [r, 2r] с равномерной плотностью по площади
+            angles = self.rng.uniform(0, 2 * math.pi, self.candidates)
+            radii = self.min_distance * np.sqrt(self.rng.uniform(1, 4, self.candidates))
+            candidates = origin + np.column_stack((np.cos(angles), np.sin(angles))) * radii[:, None]
+            candidates = candidates[self._allowed(candidates)]
+
+            accepted = None
+            if len(candidates):
+                cells = self._cells(candidates)[:, None, :] + offsets + 2  # (k, 25, 2)
+                neighbors = grid[cells[..., 0], cells[..., 1]]
+                deltas = stored[neighbors] - candidates[:, None, :]
+                too_close = (neighbors >= 0) & ((deltas ** 2).sum(axis=-1) < min_distance_sq)
+                valid = np.flatnonzero(~too_close.any(axis=1))
+                if len(valid):
+                    accepted = candidates[valid[0]]
+
+            if accepted is not None:
+                add(accepted)
+            else:
+                # Вокруг точки больше нет места - удаление из активного списка заменой последней
+                active[slot] = active[-1]
+                active.pop()
+
+        return np.array(points)
@@ -0,0 +1,164 @@
+import json
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+from game_system.config import FPS
+
+FRAME = 'frame'  # Имя измерения для полного кадра (обновление + отрисовка)
+MAX_TRACE_EVENTS = 2_000_000  # Ограничение памяти под события трассировки
+
+
+class _Phase:
+    """Переиспользуемый контекстный менеджер замера одной фазы"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'TickProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+
+
+class _NullPhase:
+    """Пустой контекстный менеджер для выключенного профилировщика"""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class TickProfiler:
+    """Профилировщик фаз игрового тика со сводками, медленными кадрами и трассой Chrome Trace"""
+    def __init__(self, enabled: bool = True, window: int = 600, summary_interval: int = FPS * 5,
+                 slow_frame_ms: Optional[float] = None, trace_path: Optional[str] = None):
+        self.enabled = enabled
+        self.window = window  # Размер скользящих окон фаз и счетчиков, в кадрах
+        self.summary_interval = summary_interval  # 0 - без периодической сводки
+        self.slow_frame_ms = slow_frame_ms
+        self.trace_path = trace_path
+        self.frame_count = 0
+        self.samples: Dict[str, Deque[float]] = {}  # Длительности фаз в миллисекундах
+        self.counter_samples: Dict[str, Deque[int]] = {}  # Приращения счетчиков за кадр
+        self.trace_events: List[Dict] = []
+        self._phases: Dict[str, _Phase] = {}
+        self._counters: Dict[str, Callable[[], int]] = {}
+        self._counter_values: Dict[str, int] = {}
+        self._frame_phases: Dict[str, float] = {}  # Разбивка текущего кадра
+        self._origin = time.perf_counter_ns()
+
+    def phase(self, name: str):
+        """Контекстный менеджер замера фазы: with profiler.phase('blue_ai'): ..."""
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+            self.samples[name] = deque(maxlen=self.window)
+        return phase
+
+    def frame(self):
+        """Контекстный менеджер замера полного кадра"""
+        return self.phase(FRAME)
+
+    def add_counter(self, name: str, source: Callable[[], int]) -> None:
+        """Регистрация накопительного счетчика; за кадр учитывается его приращение"""
+        self._counters[name] = source
+        self._counter_values[name] = source()
+        self.counter_samples[name] = deque(maxlen=self.window)
+
+    def _record(self, name: str, start: int, end: int) -> None:
+        duration = (end - start) / 1e6
+        self.samples[name].append(duration)
+        if name == FRAME:
+            self._end_frame(start, end, duration)
+        else:
+            self._frame_phases[name] = self._frame_phases.get(name, 0.0) + duration
+        if self.trace_path and len(self.trace_events) < MAX_TRACE_EVENTS:
+            self.trace_events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                                      'ts': (start - self._origin) / 1e3, 'dur': (end - start) / 1e3})
+
+    def _end_frame(self, start: int, end: int, duration: float) -> None:
+        """Завершение кадра: приращения счетчиков, медленные кадры и периодическая сводка"""
+        self.frame_count += 1
+        deltas = {}
+        for name, source in self._counters.items():
+            value = source()
+            deltas[name] = value - self._counter_values[name]
+            self._counter_values[name] = value
+            self.counter_samples[name].append(deltas[name])
+
+        if self.trace_path and deltas and len(self.trace_events) < MAX_TRACE_EVENTS:
+            self.trace_events.append({'name': 'counters', 'ph': 'C', 'pid': 0, 'tid': 0,
+                                      'ts': (end - self._origin) / 1e3, 'args': deltas})
+
+        if self.slow_frame_ms is not None and duration > self.slow_frame_ms:
+            breakdown = ', '.join(f"{name} {value:.1f}" for name, value in
+                                  sorted(self._frame_phases.items(), key=lambda item: -item[1]))
+            counters = ', '.join(f"{name} {value}" for name, value in deltas.items())
+            print(f"[profiler] Медленный кадр {self.frame_count}: {duration:.1f} мс ({breakdown}) {counters}")
+        self._frame_phases = {}
+
+        if self.summary_interval and self.frame_count % self.summary_interval == 0:
+            print(self.summary_line())
+
+    def percentiles(self, name: str, quantiles: Tuple[float, ...] = (50, 95, 99)) -> Dict[str, float]:
+        """Перцентили длительности фазы (мс) по скользящему окну"""
+        samples = self.samples.get(name)
+        if not samples:
+            return {}
+        values = np.fromiter(samples, dtype=float)
+        result = {f'p{q:g}': float(np.percentile(values, q)) for q in quantiles}
+        result['max'] = float(values.max())
+        result['mean'] = float(values.mean())
+        return result
+
+    def histogram(self, name: str, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Гистограмма длительностей фазы по скользящему окну: (количества, границы корзин в мс)"""
+        samples = self.samples.get(name)
+        return np.histogram(np.fromiter(samples or (), dtype=float), bins=bins)
+
+    def counter_mean(self, name: str) -> float:
+        """Среднее приращение счетчика за кадр по скользящему окну"""
+        samples = self.counter_samples.get(name)
+        return float(np.mean(samples)) if samples else 0.0
+
+    def summary_line(self) -> str:
+        """Сводка: перцентили кадра, среднее и p95 фаз, средние значения счетчиков за кадр"""
+        parts = [f"[profiler] кадр {self.frame_count}"]
+        frame = self.percentiles(FRAME)
+        if frame:
+            parts.append(f"{FRAME} p50 {frame['p50']:.2f} p95 {frame['p95']:.2f} max {frame['max']:.2f} мс")
+        for name in self.samples:
+            if name == FRAME:
+                continue
+            stats = self.percentiles(name, (95,))
+            if stats:
+                parts.append(f"{name} {stats['mean']:.2f}/{stats['p95']:.2f}")
+        for name in self.counter_samples:
+            parts.append(f"{name} {self.counter_mean(name):.0f}/кадр")
+        return ' | '.join(parts)
+
+    def dump_trace(self, path: Optional[str] = None) -> None:
+        """Сохранение событий в формате Chrome Trace JSON"""
+        path = path or self.trace_path
+        if not path:
+            return
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, f)
+
+    def close(self) -> None:
+        """Сохранение трассировки, если она включена"""
+        if self.enabled and self.trace_path:
+            self.dump_trace()
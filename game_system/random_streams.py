@@ -0,0 +1,13 @@
+import numpy as np
+from typing import Optional
+
+class RandomStreams:
+    """Независимые генераторы случайных чисел подсистем (карта, спавн, генетика), выведенные из одного seed"""
+    SUBSYSTEMS = ('map', 'spawns', 'genetics')
+
+    def __init__(self, seed: Optional[int] = None):
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy  # Если seed не задан, сохраняем сгенерированный для повтора
+        # Свой поток у каждой подсистемы: расход чисел в одной не сдвигает другие
+        for name, child in zip(self.SUBSYSTEMS, sequence.spawn(len(self.SUBSYSTEMS))):
+            setattr(self, name, np.random.default_rng(child))
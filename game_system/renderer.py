@@ -0,0 +1,73 @@
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple
+from game_system.config import Colors
+from game_system.camera import Camera, OBSTACLE_DRAW_MARGIN, BASE_DRAW_MARGIN, ROBOT_DRAW_MARGIN
+
+
+class SceneRenderer:
+    """Отрисовка кадра с кэшированным фоном и выводом на дисплей только измененных областей"""
+    def __init__(self, screen: pygame.Surface, camera: Camera):
+        self.screen = screen
+        self.camera = camera
+        self.background: Optional[pygame.Surface] = None  # Трава, препятствия и базы; перерисовка при сдвиге камеры
+        self._background_offset: Optional[Tuple[int, int]] = None
+        self._dirty: List[pygame.Rect] = []  # Области подвижных объектов прошлого кадра
+        self._base_health: Dict[int, float] = {}
+        self.full_redraws = 0
+        self.updated_rects = 0
+
+    def invalidate(self) -> None:
+        """Перерисовка фона на следующем кадре (например, после изменения препятствий)"""
+        self.background = None
+
+    def _build_background(self, obstacles: Sequence['Obstacle'], bases: Sequence['GameBase']) -> None:
+        camera = self.camera
+        offset = camera.offset
+        if self.background is None:
+            self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(Colors.GREEN)
+        for obstacle in obstacles:
+            if camera.is_visible(obstacle.x, obstacle.y, OBSTACLE_DRAW_MARGIN):
+                obstacle.draw(self.background, offset)
+        for base in bases:
+            if camera.is_visible(base.x, base.y, BASE_DRAW_MARGIN):
+                base.draw_static(self.background, offset)
+        self._background_offset = offset
+
+    def render(self, obstacles: Sequence['Obstacle'], bases: Sequence['GameBase'],
+               robots: Sequence['Robot'], projectiles: 'ProjectilePool') -> None:
+        """Отрисовка кадра и вывод на дисплей"""
+        screen = self.screen
+        camera = self.camera
+        offset = camera.offset
+        full = self.background is None or offset != self._background_offset
+        if full:
+            self._build_background(obstacles, bases)
+            screen.blit(self.background, (0, 0))
+        else:
+            for rect in self._dirty:
+                screen.blit(self.background, rect, rect)
+
+        changed = []
+        for base in bases:
+            if camera.is_visible(base.x, base.y, BASE_DRAW_MARGIN):
+                # Рисуется каждый кадр: стертые области роботов могли задеть полоску
+                rect = base.draw_health_bar(screen, offset)
+                if self._base_health.get(id(base)) != base.current_health:
+                    self._base_health[id(base)] = base.current_health
+                    changed.append(rect)
+
+        moving = []
+        for robot in robots:
+            if robot.is_alive() and camera.is_visible(robot.position[0], robot.position[1], ROBOT_DRAW_MARGIN):
+                moving.append(robot.draw(screen, offset))
+        moving.extend(projectiles.draw(screen, camera))
+
+        if full:
+            self.full_redraws += 1
+            pygame.display.flip()
+        else:
+            rects = self._dirty + moving + changed
+            self.updated_rects += len(rects)
+            pygame.display.update(rects)
+        self._dirty = moving
@@ -0,0 +1,324 @@
+import argparse
+import mmap
+import os
+import struct
+import numpy as np
+import pygame
+from typing import Dict, List, Optional
+from game_system.config import Colors, FPS, WINDOW_WIDTH, WINDOW_HEIGHT
+from game_system.assets import ASSETS
+from game_system.camera import Camera, OBSTACLE_DRAW_MARGIN, BASE_DRAW_MARGIN, ROBOT_DRAW_MARGIN
+from entities.base import BlueBase, RedBase
+from entities.obstacle import Obstacle
+from entities.projectile import draw_projectiles, PROJECTILE_RADIUS
+from entities.robot import MeleeRobot, RangedRobot, TankRobot, Team
+from entities.world_state import ROBOT_KINDS
+
+# Формат файла повтора (все числа little-endian):
+#   заголовок, таблица препятствий, две базы,
+#   кадры: заголовок кадра + появившиеся роботы + удаленные id + изменившиеся роботы + снаряды,
+#   индекс смещений кадров, завершающая запись со смещением индекса.
+# Ключевые кадры содержат полное состояние, остальные - только изменения,
+# поэтому для перехода к любому тику достаточно применить не больше keyframe_interval кадров.
+MAGIC = b'ABRP'
+END_MAGIC = b'ABRE'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIHH')  # magic, версия, интервал ключевых кадров, препятствия, ширина, высота
+TRAILER = struct.Struct('<QQ4s')  # смещение индекса, количество кадров, magic
+
+OBSTACLE_TYPES = ('tree', 'rock')
+TEAMS = (Team.BLUE, Team.RED)
+ROBOT_CLASSES = {'MeleeRobot': MeleeRobot, 'RangedRobot': RangedRobot, 'TankRobot': TankRobot}
+
+OBSTACLE_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('type', 'u1')])
+BASE_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('max_health', '<f4')])
+FRAME_DTYPE = np.dtype([('tick', '<u4'), ('keyframe', 'u1'),
+                        ('blue_base_health', '<f4'), ('red_base_health', '<f4'),
+                        ('spawned', '<u4'), ('removed', '<u4'), ('updated', '<u4'), ('projectiles', '<u4')])
+SPAWN_DTYPE = np.dtype([('id', '<u4'), ('kind', 'u1'), ('team', 'u1'),
+                        ('x', '<f4'), ('y', '<f4'), ('health', '<f4'), ('max_health', '<f4')])
+UPDATE_DTYPE = np.dtype([('id', '<u4'), ('x', '<f4'), ('y', '<f4'), ('health', '<f4')])
+PROJECTILE_DTYPE = np.dtype([('x', '<i2'), ('y', '<i2')])
+
+
+class ReplayRecorder:
+    """Запись матча в компактный двоичный поток"""
+    def __init__(self, path: str, keyframe_interval: int = FPS):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.file = open(path, 'wb')
+        self.offsets: List[int] = []
+        self.frame_count = 0
+        self._ids = np.zeros(0, dtype='<u4')  # Состояние предыдущего кадра, отсортированное по id
+        self._state = np.zeros(0, dtype=UPDATE_DTYPE)
+
+    def record_initial(self, game: 'GameManager') -> None:
+        """Запись карты: препятствий и баз"""
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.keyframe_interval, len(game.obstacles),
+                                    game.world.width, game.world.height))
+        obstacles = np.zeros(len(game.obstacles), dtype=OBSTACLE_DTYPE)
+        for record, obstacle in zip(obstacles, game.obstacles):
+            record['x'], record['y'] = obstacle.x, obstacle.y
+            record['type'] = OBSTACLE_TYPES.index(obstacle.type)
+        self.file.write(obstacles.tobytes())
+
+        bases = np.zeros(2, dtype=BASE_DTYPE)
+        for record, base in zip(bases, (game.blue_base, game.red_base)):
+            record['x'], record['y'], record['max_health'] = base.x, base.y, base.max_health
+        self.file.write(bases.tobytes())
+
+    def record_tick(self, game: 'GameManager') -> None:
+        """Запись состояния после очередного тика"""
+        world = game.world
+        n = world.count
+        slots = np.argsort(world.ids[:n])  # Слоты роботов в порядке возрастания id
+        ids = world.ids[slots].astype('<u4')
+
+        state = np.zeros(n, dtype=UPDATE_DTYPE)
+        state['id'] = ids
+        state['x'] = world.position[slots, 0]
+        state['y'] = world.position[slots, 1]
+        state['health'] = world.health[slots]
+
+        keyframe = self.frame_count % self.keyframe_interval == 0
+        if keyframe:
+            spawned_mask = np.ones(n, dtype=bool)
+            removed = np.zeros(0, dtype='<u4')
+            updated = state[:0]
+        else:
+            spawned_mask = ~np.isin(ids, self._ids, assume_unique=True)
+            removed = self._ids[~np.isin(self._ids, ids, assume_unique=True)]
+            # Изменившиеся роботы среди уже известных
+            known = ~spawned_mask
+            previous = self._state[np.searchsorted(self._ids, ids[known])]
+            current = state[known]
+            changed = ((current['x'] != previous['x']) | (current['y'] != previous['y']) |
+                       (current['health'] != previous['health']))
+            updated = current[changed]
+
+        spawned = np.zeros(int(spawned_mask.sum()), dtype=SPAWN_DTYPE)
+        spawn_slots = slots[spawned_mask]
+        spawned['id'] = ids[spawned_mask]
+        spawned['kind'] = world.kind[spawn_slots]
+        spawned['team'] = world.team[spawn_slots]
+        spawned['x'] = state['x'][spawned_mask]
+        spawned['y'] = state['y'][spawned_mask]
+        spawned['health'] = state['health'][spawned_mask]
+        spawned['max_health'] = world.max_health[spawn_slots]
+
+        pool = world.projectiles
+        projectiles = np.zeros(int(pool.active.sum()), dtype=PROJECTILE_DTYPE)
+        active_positions = pool.position[pool.active]
+        projectiles['x'] = active_positions[:, 0]
+        projectiles['y'] = active_positions[:, 1]
+
+        frame = np.zeros(1, dtype=FRAME_DTYPE)
+        frame['tick'] = game.sim_clock.tick_count
+        frame['keyframe'] = keyframe
+        frame['blue_base_health'] = game.blue_base.current_health
+        frame['red_base_health'] = game.red_base.current_health
+        frame['spawned'], frame['removed'] = len(spawned), len(removed)
+        frame['updated'], frame['projectiles'] = len(updated), len(projectiles)
+
+        # Кадр пишется одним вызовом и попадает в индекс только целиком:
+        # прерванная запись не оставит в повторе битый кадр
+        data = b''.join(block.tobytes() for block in (frame, spawned, removed, updated, projectiles))
+        offset = self.file.tell()
+        self.file.write(data)
+        self.offsets.append(offset)
+
+        self._ids = ids
+        self._state = state
+        self.frame_count += 1
+
+    def close(self) -> None:
+        """Запись индекса кадров и закрытие файла"""
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.offsets, dtype='<u8').tobytes())
+        self.file.write(TRAILER.pack(index_offset, self.frame_count, END_MAGIC))
+        self.file.close()
+
+
+class ReplayReader:
+    """Чтение повтора через отображение файла в память с переходом к любому тику"""
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size < HEADER.size + TRAILER.size:
+            self._file.close()
+            raise ValueError(f"Повтор не завершен (нет индекса кадров): {path}")
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.keyframe_interval, obstacle_count, self.width, self.height = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Неподдерживаемый файл повтора: {path}")
+        index_offset, self.frame_count, end_magic = TRAILER.unpack_from(self.buffer, len(self.buffer) - TRAILER.size)
+        if end_magic != END_MAGIC:
+            raise ValueError(f"Повтор не завершен (нет индекса кадров): {path}")
+
+        offset = HEADER.size
+        self.obstacles = np.frombuffer(self.buffer, OBSTACLE_DTYPE, obstacle_count, offset)
+        offset += self.obstacles.nbytes
+        self.bases = np.frombuffer(self.buffer, BASE_DTYPE, 2, offset)
+        self.offsets = np.frombuffer(self.buffer, '<u8', self.frame_count, index_offset)
+
+        self.frame_index = -1
+        self.robots: Dict[int, list] = {}  # id -> [вид, команда, x, y, здоровье, макс. здоровье]
+        self.projectiles = np.zeros(0, dtype=PROJECTILE_DTYPE)
+        self.frame = None
+
+    def _read_frame(self, index: int):
+        """Разбор кадра без копирования данных"""
+        offset = int(self.offsets[index])
+        frame = np.frombuffer(self.buffer, FRAME_DTYPE, 1, offset)[0]
+        offset += FRAME_DTYPE.itemsize
+        blocks = []
+        for dtype, count in ((SPAWN_DTYPE, frame['spawned']), (np.dtype('<u4'), frame['removed']),
+                             (UPDATE_DTYPE, frame['updated']), (PROJECTILE_DTYPE, frame['projectiles'])):
+            blocks.append(np.frombuffer(self.buffer, dtype, int(count), offset))
+            offset += dtype.itemsize * int(count)
+        return frame, blocks
+
+    def _apply_frame(self, index: int) -> None:
+        frame, (spawned, removed, updated, projectiles) = self._read_frame(index)
+        if frame['keyframe']:
+            self.robots = {}
+        for record in spawned.tolist():
+            self.robots[record[0]] = list(record[1:])
+        for robot_id in removed.tolist():
+            self.robots.pop(robot_id, None)
+        for robot_id, x, y, health in updated.tolist():
+            robot = self.robots[robot_id]
+            robot[2], robot[3], robot[4] = x, y, health
+        self.projectiles = projectiles
+        self.frame = frame
+        self.frame_index = index
+
+    def seek(self, index: int) -> None:
+        """Переход к кадру: от ближайшего ключевого кадра или от текущего, если он ближе"""
+        index = max(0, min(index, self.frame_count - 1))
+        keyframe = index - index % self.keyframe_interval
+        start = self.frame_index + 1 if keyframe <= self.frame_index < index else keyframe
+        for frame_index in range(start, index + 1):
+            self._apply_frame(frame_index)
+
+    def close(self) -> None:
+        self.obstacles = self.bases = self.offsets = self.projectiles = self.frame = None
+        self.buffer.close()
+        self._file.close()
+
+
+class ReplayPlayer:
+    """Воспроизведение повтора через методы draw игровых объектов, без ИИ и поиска пути"""
+    def __init__(self, path: str):
+        self.reader = ReplayReader(path)
+        pygame.init()
+        self.camera = Camera(min(WINDOW_WIDTH, self.reader.width), min(WINDOW_HEIGHT, self.reader.height),
+                             self.reader.width, self.reader.height)
+        self.screen = pygame.display.set_mode((self.camera.width, self.camera.height))
+        ASSETS.headless = False
+        pygame.display.set_caption("Битва роботов - повтор")
+        self.clock = pygame.time.Clock()
+        self.running = True
+        self.paused = False
+        self.speed = 1  # Кадров повтора за кадр отрисовки
+
+        self.obstacles = [Obstacle(int(x), int(y), OBSTACLE_TYPES[kind])
+                          for x, y, kind in self.reader.obstacles.tolist()]
+        self.bases = []
+        for base_class, (x, y, max_health) in zip((BlueBase, RedBase), self.reader.bases.tolist()):
+            base = base_class(int(x), int(y))
+            base.max_health = max_health
+            self.bases.append(base)
+        self._robots: Dict[int, 'Robot'] = {}  # Объекты для отрисовки, создаются один раз на робота
+
+    def _robot(self, robot_id: int, kind: int, team: int) -> 'Robot':
+        robot = self._robots.get(robot_id)
+        if robot is None:
+            robot = ROBOT_CLASSES[ROBOT_KINDS[kind]](0, 0, TEAMS[team])
+            self._robots[robot_id] = robot
+        return robot
+
+    def draw(self) -> None:
+        """Отрисовка текущего кадра"""
+        self.screen.fill(Colors.GREEN)
+        camera = self.camera
+        offset = camera.offset
+        for obstacle in self.obstacles:
+            if camera.is_visible(obstacle.x, obstacle.y, OBSTACLE_DRAW_MARGIN):
+                obstacle.draw(self.screen, offset)
+
+        frame = self.reader.frame
+        self.bases[0].current_health = round(float(frame['blue_base_health']), 1)
+        self.bases[1].current_health = round(float(frame['red_base_health']), 1)
+        for base in self.bases:
+            if camera.is_visible(base.x, base.y, BASE_DRAW_MARGIN):
+                base.draw(self.screen, offset)
+
+        for robot_id, (kind, team, x, y, health, max_health) in self.reader.robots.items():
+            if not camera.is_visible(x, y, ROBOT_DRAW_MARGIN):
+                continue
+            robot = self._robot(robot_id, kind, team)
+            robot.position = np.array([x, y])
+            robot.health = health
+            robot.max_health = max_health
+            robot.draw(self.screen, offset)
+
+        projectiles = self.reader.projectiles
+        positions = np.column_stack((projectiles['x'], projectiles['y']))
+        draw_projectiles(self.screen, positions[camera.visible_mask(positions, PROJECTILE_RADIUS)], offset)
+        pygame.display.flip()
+
+    def handle_events(self) -> None:
+        """Управление: пробел - пауза, стрелки - перемотка на секунду, +/- - скорость, WASD - камера"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_RIGHT:
+                    self.reader.seek(self.reader.frame_index + FPS)
+                elif event.key == pygame.K_LEFT:
+                    self.reader.seek(self.reader.frame_index - FPS)
+                elif event.key == pygame.K_HOME:
+                    self.reader.seek(0)
+                elif event.key == pygame.K_END:
+                    self.reader.seek(self.reader.frame_count - 1)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.speed = min(self.speed * 2, 64)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.speed = max(self.speed // 2, 1)
+        self.camera.pan(pygame.key.get_pressed())
+
+    def run(self, start_tick: int = 0) -> None:
+        """Цикл воспроизведения"""
+        if self.reader.frame_count == 0:
+            return
+        self.reader.seek(start_tick)
+        while self.running:
+            self.handle_events()
+            if not self.paused and self.reader.frame_index < self.reader.frame_count - 1:
+                self.reader.seek(self.reader.frame_index + self.speed)
+            self.draw()
+            self.clock.tick(FPS)
+        self.reader.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки"""
+    parser = argparse.ArgumentParser(description="Просмотр записанного матча")
+    parser.add_argument('path', help='файл повтора')
+    parser.add_argument('--start', type=int, default=0, help='кадр, с которого начать просмотр')
+    args = parser.parse_args(argv)
+
+    try:
+        ReplayPlayer(args.path).run(args.start)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,13 @@ class RobotGenes:
             aggression=0.5  # Начальное значение агрессии
         )
 
-    def mutate(self, mutation_rate: float = 0.1) -> None:
-        """Мутация генов"""
+    def mutate(self, rng: np.random.Generator, mutation_rate: float = 0.1) -> None:
+        """Мутация генов (rng - генератор генетических операторов из RandomStreams)"""
         for field in self.__dataclass_fields__:
-            if np.random.random() < mutation_rate:
+            if rng.random() < mutation_rate:
                 current_value = getattr(self, field)
                 # Мутация в пределах ±20% от текущего значения
-                mutation = np.random.uniform(-0.2, 0.2) * current_value
+                mutation = rng.uniform(-0.2, 0.2) * current_value
                 new_value = current_value + mutation
                 # Убедимся, что значение положительное
                 setattr(self, field, max(0.1, new_value))
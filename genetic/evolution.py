@@ -3,12 +3,16 @@ import numpy as np
 from .chromosome import RobotGenes
 from .population import Population
 from .fitness import FitnessCalculator
+from game_system.random_streams import RandomStreams
 
 class Evolution:
     """Класс управления эволюционным процессом"""
-    def __init__(self, population_size: int = 10, mutation_rate: float = 0.1):
+    def __init__(self, population_size: int = 10, mutation_rate: float = 0.1,
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None):
         self.population_size = population_size
         self.mutation_rate = mutation_rate
+        # Генератор генетических операторов: явный rng или поток genetics, выведенный из seed
+        self.rng = rng if rng is not None else RandomStreams(seed).genetics
         self.populations = {
             'blue': Population(self.population_size),
             'red': Population(self.population_size)
@@ -22,7 +26,7 @@ class Evolution:
 
         for _ in range(self.population_size):
             new_genes = RobotGenes(**base_genes.to_dict())
-            new_genes.mutate(mutation_rate=1.0)  # 100% мутация для начальной популяции
+            new_genes.mutate(self.rng, mutation_rate=1.0)  # 100% мутация для начальной популяции
             population.individuals.append(new_genes)
 
     def evolve_population(self, robot_type: str) -> None:
@@ -37,10 +41,10 @@ class Evolution:
 
         # Создаем новое поколение
         while len(new_individuals) < self.population_size:
-            parent1 = population.select_tournament()
-            parent2 = population.select_tournament()
+            parent1 = population.select_tournament(self.rng)
+            parent2 = population.select_tournament(self.rng)
             child = self._crossover(parent1, parent2)
-            child.mutate(self.mutation_rate)
+            child.mutate(self.rng, self.mutation_rate)
             new_individuals.append(child)
 
         population.individuals = new_individuals
@@ -50,7 +54,7 @@ class Evolution:
         """Равномерное скрещивание"""
         child_genes = {}
         for field in parent1.__dataclass_fields__:
-            if np.random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 child_genes[field] = getattr(parent1, field)
             else:
                 child_genes[field] = getattr(parent2, field)
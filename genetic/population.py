@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List
 import numpy as np
 from .chromosome import RobotGenes
 
@@ -9,17 +9,18 @@ class Population:
         self.individuals: List[RobotGenes] = []
         self.generation = 0
 
-    def initialize_from_robot(self, robot: 'Robot') -> None:
+    def initialize_from_robot(self, robot: 'Robot', rng: np.random.Generator) -> None:
         """Инициализация популяции на основе базового робота"""
         self.individuals = []
         base_genes = RobotGenes.from_robot(robot)
 
         for _ in range(self.size):
             new_genes = RobotGenes(**base_genes.to_dict())
-            new_genes.mutate(mutation_rate=1.0)  # 100% мутация для начальной популяции
+            new_genes.mutate(rng, mutation_rate=1.0)  # 100% мутация для начальной популяции
             self.individuals.append(new_genes)
 
-    def select_tournament(self, tournament_size: int = 3) -> RobotGenes:
+    def select_tournament(self, rng: np.random.Generator, tournament_size: int = 3) -> RobotGenes:
         """Турнирная селекция"""
-        tournament = np.random.choice(self.individuals, tournament_size, replace=False)
+        indices = rng.choice(len(self.individuals), tournament_size, replace=False)
+        tournament = [self.individuals[index] for index in indices]
         return max(tournament, key=lambda x: x.fitness if hasattr(x, 'fitness') else 0)
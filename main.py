@@ -1,7 +1,11 @@
 import pygame
 import random
 import math
+import argparse
 from game_system.game_manager import GameManager
+from game_system.profiler import TickProfiler
+from entities.pathfinder import PATHFINDING_BACKENDS
+from game_system.config import SCALE_PROFILES, DEFAULT_SCALE, RENDER_FPS
 from genetic.visualizer import EvolutionVisualizer
 from genetic.data_handler import DataHandler
 import pandas as pd
@@ -42,14 +46,59 @@ def visualize_results():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Битва роботов")
+    parser.add_argument('--headless', action='store_true',
+                        help='симуляция без окна с фиксированным шагом времени')
+    parser.add_argument('--max-ticks', type=int, default=36000,
+                        help='максимальное количество тиков в режиме --headless')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed матча для воспроизводимых запусков')
+    parser.add_argument('--record', default=None,
+                        help='файл для записи повтора матча')
+    parser.add_argument('--pathfinding', choices=PATHFINDING_BACKENDS + ('hpa',), default='astar',
+                        help='алгоритм поиска пути. astar: движение к базе по общему полю направлений '
+                             '(Дейкстра) и преследование через D* Lite - те же кратчайшие пути, что у A*; '
+                             'jps, visibility, hpa: все маршруты строит выбранный алгоритм')
+    parser.add_argument('--path-budget', type=int, default=500,
+                        help='бюджет раскрытых узлов поиска пути на тик (0 - поиск без очереди)')
+    parser.add_argument('--scale', choices=tuple(SCALE_PROFILES), default=DEFAULT_SCALE,
+                        help='профиль масштаба: размер мира, препятствия, роботы в команде и сетка поиска пути')
+    parser.add_argument('--render-fps', type=int, default=RENDER_FPS,
+                        help='частота отрисовки, кадров в секунду (шаг симуляции от нее не зависит)')
+    parser.add_argument('--speed', type=int, default=1,
+                        help='множитель скорости симуляции; в игре меняется клавишами +/-')
+    parser.add_argument('--profile', action='store_true',
+                        help='замер фаз тика с периодической сводкой')
+    parser.add_argument('--profile-trace', default=None,
+                        help='файл для трассировки фаз в формате Chrome Trace (включает --profile)')
+    parser.add_argument('--slow-frame-ms', type=float, default=None,
+                        help='выводить разбивку кадров дольше указанного времени (мс)')
+    args = parser.parse_args()
+
     # Инициализация Pygame
     pygame.init()
 
+    game = None
     try:
         # Запуск игры
-        game = GameManager()
-        game.run()
+        profiler = None
+        if args.profile or args.profile_trace or args.slow_frame_ms is not None:
+            profiler = TickProfiler(slow_frame_ms=args.slow_frame_ms, trace_path=args.profile_trace)
+        game = GameManager(headless=args.headless, seed=args.seed, replay_path=args.record,
+                           profiler=profiler, pathfinding_backend=args.pathfinding,
+                           path_node_budget=args.path_budget or None, scale=args.scale,
+                           render_fps=args.render_fps, speed=args.speed)
+        if args.headless:
+            winner = game.run_headless(args.max_ticks)
+            print(f"Матч завершен за {game.sim_clock.tick_count} тиков, победитель: {winner or 'нет'}, "
+                  f"seed: {game.seed}")
+        else:
+            game.run()
     finally:
+        # Запись незаписанных логов и повтора, даже если игра прервана
+        if game is not None:
+            game.close()
+
         # Завершение Pygame
         pygame.quit()
 
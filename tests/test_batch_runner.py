@@ -0,0 +1,22 @@
+import json
+from game_system.batch_runner import BatchRunner, MatchError, MatchResult, MatchSpec, load_specs
+
+
+def test_load_specs_keeps_explicit_zero_match_id(tmp_path):
+    path = tmp_path / 'matches.json'
+    path.write_text(json.dumps([{'seed': 1}, {'seed': 2, 'match_id': 0}, {'seed': 3, 'match_id': 7}]))
+    assert [spec.match_id for spec in load_specs(str(path))] == [0, 0, 7]
+
+
+def test_every_worker_is_started_before_first_match():
+    with BatchRunner(2) as runner:
+        assert len(runner.worker_pids) == 2
+
+
+def test_failed_match_does_not_stop_batch():
+    specs = [MatchSpec(seed=1, max_ticks=50, match_id=0),
+             MatchSpec(seed=2, max_ticks=50, match_id=1, blue_genes=[{'bogus': 1}])]
+    with BatchRunner(2) as runner:
+        outcomes = {outcome.match_id: outcome for outcome in runner.run(specs)}
+    assert isinstance(outcomes[0], MatchResult) and outcomes[0].ticks == 50
+    assert isinstance(outcomes[1], MatchError) and 'bogus' in outcomes[1].error
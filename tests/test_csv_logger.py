@@ -0,0 +1,59 @@
+import csv
+import os
+from game_system import csv_logger
+from game_system.csv_logger import CSVLogger, FIELDNAMES
+from game_system.game_manager import GameManager
+
+ROBOT_TYPES = ['MeleeRobot', 'RangedRobot', 'TankRobot']
+TICKS = 120
+
+
+def write_rows(path, rows):
+    """Прежняя запись: файл открывается на каждый вызов, строки пишутся по одной"""
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        if f.tell() == 0:
+            writer.writeheader()
+        for robot, team in rows:
+            writer.writerow({'robot_type': type(robot).__name__, 'team': team, 'damage': robot.damage,
+                             'speed': robot.speed, 'kills': robot.kills,
+                             'damage_to_enemies': robot._get_base_damage(),
+                             'damage_to_base': robot.base_damage_dealt})
+
+
+def read_logs(directory):
+    logs = {}
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), newline='') as f:
+            logs[filename] = f.read()
+    return logs
+
+
+def test_threaded_logger_writes_same_csv_as_direct_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_logger, 'BATCH_ROWS', 7)  # Несколько пачек на файл
+    expected_dir, tick_dir, calls_dir = (tmp_path / name for name in ('expected', 'tick', 'calls'))
+    expected_dir.mkdir()
+    tick_logger, calls_logger = CSVLogger(str(tick_dir)), CSVLogger(str(calls_dir))
+    game = GameManager(headless=True, enable_logging=False, seed=5)
+    try:
+        for _ in range(TICKS):
+            game.update()
+            teams = {'blue': game.blue_robots, 'red': game.red_robots}
+            tick_logger.log_tick(teams, ROBOT_TYPES)
+            for team, robots in teams.items():
+                calls_logger.log_team_statistics(team, robots)
+                write_rows(expected_dir / f'{team}_team_stats.csv', [(robot, team) for robot in robots])
+            for robot_type in ROBOT_TYPES:
+                robots = game.blue_robots + game.red_robots
+                calls_logger.log_robot_statistics(robot_type, robots)
+                write_rows(expected_dir / f'{robot_type}_stats.csv',
+                           [(robot, robot.team.value) for robot in robots if type(robot).__name__ == robot_type])
+    finally:
+        game.close()
+        tick_logger.close()
+        calls_logger.close()
+
+    expected = read_logs(expected_dir)
+    assert sum(log.count('\n') for log in expected.values()) > 10 * len(expected)
+    assert read_logs(tick_dir) == expected
+    assert read_logs(calls_dir) == expected
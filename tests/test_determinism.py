@@ -0,0 +1,49 @@
+import numpy as np
+from game_system.game_manager import GameManager
+from genetic.evolution import Evolution
+from genetic.chromosome import RobotGenes
+
+TICKS = 600
+
+
+def play(seed):
+    game = GameManager(headless=True, enable_logging=False, seed=seed)
+    try:
+        for _ in range(TICKS):
+            game.update()
+        world = game.world
+        order = np.argsort(world.ids[:world.count])
+        return {
+            'obstacles': [(obstacle.x, obstacle.y, obstacle.type) for obstacle in game.obstacles],
+            'ids': world.ids[order].tolist(),
+            'positions': world.position[order].tolist(),
+            'health': world.health[order].tolist(),
+            'bases': (game.blue_base.current_health, game.red_base.current_health),
+            'genes': {team: [genes.to_dict() for genes in population.individuals]
+                      for team, population in game.evolution.populations.items()},
+        }
+    finally:
+        game.close()
+
+
+def test_same_seed_gives_same_match():
+    assert play(21) == play(21)
+
+
+def test_different_seeds_give_different_maps():
+    assert play(21)['obstacles'] != play(22)['obstacles']
+
+
+def test_evolution_is_reproducible():
+    def evolve(seed):
+        evolution = Evolution(20, 0.3, seed=seed)
+        population = evolution.populations['blue']
+        population.individuals = [RobotGenes(100.0 + i, 2.0, 10.0, 0.5) for i in range(20)]
+        for index, genes in enumerate(population.individuals):
+            genes.fitness = float(index % 7)
+        for _ in range(5):
+            evolution.evolve_population('blue')
+        return [genes.to_dict() for genes in population.individuals]
+
+    assert evolve(3) == evolve(3)
+    assert evolve(3) != evolve(4)
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from game_system.config import SCALE_PROFILES
+from game_system.game_manager import GameManager
+
+
+@pytest.mark.parametrize('scale', list(SCALE_PROFILES))
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_every_profile_gets_its_obstacle_count(scale, seed):
+    game = GameManager(headless=True, enable_logging=False, seed=seed, scale=scale)
+    try:
+        assert len(game.obstacles) == SCALE_PROFILES[scale].obstacle_count
+        centers = np.array([(obstacle.x, obstacle.y) for obstacle in game.obstacles], dtype=float)
+        for base in (game.blue_base, game.red_base):
+            assert np.all(np.hypot(centers[:, 0] - base.x, centers[:, 1] - base.y) > 180)
+    finally:
+        game.close()
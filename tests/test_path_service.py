@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from entities.obstacle import Obstacle
+from entities.pathfinder import PathFinder
+from entities.hierarchical_pathfinder import HierarchicalPathFinder
+from entities.path_service import PathRequestService
+
+WIDTH, HEIGHT = 2400, 2000
+BUDGET = 300
+
+
+class Walker:
+    """Минимальный робот для очереди запросов"""
+    radius = 10
+
+    def __init__(self, position):
+        self.position = np.array(position, dtype=float)
+        self.current_path = None
+
+    def is_alive(self) -> bool:
+        return True
+
+    def distance_to(self, target) -> float:
+        return float(np.linalg.norm(self.position - target))
+
+
+def make_finder(backend):
+    rng = np.random.default_rng(4)
+    obstacles = [Obstacle(int(x), int(y), 'rock') for x, y in rng.uniform(100, (WIDTH - 100, HEIGHT - 100), (120, 2))]
+    pathfinder = PathFinder(obstacles, 20, WIDTH, HEIGHT)
+    if backend == 'hpa':
+        return HierarchicalPathFinder(pathfinder)
+    return pathfinder
+
+
+def submit(service, count):
+    rng = np.random.default_rng(9)
+    robots = []
+    for _ in range(count):
+        robot = Walker(rng.uniform(40, 400, 2))
+        service.request(robot, rng.uniform((WIDTH - 400, HEIGHT - 400), (WIDTH - 40, HEIGHT - 40)))
+        robots.append(robot)
+    return robots
+
+
+@pytest.mark.parametrize('backend', ['astar', 'hpa'])
+def test_burst_is_spread_over_ticks(backend):
+    finder = make_finder(backend)
+    if backend == 'hpa':
+        finder.graph(Walker.radius)  # Граф строится заранее, чтобы первый тик не списал его построение
+    service = PathRequestService(finder, node_budget=BUDGET)
+    robots = submit(service, 40)
+
+    service.process()
+    # Один тик не выполняет всю волну запросов
+    assert service.requests_completed < len(robots)
+
+    ticks = 1
+    while len(service) and ticks < 1000:
+        service.process()
+        ticks += 1
+    assert len(service) == 0 and ticks > 1
+    assert all(robot.current_path is not None for robot in robots)
+
+
+def test_astar_budget_is_not_exceeded():
+    finder = make_finder('astar')
+    service = PathRequestService(finder, node_budget=BUDGET)
+    submit(service, 40)
+    while len(service):
+        before = finder.nodes_expanded
+        service.process()
+        assert finder.nodes_expanded - before <= BUDGET
+
+
+def test_hpa_searches_charge_expanded_nodes():
+    finder = make_finder('hpa')
+    graph = finder.graph(Walker.radius)
+    assert finder.nodes_expanded == graph.nodes_expanded > 0
+    before = finder.nodes_expanded
+    finder.find_path(np.array([60.0, 60.0]), np.array([WIDTH - 60.0, HEIGHT - 60.0]), Walker.radius)
+    assert finder.nodes_expanded - before > 1
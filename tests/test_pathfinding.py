@@ -0,0 +1,203 @@
+import heapq
+import math
+import numpy as np
+import pytest
+from entities.obstacle import Obstacle
+from entities.pathfinder import PathFinder, FlowField
+from entities.hierarchical_pathfinder import HierarchicalPathFinder
+from entities.incremental_planner import IncrementalPlanner
+
+GRID_SIZE = 20
+WIDTH, HEIGHT = 1200, 900
+RADIUS = 10.0
+
+
+def make_obstacles(seed, count=40):
+    rng = np.random.default_rng(seed)
+    return [Obstacle(int(x), int(y), ['tree', 'rock'][rng.integers(2)])
+            for x, y in rng.uniform((60, 60), (WIDTH - 60, HEIGHT - 60), (count, 2))]
+
+
+def dijkstra(blocked, start):
+    """Эталонные расстояния по 8-связной сетке (диагональ - sqrt(2))"""
+    cols, rows = blocked.shape
+    distance = np.full((cols, rows), np.inf)
+    distance[start] = 0.0
+    queue = [(0.0, start)]
+    while queue:
+        current, (x, y) = heapq.heappop(queue)
+        if current > distance[x, y]:
+            continue
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if (dx or dy) and 0 <= nx < cols and 0 <= ny < rows and not blocked[nx, ny]:
+                    cost = current + (math.sqrt(2) if dx and dy else 1.0)
+                    if cost < distance[nx, ny]:
+                        distance[nx, ny] = cost
+                        heapq.heappush(queue, (cost, (nx, ny)))
+    return distance
+
+
+def queries(blocked, seed, count=15):
+    """Пары свободных клеток (старт, цель)"""
+    rng = np.random.default_rng(seed)
+    free = np.argwhere(~blocked)
+    pairs = free[rng.choice(len(free), (count, 2))]
+    return [(tuple(start), tuple(goal)) for start, goal in pairs.tolist()]
+
+
+def cells_of(path):
+    return [(int(round(point[0] / GRID_SIZE)), int(round(point[1] / GRID_SIZE))) for point in path]
+
+
+def grid_length(cells):
+    length = 0.0
+    for (x0, y0), (x1, y1) in zip(cells, cells[1:]):
+        assert max(abs(x1 - x0), abs(y1 - y0)) == 1, "соседние клетки пути должны быть смежными"
+        length += math.sqrt(2) if x1 != x0 and y1 != y0 else 1.0
+    return length
+
+
+def polyline_length(path):
+    points = np.array([np.asarray(point, dtype=float) for point in path])
+    return float(np.hypot(*np.diff(points, axis=0).T).sum()) / GRID_SIZE
+
+
+def clearance(path, obstacles):
+    """Наименьший зазор между отрезками пути и раздутыми препятствиями"""
+    centers = np.array([(obstacle.x, obstacle.y) for obstacle in obstacles], dtype=float)
+    radii = np.array([obstacle.radius + RADIUS for obstacle in obstacles])
+    points = np.array([np.asarray(point, dtype=float) for point in path])
+    samples = np.concatenate([a + np.linspace(0, 1, 50)[:, None] * (b - a) for a, b in zip(points, points[1:])])
+    distances = np.hypot(samples[:, None, 0] - centers[None, :, 0], samples[:, None, 1] - centers[None, :, 1])
+    return float((distances - radii).min())
+
+
+@pytest.fixture(params=[1, 2])
+def world(request):
+    obstacles = make_obstacles(request.param)
+    blocked = PathFinder(obstacles, GRID_SIZE, WIDTH, HEIGHT).occupancy(RADIUS)
+    return obstacles, blocked, queries(blocked, request.param)
+
+
+@pytest.mark.parametrize('backend', ['astar', 'jps'])
+def test_grid_paths_are_optimal(world, backend):
+    obstacles, blocked, pairs = world
+    pathfinder = PathFinder(obstacles, GRID_SIZE, WIDTH, HEIGHT, backend=backend, smoothing=False)
+    for start, goal in pairs:
+        expected = dijkstra(blocked, start)[goal]
+        path = pathfinder.find_path(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE, RADIUS)
+        if not np.isfinite(expected):
+            assert len(path) == 0
+            continue
+        cells = cells_of(path)
+        assert cells[0] == start and cells[-1] == goal
+        assert not any(blocked[cell] for cell in cells)
+        assert grid_length(cells) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('backend', ['astar', 'jps'])
+def test_smoothed_paths_are_valid_and_not_longer(world, backend):
+    obstacles, blocked, pairs = world
+    pathfinder = PathFinder(obstacles, GRID_SIZE, WIDTH, HEIGHT, backend=backend)
+    for start, goal in pairs:
+        expected = dijkstra(blocked, start)[goal]
+        path = pathfinder.find_path(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE, RADIUS)
+        if not np.isfinite(expected):
+            assert len(path) == 0
+            continue
+        cells = cells_of(path)
+        assert cells[0] == start and cells[-1] == goal
+        for a, b in zip(cells, cells[1:]):
+            assert pathfinder._line_of_sight(a, b, blocked)
+        assert polyline_length(list(path)) <= expected + 1e-9
+
+
+def test_visibility_paths_clear_obstacles(world):
+    obstacles, blocked, pairs = world
+    pathfinder = PathFinder(obstacles, GRID_SIZE, WIDTH, HEIGHT, backend='visibility')
+    for start, goal in pairs:
+        path = list(pathfinder.find_path(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE, RADIUS))
+        if len(path) < 2:
+            continue
+        np.testing.assert_allclose(path[0], np.array(start) * GRID_SIZE)
+        np.testing.assert_allclose(path[-1], np.array(goal) * GRID_SIZE)
+        assert clearance(path, obstacles) > -1e-6
+        # Путь без привязки к клеткам не длиннее кратчайшего пути по сетке
+        assert polyline_length(path) <= dijkstra(blocked, start)[goal] + 1e-6
+
+
+def test_hierarchical_paths_are_valid(world):
+    obstacles, blocked, pairs = world
+    finder = HierarchicalPathFinder(PathFinder(obstacles, GRID_SIZE, WIDTH, HEIGHT, smoothing=False), cluster_size=8)
+    for start, goal in pairs:
+        expected = dijkstra(blocked, start)[goal]
+        path = list(finder.find_path(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE, RADIUS))
+        if not np.isfinite(expected):
+            assert len(path) == 0
+            continue
+        cells = cells_of(path)
+        assert cells[-1] == goal
+        assert not any(blocked[cell] for cell in cells)
+        assert grid_length([start] + cells if cells[0] != start else cells) >= expected - 1e-9
+
+
+def test_flow_field_distances_match_dijkstra(world):
+    obstacles, blocked, pairs = world
+    goal = pairs[0][1]
+    field = FlowField(blocked, goal, GRID_SIZE)
+    np.testing.assert_allclose(field.distance, dijkstra(blocked, goal))
+    # Следование направлениям приводит в цель за кратчайшее расстояние
+    for start, _ in pairs:
+        if not np.isfinite(field.distance[start]):
+            continue
+        cells = [start]
+        while cells[-1] != goal:
+            waypoint = field.waypoint(cells[-1])
+            cells.append((int(waypoint[0]) // GRID_SIZE, int(waypoint[1]) // GRID_SIZE))
+        assert grid_length(cells) == pytest.approx(field.distance[start])
+
+
+def test_incremental_planner_follows_moving_target(world):
+    obstacles, blocked, pairs = world
+    pathfinder = PathFinder(list(obstacles), GRID_SIZE, WIDTH, HEIGHT)
+    planners = [IncrementalPlanner(pathfinder, RADIUS, reroot_distance=1000) for _ in range(2)]
+    start = pairs[0][0]
+    expected_from_start = dijkstra(blocked, start)
+    for planner in planners:
+        for _, goal in pairs:
+            path = planner.plan(np.array(start, dtype=float) * GRID_SIZE, np.array(goal, dtype=float) * GRID_SIZE)
+            if not np.isfinite(expected_from_start[goal]):
+                assert path == []
+                continue
+            cells = cells_of(path)
+            assert cells[0] == start and cells[-1] == goal
+            assert grid_length(cells) == pytest.approx(expected_from_start[goal])
+    # Планировщики не копируют сетку занятости
+    assert planners[0]._blocked_rows is planners[1]._blocked_rows is pathfinder.occupancy_rows(RADIUS)
+
+    # Новое препятствие на пути: перепланирование учитывает его
+    goal = next(goal for _, goal in pairs if np.isfinite(expected_from_start[goal]) and goal != start)
+    path = cells_of(planners[0].plan(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE))
+    middle = path[len(path) // 2]
+    pathfinder.add_obstacle(Obstacle(middle[0] * GRID_SIZE, middle[1] * GRID_SIZE, 'rock'))
+    blocked = pathfinder.occupancy(RADIUS)
+    expected = dijkstra(blocked, start)[goal] if not blocked[goal] else np.inf
+    path = planners[0].plan(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE)
+    if not np.isfinite(expected):
+        assert path == []
+    else:
+        cells = cells_of(path)
+        assert not any(blocked[cell] for cell in cells[1:])
+        assert grid_length(cells) == pytest.approx(expected)
+
+
+def test_hierarchical_caches_are_bounded(world):
+    obstacles, blocked, pairs = world
+    finder = HierarchicalPathFinder(PathFinder(obstacles, GRID_SIZE, WIDTH, HEIGHT, cache_size=4), cluster_size=8)
+    for start, goal in pairs:
+        list(finder.find_path(np.array(start) * GRID_SIZE, np.array(goal) * GRID_SIZE, RADIUS))
+    assert finder.segments_refined > 4
+    assert len(finder._abstract_paths) <= 4
+    assert len(finder._segments) <= 4
@@ -0,0 +1,47 @@
+import numpy as np
+from game_system.poisson_disk import PoissonDiskSampler
+
+BOUNDS = (100.0, 50.0, 1300.0, 950.0)
+
+
+def min_pairwise_distance(points):
+    delta = points[:, None, :] - points[None, :, :]
+    distances = np.hypot(delta[..., 0], delta[..., 1])
+    np.fill_diagonal(distances, np.inf)
+    return distances.min()
+
+
+def test_points_respect_min_distance_and_bounds():
+    for seed in range(5):
+        points = PoissonDiskSampler(BOUNDS, 60, seed).sample()
+        assert len(points) > 100
+        assert min_pairwise_distance(points) >= 60
+        assert np.all(points >= BOUNDS[:2]) and np.all(points <= BOUNDS[2:])
+
+
+def test_exclusions_are_empty():
+    exclusions = [(150.0, 100.0, 180.0), (700.0, 500.0, 120.0)]
+    points = PoissonDiskSampler(BOUNDS, 40, 3, exclusions=exclusions).sample()
+    for x, y, radius in exclusions:
+        assert np.all(np.hypot(points[:, 0] - x, points[:, 1] - y) > radius)
+
+
+def test_sample_has_no_large_gaps():
+    sampler = PoissonDiskSampler(BOUNDS, 80, 7)
+    points = sampler.sample()
+    # Любая точка области ближе 2 * min_distance к какой-то точке выборки
+    xs, ys = np.meshgrid(np.linspace(BOUNDS[0], BOUNDS[2], 121), np.linspace(BOUNDS[1], BOUNDS[3], 91))
+    probes = np.column_stack((xs.ravel(), ys.ravel()))
+    nearest = np.min(np.hypot(probes[:, None, 0] - points[None, :, 0], probes[:, None, 1] - points[None, :, 1]), axis=1)
+    assert nearest.max() < 2 * 80
+
+
+def test_same_seed_gives_same_points():
+    first = PoissonDiskSampler(BOUNDS, 50, 11).sample()
+    second = PoissonDiskSampler(BOUNDS, 50, np.random.default_rng(11)).sample()
+    np.testing.assert_array_equal(first, second)
+
+
+def test_no_room_gives_empty_sample():
+    points = PoissonDiskSampler(BOUNDS, 50, 0, exclusions=[(700.0, 500.0, 2000.0)]).sample()
+    assert points.shape == (0, 2)
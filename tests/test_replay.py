@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from game_system.game_manager import GameManager
+from game_system.replay import ReplayReader, HEADER, TRAILER
+
+TICKS = 240
+
+
+def snapshot(game):
+    """Состояние роботов в формате ReplayReader.robots (с точностью float32)"""
+    world = game.world
+    robots = {}
+    for slot in range(world.count):
+        values = np.array([world.position[slot, 0], world.position[slot, 1], world.health[slot],
+                           world.max_health[slot]], dtype=np.float32).tolist()
+        robots[int(world.ids[slot])] = [int(world.kind[slot]), int(world.team[slot])] + values
+    return robots
+
+
+@pytest.fixture(scope='module')
+def recorded(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('replay') / 'match.abr')
+    game = GameManager(headless=True, enable_logging=False, seed=5, replay_path=path)
+    states = []
+    projectiles = []
+    for _ in range(TICKS):
+        game.update()
+        states.append(snapshot(game))
+        pool = game.world.projectiles
+        projectiles.append(pool.position[pool.active].astype(np.int16))
+    obstacles = [(obstacle.x, obstacle.y, obstacle.type) for obstacle in game.obstacles]
+    game.close()
+    return path, states, projectiles, obstacles
+
+
+def test_round_trip_every_frame(recorded):
+    path, states, projectiles, obstacles = recorded
+    reader = ReplayReader(path)
+    try:
+        assert reader.frame_count == TICKS
+        assert [(int(x), int(y)) for x, y, _ in reader.obstacles.tolist()] == [(x, y) for x, y, _ in obstacles]
+        for index in range(TICKS):
+            reader.seek(index)
+            assert reader.robots == states[index]
+            np.testing.assert_array_equal(np.column_stack((reader.projectiles['x'], reader.projectiles['y'])),
+                                          projectiles[index])
+    finally:
+        reader.close()
+
+
+def test_seek_backwards_matches_sequential(recorded):
+    path, states, _, _ = recorded
+    reader = ReplayReader(path)
+    try:
+        for index in (TICKS - 1, 3, reader.keyframe_interval + 7, 0, TICKS // 2):
+            reader.seek(index)
+            assert reader.robots == states[index]
+    finally:
+        reader.close()
+
+
+@pytest.mark.parametrize('size', [0, 5, HEADER.size + TRAILER.size - 1])
+def test_truncated_file_is_rejected(tmp_path, size):
+    path = tmp_path / 'short.abr'
+    path.write_bytes(b'\0' * size)
+    with pytest.raises(ValueError):
+        ReplayReader(str(path))
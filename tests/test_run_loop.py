@@ -0,0 +1,45 @@
+import time
+from game_system.game_manager import GameManager
+
+FRAMES = 12
+
+
+def run_frames(update_delay: float, render_fps: int = 20, draw_delay: float = 0.0) -> GameManager:
+    game = GameManager(enable_logging=False, seed=1, render_fps=render_fps)
+    frames = []
+    update, draw = game.update, game.draw
+
+    def handle_events():
+        frames.append(None)
+        game.running = len(frames) <= FRAMES
+
+    def slow_update():
+        update()
+        time.sleep(update_delay)
+
+    def slow_draw():
+        draw()
+        time.sleep(draw_delay)
+
+    game.handle_events = handle_events
+    game.update = slow_update
+    game.draw = slow_draw
+    game.run()
+    return game
+
+
+def test_no_dropped_frames_when_ticks_keep_up():
+    game = run_frames(0.0, render_fps=10)
+    assert game.sim_clock.tick_count > 0
+    assert game.dropped_frames <= 1
+
+
+def test_slow_ticks_drop_render_frames():
+    # Тик в 0.12 с занимает больше двух интервалов отрисовки по 0.05 с
+    game = run_frames(0.12)
+    assert game.dropped_frames >= FRAMES - 2
+
+
+def test_slow_rendering_drops_frames():
+    game = run_frames(0.0, draw_delay=0.12)
+    assert game.dropped_frames >= FRAMES - 2
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from entities.spatial_hash import SpatialHash
+
+
+def brute_distances(positions, point):
+    return np.hypot(positions[:, 0] - point[0], positions[:, 1] - point[1])
+
+
+@pytest.fixture(params=[10, 500])
+def grid(request):
+    rng = np.random.default_rng(request.param)
+    positions = rng.uniform(-300, 1500, (request.param, 2))
+    ids = rng.permutation(request.param * 3)[:request.param]
+    spatial_hash = SpatialHash(cell_size=100.0)
+    spatial_hash.build(positions, ids)
+    queries = rng.uniform(-500, 1700, (50, 2))
+    return spatial_hash, positions, ids, queries
+
+
+def test_query_radius_matches_brute_force(grid):
+    spatial_hash, positions, ids, queries = grid
+    for point in queries:
+        for radius in (0.0, 35.0, 150.0, 800.0):
+            expected = ids[brute_distances(positions, point) <= radius]
+            assert sorted(spatial_hash.query_radius(point, radius).tolist()) == sorted(expected.tolist())
+            assert spatial_hash.any_within(point, radius) == bool(len(expected))
+
+
+def test_k_nearest_matches_brute_force(grid):
+    spatial_hash, positions, ids, queries = grid
+    for point in queries:
+        distances = brute_distances(positions, point)
+        for k in (1, 5, len(ids) + 3):
+            found_ids, found_distances = spatial_hash.k_nearest(point, k)
+            expected = np.sort(distances)[:k]
+            np.testing.assert_allclose(found_distances, expected)
+            lookup = dict(zip(ids.tolist(), distances.tolist()))
+            np.testing.assert_allclose([lookup[i] for i in found_ids.tolist()], found_distances)
+
+
+def test_empty_hash():
+    spatial_hash = SpatialHash()
+    spatial_hash.build(np.zeros((0, 2)), np.zeros(0, dtype=np.int64))
+    assert len(spatial_hash.query_radius((0, 0), 100)) == 0
+    assert not spatial_hash.any_within((0, 0), 100)
+    assert len(spatial_hash.k_nearest((0, 0), 3)[0]) == 0